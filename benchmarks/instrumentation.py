@@ -0,0 +1,143 @@
+import argparse
+import copy
+import json
+import sqlite3
+import statistics
+import time
+from collections import namedtuple
+import grpc
+from handler import MetricsInterceptor
+from metrics import LatencyHistogram, InstrumentedCursor, QueryMetrics, RpcMetrics
+from repository import QUERY_TEMPLATES
+from tracing import TraceBuffer, Tracer, current_span, traced_function
+from benchmarks.load import WORKLOADS, change_pct, run_workload
+
+
+HandlerCallDetails = namedtuple('HandlerCallDetails', ['method', 'invocation_metadata'])
+
+
+class _Context:
+
+    def code(self):
+        return None
+
+
+def nanoseconds_per_call(function, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    return (time.perf_counter() - started) / iterations * 1e9
+
+
+def measure_hooks(iterations: int) -> dict:
+    histogram = LatencyHistogram()
+    db = sqlite3.connect(':memory:')
+    cursor = db.cursor()
+    instrumented = InstrumentedCursor(db.cursor(), QueryMetrics(QUERY_TEMPLATES))
+
+    def plain_query():
+        cursor.execute("SELECT ?", (1,))
+        cursor.fetchone()
+
+    def instrumented_query():
+        instrumented.execute("SELECT ?", (1,))
+        instrumented.fetchone()
+
+    handler = grpc.unary_unary_rpc_method_handler(lambda request, context: request)
+    interceptor = MetricsInterceptor(RpcMetrics())
+    details = HandlerCallDetails('/bookservice.Library/GetBook', ())
+    context = _Context()
+
+    def plain_rpc():
+        handler.unary_unary(None, context)
+
+    def intercepted_rpc():
+        interceptor.intercept_service(lambda _: handler, details).unary_unary(None, context)
+
+    traced_noop = traced_function(_Context().code, 'controller.code', 'controller')
+    root = Tracer(1.0, TraceBuffer(1)).start('benchmark')
+
+    def sampled_call():
+        token = current_span.set(root)
+        try:
+            traced_noop()
+        finally:
+            current_span.reset(token)
+
+    plain = nanoseconds_per_call(plain_query, iterations)
+    observed = nanoseconds_per_call(instrumented_query, iterations)
+    rpc = nanoseconds_per_call(plain_rpc, iterations)
+    intercepted = nanoseconds_per_call(intercepted_rpc, iterations)
+    call = nanoseconds_per_call(_Context().code, iterations)
+    return {
+        'histogram_observe_ns': nanoseconds_per_call(lambda: histogram.observe(0.001), iterations),
+        'query_hook_overhead_ns': observed - plain,
+        'rpc_hook_overhead_ns': intercepted - rpc,
+        'unsampled_span_overhead_ns': nanoseconds_per_call(traced_noop, iterations) - call,
+        'sampled_span_overhead_ns': nanoseconds_per_call(sampled_call, min(iterations, 20000)) - call
+    }
+
+
+def measure_server(args) -> dict:
+    settings = {
+        'baseline': (False, None),
+        'metrics': (True, None),
+        'tracing': (False, args.trace_sample_rate)
+    }
+    rounds = {setting: [] for setting in settings}
+    for _ in range(args.rounds):
+        for setting, (metrics, trace_sample_rate) in settings.items():
+            run_args = copy.copy(args)
+            run_args.metrics = metrics
+            run_args.trace_sample_rate = trace_sample_rate
+            rounds[setting].append(run_workload(args.workload, run_args))
+
+    results = {}
+    for setting, runs in rounds.items():
+        results[setting] = {
+            'throughput_rps': statistics.median(result['throughput_rps'] for result in runs),
+            'p50_ms': statistics.median(result['p50_ms'] for result in runs),
+            'p99_ms': statistics.median(result['p99_ms'] for result in runs)
+        }
+
+    baseline = results['baseline']
+    for setting in ('metrics', 'tracing'):
+        current = results[setting]
+        current['throughput_change_pct'] = change_pct(current['throughput_rps'], baseline['throughput_rps'])
+        current['p50_change_pct'] = change_pct(current['p50_ms'], baseline['p50_ms'])
+        current['p99_change_pct'] = change_pct(current['p99_ms'], baseline['p99_ms'])
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the overhead of metrics and tracing")
+    parser.add_argument('--iterations', type=int, default=200000)
+    parser.add_argument('--workload', choices=sorted(WORKLOADS), default='read_heavy')
+    parser.add_argument('--rounds', type=int, default=3, help="server runs per setting; medians are reported")
+    parser.add_argument('--trace-sample-rate', type=float, default=0.01)
+    parser.add_argument('--mode', choices=['sync', 'async'], default='sync')
+    parser.add_argument('--catalog-size', type=int, default=10000)
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--workers', type=int, default=10)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--channels', type=int, default=4)
+    parser.add_argument('--duration', type=float, default=5.0)
+    parser.add_argument('--warmup', type=float, default=1.0)
+    parser.add_argument('--hot-set-size', type=int, default=50)
+    parser.add_argument('--page-size', type=int, default=50)
+    args = parser.parse_args()
+    args.store = 'stand-in'
+    args.preset = None
+    args.config = None
+    args.processes = 1
+
+    results = {
+        'parameters': vars(args),
+        'hooks': measure_hooks(args.iterations),
+        'server': measure_server(args)
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
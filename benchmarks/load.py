@@ -0,0 +1,343 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from concurrent import futures
+from typing import List, Tuple
+import grpc
+from proto import library_pb2, library_pb2_grpc
+from config import PRESETS, ServerConfig, load_server_config
+from main import build_server, build_async_server, decorate_book_repository
+from metrics import QueryMetrics, RpcMetrics, ServerStats
+from tracing import TraceBuffer, Tracer
+from repository import QUERY_TEMPLATES, SqliteBookRepository
+from benchmarks.server_modes import percentile
+from benchmarks.stand_in import AUTHORS, GENRES, TITLES, StandInBookRepository, synthetic_catalog
+
+
+CHANNEL_OPTIONS = [('grpc.max_receive_message_length', -1), ('grpc.use_local_subchannel_pool', 1)]
+
+EXPECTED_REJECTIONS = {
+    'CheckoutBook': grpc.StatusCode.INVALID_ARGUMENT,
+    'ReturnBook': grpc.StatusCode.INVALID_ARGUMENT
+}
+
+WORKLOADS = {
+    'read_heavy': [('SearchBook', 45), ('GetBook', 45), ('GetAllBooksPage', 10)],
+    'checkout_storm': [('CheckoutBook', 50), ('ReturnBook', 50)],
+    'catalog': [('GetAllBooks', 100)],
+    'mixed': [
+        ('GetBook', 40), ('SearchBook', 25), ('GetAllBooksPage', 10),
+        ('CheckoutBook', 10), ('ReturnBook', 10), ('GetAllBooks', 5)
+    ]
+}
+
+
+class LoadContext:
+
+    def __init__(self, uuids, hot_set_size: int, page_size: int):
+        self.uuids = uuids
+        self.hot_uuids = uuids[:max(1, hot_set_size)]
+        self.page_size = page_size
+
+
+def call_rpc(stub, rpc: str, rng: random.Random, context: LoadContext):
+    if rpc == 'GetBook':
+        return stub.GetBook(library_pb2.GetBookRequest(uuid=rng.choice(context.uuids)))
+    if rpc == 'SearchBook':
+        field = rng.random()
+        if field < 0.5:
+            request = library_pb2.SearchBookRequest(
+                bookAuthor=rng.choice(AUTHORS).split()[-1], pageSize=context.page_size)
+        elif field < 0.8:
+            request = library_pb2.SearchBookRequest(bookName=rng.choice(TITLES), pageSize=context.page_size)
+        else:
+            request = library_pb2.SearchBookRequest(
+                bookAuthor=rng.choice(AUTHORS).split()[-1], bookGenre=rng.choice(GENRES),
+                matchAll=True, pageSize=context.page_size)
+        return stub.SearchBook(request)
+    if rpc == 'GetAllBooksPage':
+        return stub.GetAllBooks(library_pb2.GetAllBooksRequest(pageSize=context.page_size))
+    if rpc == 'GetAllBooks':
+        return stub.GetAllBooks(library_pb2.GetAllBooksRequest())
+    if rpc == 'CheckoutBook':
+        return stub.CheckoutBook(library_pb2.CheckoutBookRequest(
+            userId=f"load-{rng.randrange(1000)}", copyUuid=rng.choice(context.hot_uuids), loanTime=14))
+    if rpc == 'ReturnBook':
+        return stub.ReturnBook(library_pb2.ReturnBookRequest(copyUuid=rng.choice(context.hot_uuids)))
+    raise ValueError(f"Unknown RPC: {rpc}")
+
+
+def summarize(latencies, errors: int, rejected: int, shed: int, elapsed: float) -> dict:
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'rejected': rejected,
+        'shed': shed,
+        'throughput_rps': len(latencies) / elapsed if elapsed else 0.0,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p95_ms': percentile(latencies, 0.95) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'mean_ms': statistics.fmean(latencies) * 1000 if latencies else 0.0
+    }
+
+
+async def drive(target: str, mix, context: LoadContext, concurrency: int, channels: int,
+                duration: float, warmup: float) -> dict:
+    rpcs = [rpc for rpc, _ in mix]
+    weights = [weight for _, weight in mix]
+    latencies = {rpc: [] for rpc in rpcs}
+    errors = {rpc: 0 for rpc in rpcs}
+    rejected = {rpc: 0 for rpc in rpcs}
+    shed = {rpc: 0 for rpc in rpcs}
+
+    opened = [grpc.aio.insecure_channel(target, options=CHANNEL_OPTIONS) for _ in range(max(1, channels))]
+    try:
+        for channel in opened:
+            await channel.channel_ready()
+        stubs = [library_pb2_grpc.LibraryStub(channel) for channel in opened]
+
+        measure_from = time.perf_counter() + warmup
+        deadline = measure_from + duration
+
+        async def worker(seed: int):
+            rng = random.Random(seed)
+            stub = stubs[seed % len(stubs)]
+            while True:
+                rpc = rng.choices(rpcs, weights)[0]
+                started = time.perf_counter()
+                if started >= deadline:
+                    return
+                try:
+                    await call_rpc(stub, rpc, rng, context)
+                except grpc.aio.AioRpcError as e:
+                    if started < measure_from:
+                        continue
+                    if e.code() == grpc.StatusCode.RESOURCE_EXHAUSTED:
+                        shed[rpc] += 1
+                        continue
+                    if EXPECTED_REJECTIONS.get(rpc) != e.code():
+                        errors[rpc] += 1
+                        continue
+                    rejected[rpc] += 1
+                if started >= measure_from:
+                    latencies[rpc].append(time.perf_counter() - started)
+
+        await asyncio.gather(*(worker(seed) for seed in range(concurrency)))
+    finally:
+        for channel in opened:
+            await channel.close()
+
+    total = [latency for rpc in rpcs for latency in latencies[rpc]]
+    result = summarize(total, sum(errors.values()), sum(rejected.values()), sum(shed.values()), duration)
+    result['rpcs'] = {
+        rpc: summarize(latencies[rpc], errors[rpc], rejected[rpc], shed[rpc], duration) for rpc in rpcs
+    }
+    return result
+
+
+def build_stats(args):
+    if not args.metrics:
+        return None
+    return ServerStats(RpcMetrics(), QueryMetrics(QUERY_TEMPLATES))
+
+
+def build_tracer(args):
+    if args.trace_sample_rate is None:
+        return None
+    return Tracer(args.trace_sample_rate, TraceBuffer(1000))
+
+
+def build_server_config(args) -> ServerConfig:
+    argv = []
+    if args.config:
+        argv += ['--config', args.config]
+    if args.preset:
+        argv += ['--preset', args.preset]
+    if args.workers is not None:
+        argv += ['--workers', str(args.workers)]
+    argv += ['--processes', str(args.processes)]
+    return load_server_config(argv, environ={})
+
+
+def build_repository(args, stats: ServerStats = None):
+    if args.store == 'sqlite':
+        repository = SqliteBookRepository(os.path.join(tempfile.mkdtemp(), 'library.db'))
+        repository.create_books(synthetic_catalog(args.catalog_size))
+        return decorate_book_repository(repository, stats)
+
+    return decorate_book_repository(
+        StandInBookRepository(synthetic_catalog(args.catalog_size), latency=args.latency_ms / 1000), stats)
+
+
+def serve_sync(args, ready, port: int = 0):
+    stats = build_stats(args)
+    config = build_server_config(args)
+    server = build_server(
+        build_repository(args, stats),
+        max_workers=config.workers,
+        stats=stats,
+        tracer=build_tracer(args),
+        options=config.grpc_options(),
+        maximum_concurrent_rpcs=config.max_concurrent_rpcs
+    )
+    ready.put(server.add_insecure_port(f'127.0.0.1:{port}'))
+    server.start()
+    server.wait_for_termination()
+
+
+def serve_async(args, ready, port: int = 0):
+    stats = build_stats(args)
+    config = build_server_config(args)
+    repository = build_repository(args, stats)
+    executor = futures.ThreadPoolExecutor(max_workers=args.workers or config.db_pool_max_size)
+
+    async def run():
+        server = build_async_server(
+            repository,
+            executor,
+            stats,
+            build_tracer(args),
+            options=config.grpc_options(),
+            maximum_concurrent_rpcs=config.max_concurrent_rpcs
+        )
+        ready.put(server.add_insecure_port(f'127.0.0.1:{port}'))
+        await server.start()
+        await server.wait_for_termination()
+
+    asyncio.run(run())
+
+
+SERVERS = {'sync': serve_sync, 'async': serve_async}
+
+
+def start_servers(args, ready) -> Tuple[int, List[multiprocessing.Process]]:
+    port = 0
+    processes = []
+    for _ in range(args.processes):
+        process = multiprocessing.Process(target=SERVERS[args.mode], args=(args, ready, port), daemon=True)
+        process.start()
+        processes.append(process)
+        bound = ready.get(timeout=60)
+        if not bound:
+            raise RuntimeError(f"server process could not bind port {port}")
+        port = bound
+    return port, processes
+
+
+def run_workload(workload: str, args) -> dict:
+    ready = multiprocessing.Queue()
+    processes = []
+    try:
+        port, processes = start_servers(args, ready)
+        context = LoadContext(
+            [book.uuid for book in synthetic_catalog(args.catalog_size)], args.hot_set_size, args.page_size)
+        return asyncio.run(drive(
+            f'127.0.0.1:{port}', WORKLOADS[workload], context,
+            args.concurrency, args.channels, args.duration, args.warmup
+        ))
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+
+
+def change_pct(current: float, baseline: float) -> float:
+    if not baseline:
+        return 0.0
+    return (current - baseline) / baseline * 100
+
+
+def compare(results: dict, baseline: dict, max_regression: float = None) -> dict:
+    comparison = {}
+    regressions = []
+    for workload, current in results['workloads'].items():
+        previous = baseline.get('workloads', {}).get(workload)
+        if previous is None:
+            continue
+
+        rpcs = {}
+        for rpc, stats in current['rpcs'].items():
+            previous_stats = previous['rpcs'].get(rpc)
+            if previous_stats is None:
+                continue
+            delta = {
+                'throughput_change_pct': change_pct(stats['throughput_rps'], previous_stats['throughput_rps']),
+                'p50_change_pct': change_pct(stats['p50_ms'], previous_stats['p50_ms']),
+                'p95_change_pct': change_pct(stats['p95_ms'], previous_stats['p95_ms']),
+                'p99_change_pct': change_pct(stats['p99_ms'], previous_stats['p99_ms'])
+            }
+            rpcs[rpc] = delta
+            if max_regression is not None and (
+                    delta['throughput_change_pct'] < -max_regression or delta['p99_change_pct'] > max_regression):
+                regressions.append(f"{workload}/{rpc}")
+
+        comparison[workload] = {
+            'throughput_change_pct': change_pct(current['throughput_rps'], previous['throughput_rps']),
+            'p99_change_pct': change_pct(current['p99_ms'], previous['p99_ms']),
+            'rpcs': rpcs
+        }
+
+    return {'workloads': comparison, 'regressions': regressions}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end load test of the Library service")
+    parser.add_argument('--mode', choices=sorted(SERVERS), default='sync')
+    parser.add_argument('--store', choices=['stand-in', 'sqlite'], default='stand-in',
+                        help="in-memory stand-in with simulated latency, or a fresh SQLite file")
+    parser.add_argument('--metrics', action='store_true', help="serve with the metrics interceptor and Admin service")
+    parser.add_argument('--trace-sample-rate', type=float,
+                        help="serve with tracing, sampling this fraction of requests (default: tracing off)")
+    parser.add_argument('--workload', action='append', choices=sorted(WORKLOADS),
+                        help="workload to run, may be repeated (default: all)")
+    parser.add_argument('--catalog-size', type=int, default=10000)
+    parser.add_argument('--latency-ms', type=float, default=1.0, help="simulated database round trip (stand-in only)")
+    parser.add_argument('--preset', choices=sorted(PRESETS), help="serve with a server configuration preset")
+    parser.add_argument('--config', help="serve with the settings of this server configuration file")
+    parser.add_argument('--workers', type=int,
+                        help="sync handler threads / async DB executor threads (default: from the server configuration)")
+    parser.add_argument('--processes', type=int, default=1,
+                        help="server processes sharing one port through SO_REUSEPORT")
+    parser.add_argument('--concurrency', type=int, default=64, help="concurrent in-flight requests")
+    parser.add_argument('--channels', type=int, default=4,
+                        help="client connections; the kernel spreads connections, not calls, across --processes")
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--warmup', type=float, default=2.0)
+    parser.add_argument('--hot-set-size', type=int, default=50, help="copies contended by checkout storms")
+    parser.add_argument('--page-size', type=int, default=50)
+    parser.add_argument('--output', help="write JSON results to this file as well as stdout")
+    parser.add_argument('--baseline', help="JSON results of an earlier run to compare against")
+    parser.add_argument('--max-regression', type=float,
+                        help="exit non-zero if throughput drops or p99 grows by more than this percentage")
+    args = parser.parse_args()
+
+    workloads = args.workload or list(WORKLOADS)
+    results = {'parameters': vars(args), 'workloads': {}}
+    for workload in workloads:
+        results['workloads'][workload] = run_workload(workload, args)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            results['comparison'] = compare(results, json.load(f), args.max_regression)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    print(output)
+
+    if results.get('comparison', {}).get('regressions'):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
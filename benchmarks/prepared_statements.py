@@ -0,0 +1,68 @@
+import argparse
+import json
+import time
+from repository import BookRepository, StatementCache, create_pool
+from benchmarks.server_modes import percentile
+
+
+def measure(operation, iterations: int) -> dict:
+    latencies = []
+    for index in range(iterations):
+        started = time.perf_counter()
+        operation(index)
+        latencies.append(time.perf_counter() - started)
+
+    latencies.sort()
+    return {
+        'iterations': iterations,
+        'mean_us': sum(latencies) / len(latencies) * 1e6,
+        'p50_us': percentile(latencies, 0.50) * 1e6,
+        'p99_us': percentile(latencies, 0.99) * 1e6
+    }
+
+
+def run_mode(repository: BookRepository, uuids, copy_uuid: str, iterations: int) -> dict:
+    def lookup(index):
+        repository.get_book_by_uuid(uuids[index % len(uuids)])
+
+    def checkout_and_return(index):
+        repository.checkout_book(copy_uuid)
+        repository.return_book(copy_uuid)
+
+    lookup(0)
+    checkout_and_return(0)
+    return {
+        'point_lookup': measure(lookup, iterations),
+        'checkout_and_return': measure(checkout_and_return, iterations)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare plain and prepared statements against MySQL")
+    parser.add_argument('--iterations', type=int, default=5000)
+    args = parser.parse_args()
+
+    pool = create_pool()
+    try:
+        books = BookRepository(pool).get_books_page(None, 1000)
+        uuids = [book.uuid for book in books]
+        copy_uuid = next(book.uuid for book in books if book.is_available)
+
+        results = {'parameters': vars(args)}
+        for mode, statements in (('plain', None), ('prepared', StatementCache())):
+            results[mode] = run_mode(BookRepository(pool, statements=statements), uuids, copy_uuid, args.iterations)
+            if statements is not None:
+                results[mode]['statement_cache'] = statements.stats()
+
+        results['savings_pct'] = {
+            name: (1 - results['prepared'][name]['mean_us'] / results['plain'][name]['mean_us']) * 100
+            for name in ('point_lookup', 'checkout_and_return')
+        }
+    finally:
+        pool.close()
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
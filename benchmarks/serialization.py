@@ -0,0 +1,51 @@
+import argparse
+import json
+import time
+from proto import library_pb2
+from models.book import Book
+from handler.library_handler import add_book_rows, book_to_proto
+from benchmarks.stand_in import synthetic_catalog
+
+
+def via_books(rows) -> library_pb2.GetAllBooksResponse:
+    books = [Book(*row) for row in rows]
+    return library_pb2.GetAllBooksResponse(books=[book_to_proto(book) for book in books])
+
+
+def via_rows(rows) -> library_pb2.GetAllBooksResponse:
+    response = library_pb2.GetAllBooksResponse()
+    add_book_rows(response.books, rows)
+    return response
+
+
+def best_of(build, rows, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        build(rows).SerializeToString()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare Book-object and row-based GetAllBooks response building")
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    rows = [book.get_tuple() for book in synthetic_catalog(args.rows)]
+    if via_books(rows).SerializeToString() != via_rows(rows).SerializeToString():
+        raise RuntimeError("row path does not produce the same message")
+
+    books_seconds = best_of(via_books, rows, args.repeats)
+    rows_seconds = best_of(via_rows, rows, args.repeats)
+    print(json.dumps({
+        'parameters': vars(args),
+        'book_objects_ms': books_seconds * 1000,
+        'rows_ms': rows_seconds * 1000,
+        'speedup': books_seconds / rows_seconds
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import random
+import statistics
+import time
+from concurrent import futures
+import grpc
+from proto import library_pb2, library_pb2_grpc
+from main import build_server, build_async_server
+from benchmarks.stand_in import StandInBookRepository, synthetic_catalog
+
+
+def percentile(sorted_values, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def drive(target: str, uuids, concurrency: int, duration: float) -> dict:
+    latencies = []
+    errors = 0
+
+    async with grpc.aio.insecure_channel(target) as channel:
+        stub = library_pb2_grpc.LibraryStub(channel)
+        await channel.channel_ready()
+        deadline = time.perf_counter() + duration
+
+        async def worker(seed: int):
+            nonlocal errors
+            rng = random.Random(seed)
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    if rng.random() < 0.8:
+                        await stub.GetBook(library_pb2.GetBookRequest(uuid=rng.choice(uuids)))
+                    else:
+                        await stub.SearchBook(library_pb2.SearchBookRequest(bookAuthor='Austen'))
+                except grpc.aio.AioRpcError:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(seed) for seed in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'throughput_rps': len(latencies) / elapsed,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p95_ms': percentile(latencies, 0.95) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'mean_ms': statistics.fmean(latencies) * 1000 if latencies else 0.0
+    }
+
+
+def serve_sync(args, ready):
+    repository = StandInBookRepository(synthetic_catalog(args.catalog_size), latency=args.latency_ms / 1000)
+    server = build_server(repository, max_workers=args.workers)
+    ready.put(server.add_insecure_port('127.0.0.1:0'))
+    server.start()
+    server.wait_for_termination()
+
+
+def serve_async(args, ready):
+    repository = StandInBookRepository(synthetic_catalog(args.catalog_size), latency=args.latency_ms / 1000)
+    executor = futures.ThreadPoolExecutor(max_workers=args.workers)
+
+    async def run():
+        server = build_async_server(repository, executor)
+        ready.put(server.add_insecure_port('127.0.0.1:0'))
+        await server.start()
+        await server.wait_for_termination()
+
+    asyncio.run(run())
+
+
+def run_mode(serve, args) -> dict:
+    ready = multiprocessing.Queue()
+    process = multiprocessing.Process(target=serve, args=(args, ready), daemon=True)
+    process.start()
+    try:
+        port = ready.get(timeout=30)
+        uuids = [book.uuid for book in synthetic_catalog(args.catalog_size)]
+        return asyncio.run(drive(f'127.0.0.1:{port}', uuids, args.concurrency, args.duration))
+    finally:
+        process.terminate()
+        process.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare sync and asyncio server modes")
+    parser.add_argument('--catalog-size', type=int, default=5000)
+    parser.add_argument('--latency-ms', type=float, default=2.0, help="simulated database round trip")
+    parser.add_argument('--workers', type=int, default=10, help="sync handler threads / async DB executor threads")
+    parser.add_argument('--concurrency', type=int, default=200)
+    parser.add_argument('--duration', type=float, default=5.0)
+    args = parser.parse_args()
+
+    results = {'parameters': vars(args)}
+    for mode, serve in (('sync', serve_sync), ('async', serve_async)):
+        results[mode] = run_mode(serve, args)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+import random
+import time
+from typing import Iterator, List, Optional
+from models.book import AvailabilityChange, Book, BookRow, CreateBookResult, SearchCriteria
+from repository import DelegatingBookRepository, InMemoryBookRepository
+
+
+TITLES = ['Dune', 'Emma', 'Ulysses', 'Beloved', 'Middlemarch', 'Persuasion', 'Hamlet', 'Walden']
+AUTHORS = ['Frank Herbert', 'Jane Austen', 'James Joyce', 'Toni Morrison', 'George Eliot', 'Henry Thoreau']
+GENRES = ['Fiction', 'Fantasy', 'Science Fiction', 'Philosophy', 'Drama', 'Poetry']
+CONDITIONS = ['Excellent', 'Good', 'Fair', 'Worn']
+
+
+def synthetic_catalog(size: int, seed: int = 42) -> List[Book]:
+    rng = random.Random(seed)
+    return [
+        Book(
+            uuid=f"copy-{i:08d}",
+            title=f"{rng.choice(TITLES)} {i % 997}",
+            author=rng.choice(AUTHORS),
+            genre=rng.choice(GENRES),
+            is_available=rng.random() < 0.8,
+            book_condition=rng.choice(CONDITIONS)
+        )
+        for i in range(size)
+    ]
+
+
+class StandInBookRepository(DelegatingBookRepository):
+
+    def __init__(self, books: List[Book], latency: float = 0.0):
+        super().__init__(InMemoryBookRepository(books))
+        self._latency = latency
+
+    def _round_trip(self):
+        if self._latency:
+            time.sleep(self._latency)
+
+    def search_books(self, criteria: SearchCriteria) -> List[Book]:
+        self._round_trip()
+        return super().search_books(criteria)
+
+    def search_book_rows(self, criteria: SearchCriteria) -> List[BookRow]:
+        self._round_trip()
+        return super().search_book_rows(criteria)
+
+    def get_book_by_uuid(self, uuid: str) -> Book:
+        self._round_trip()
+        return super().get_book_by_uuid(uuid)
+
+    def get_books_by_uuids(self, uuids: List[str]) -> List[Optional[Book]]:
+        self._round_trip()
+        return super().get_books_by_uuids(uuids)
+
+    def create_book(self, book: Book) -> str:
+        self._round_trip()
+        return super().create_book(book)
+
+    def create_books(self, books: List[Book]) -> List[CreateBookResult]:
+        self._round_trip()
+        return super().create_books(books)
+
+    def update_book(self, book: Book) -> bool:
+        self._round_trip()
+        return super().update_book(book)
+
+    def checkout_book(self, uuid: str) -> AvailabilityChange:
+        self._round_trip()
+        return super().checkout_book(uuid)
+
+    def return_book(self, uuid: str) -> AvailabilityChange:
+        self._round_trip()
+        return super().return_book(uuid)
+
+    def checkout_books(self, uuids: List[str], all_or_nothing: bool = False) -> List[AvailabilityChange]:
+        self._round_trip()
+        return super().checkout_books(uuids, all_or_nothing)
+
+    def return_books(self, uuids: List[str], all_or_nothing: bool = False) -> List[AvailabilityChange]:
+        self._round_trip()
+        return super().return_books(uuids, all_or_nothing)
+
+    def delete_book(self, uuid: str) -> bool:
+        self._round_trip()
+        return super().delete_book(uuid)
+
+    def get_all_books(self) -> List[Book]:
+        self._round_trip()
+        return super().get_all_books()
+
+    def get_all_book_rows(self) -> List[BookRow]:
+        self._round_trip()
+        return super().get_all_book_rows()
+
+    def get_books_page(self, after_uuid: str, limit: int) -> List[Book]:
+        self._round_trip()
+        return super().get_books_page(after_uuid, limit)
+
+    def get_book_rows_page(self, after_uuid: str, limit: int) -> List[BookRow]:
+        self._round_trip()
+        return super().get_book_rows_page(after_uuid, limit)
+
+    def get_inventory_summary(self) -> dict:
+        self._round_trip()
+        return super().get_inventory_summary()
+
+    def iter_all_books(self, batch_size: int) -> Iterator[List[Book]]:
+        self._round_trip()
+        return super().iter_all_books(batch_size)
+
+    def iter_search_books(self, criteria: SearchCriteria, batch_size: int) -> Iterator[List[Book]]:
+        self._round_trip()
+        return super().iter_search_books(criteria, batch_size)
@@ -0,0 +1,9 @@
+from .server_config import ServerConfig, PRESETS, build_parser, load_server_config, read_config_file
+
+__all__ = [
+    'ServerConfig',
+    'PRESETS',
+    'build_parser',
+    'load_server_config',
+    'read_config_file'
+]
@@ -0,0 +1,211 @@
+import argparse
+import json
+import os
+from dataclasses import dataclass, field, fields, replace
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+
+def parse_bool(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    return str(value).lower() in ('1', 'true', 'yes')
+
+
+def parse_optional_int(value) -> Optional[int]:
+    if value is None or value == '':
+        return None
+    return int(value)
+
+
+def parse_optional_bool(value) -> Optional[bool]:
+    if value is None or value == '':
+        return None
+    return parse_bool(value)
+
+
+MESSAGE_SIZE_SETTINGS = ('max_send_message_bytes', 'max_receive_message_bytes')
+
+
+def setting(default, env: str, parse, option: str = None, help: str = None):
+    return field(default=default, metadata={'env': env, 'parse': parse, 'option': option, 'help': help})
+
+
+@dataclass(frozen=True)
+class ServerConfig:
+    host: str = setting('[::]', 'SERVER_HOST', str, help="address to listen on")
+    port: int = setting(50051, 'SERVER_PORT', int, help="port to listen on")
+    mode: str = setting('sync', 'LIBRARY_SERVER_MODE', str, help="sync (thread pool) or async (grpc.aio)")
+    workers: int = setting(10, 'SERVER_WORKERS', int, help="handler threads of the sync server")
+    processes: int = setting(
+        1, 'SERVER_PROCESSES', int,
+        help="server processes sharing the port through SO_REUSEPORT under a supervisor (default 1, no supervisor)")
+    shutdown_grace_seconds: float = setting(
+        10.0, 'SERVER_SHUTDOWN_GRACE_SECONDS', float,
+        help="seconds in-flight RPCs may finish after SIGTERM before they are cancelled")
+    max_concurrent_rpcs: Optional[int] = setting(
+        None, 'SERVER_MAX_CONCURRENT_RPCS', parse_optional_int,
+        help="RPCs in progress before new ones fail with RESOURCE_EXHAUSTED (default unlimited)")
+    max_send_message_bytes: Optional[int] = setting(
+        None, 'SERVER_MAX_SEND_MESSAGE_BYTES', parse_optional_int, 'grpc.max_send_message_length')
+    max_receive_message_bytes: Optional[int] = setting(
+        None, 'SERVER_MAX_RECEIVE_MESSAGE_BYTES', parse_optional_int, 'grpc.max_receive_message_length')
+    keepalive_time_ms: Optional[int] = setting(
+        None, 'SERVER_KEEPALIVE_TIME_MS', parse_optional_int, 'grpc.keepalive_time_ms')
+    keepalive_timeout_ms: Optional[int] = setting(
+        None, 'SERVER_KEEPALIVE_TIMEOUT_MS', parse_optional_int, 'grpc.keepalive_timeout_ms')
+    keepalive_permit_without_calls: Optional[bool] = setting(
+        None, 'SERVER_KEEPALIVE_PERMIT_WITHOUT_CALLS', parse_optional_bool, 'grpc.keepalive_permit_without_calls')
+    http2_min_ping_interval_ms: Optional[int] = setting(
+        None, 'SERVER_HTTP2_MIN_PING_INTERVAL_MS', parse_optional_int,
+        'grpc.http2.min_ping_interval_without_data_ms')
+    http2_max_ping_strikes: Optional[int] = setting(
+        None, 'SERVER_HTTP2_MAX_PING_STRIKES', parse_optional_int, 'grpc.http2.max_ping_strikes')
+    max_connection_idle_ms: Optional[int] = setting(
+        None, 'SERVER_MAX_CONNECTION_IDLE_MS', parse_optional_int, 'grpc.max_connection_idle_ms')
+    max_connection_age_ms: Optional[int] = setting(
+        None, 'SERVER_MAX_CONNECTION_AGE_MS', parse_optional_int, 'grpc.max_connection_age_ms')
+    max_connection_age_grace_ms: Optional[int] = setting(
+        None, 'SERVER_MAX_CONNECTION_AGE_GRACE_MS', parse_optional_int, 'grpc.max_connection_age_grace_ms')
+    http2_bdp_probe: Optional[bool] = setting(
+        None, 'SERVER_HTTP2_BDP_PROBE', parse_optional_bool, 'grpc.http2.bdp_probe')
+    http2_lookahead_bytes: Optional[int] = setting(
+        None, 'SERVER_HTTP2_LOOKAHEAD_BYTES', parse_optional_int, 'grpc.http2.lookahead_bytes')
+    http2_max_frame_size: Optional[int] = setting(
+        None, 'SERVER_HTTP2_MAX_FRAME_SIZE', parse_optional_int, 'grpc.http2.max_frame_size')
+    http2_write_buffer_size: Optional[int] = setting(
+        None, 'SERVER_HTTP2_WRITE_BUFFER_SIZE', parse_optional_int, 'grpc.http2.write_buffer_size')
+    db_pool_min_size: int = setting(2, 'DB_POOL_MIN_SIZE', int, help="connections opened at startup")
+    db_pool_max_size: int = setting(
+        10, 'DB_POOL_MAX_SIZE', int, help="connection pool bound, also the async server's database threads")
+
+    @property
+    def address(self) -> str:
+        return f"{self.host}:{self.port}"
+
+    def grpc_options(self) -> List[Tuple[str, int]]:
+        options = []
+        for spec in fields(self):
+            option = spec.metadata['option']
+            value = getattr(self, spec.name)
+            if option and value is not None:
+                options.append((option, int(value)))
+        if self.processes > 1:
+            options.append(('grpc.so_reuseport', 1))
+        return options
+
+    def validate(self) -> 'ServerConfig':
+        if self.mode not in ('sync', 'async'):
+            raise ValueError(f"mode must be sync or async, not {self.mode!r}")
+        if not 0 <= self.port <= 65535:
+            raise ValueError("port must be between 0 and 65535")
+        if self.workers < 1:
+            raise ValueError("workers must be at least 1")
+        if self.processes < 1:
+            raise ValueError("processes must be at least 1")
+        if self.processes > 1 and self.port == 0:
+            raise ValueError("several processes cannot share port 0, choose a port")
+        if self.shutdown_grace_seconds < 0:
+            raise ValueError("shutdown_grace_seconds must not be negative")
+        if self.max_concurrent_rpcs is not None and self.max_concurrent_rpcs < 1:
+            raise ValueError("max_concurrent_rpcs must be at least 1")
+        if not 0 <= self.db_pool_min_size <= self.db_pool_max_size or self.db_pool_max_size < 1:
+            raise ValueError("db pool sizes must satisfy 0 <= db_pool_min_size <= db_pool_max_size and max >= 1")
+        for spec in fields(self):
+            value = getattr(self, spec.name)
+            if not spec.metadata['option'] or value is None:
+                continue
+            if spec.name in MESSAGE_SIZE_SETTINGS and value < -1:
+                raise ValueError(f"{spec.name} must be -1 (unlimited) or a byte count")
+            if spec.name not in MESSAGE_SIZE_SETTINGS and value < 0:
+                raise ValueError(f"{spec.name} must not be negative")
+        return self
+
+
+PRESETS: Dict[str, Dict[str, object]] = {
+    'latency': {
+        'workers': 16,
+        'max_concurrent_rpcs': 32,
+        'db_pool_min_size': 16,
+        'db_pool_max_size': 16,
+        'keepalive_time_ms': 30000,
+        'keepalive_timeout_ms': 10000,
+        'keepalive_permit_without_calls': True,
+        'http2_min_ping_interval_ms': 10000,
+        'http2_bdp_probe': True
+    },
+    'throughput': {
+        'workers': 32,
+        'max_concurrent_rpcs': None,
+        'db_pool_min_size': 4,
+        'db_pool_max_size': 32,
+        'max_receive_message_bytes': 64 * 1024 * 1024,
+        'max_send_message_bytes': -1,
+        'http2_bdp_probe': True,
+        'http2_lookahead_bytes': 4 * 1024 * 1024,
+        'http2_max_frame_size': 1024 * 1024
+    }
+}
+
+
+def _apply(config: ServerConfig, values: Mapping[str, object], source: str) -> ServerConfig:
+    specs = {spec.name: spec for spec in fields(ServerConfig)}
+    changes = {}
+    for name, value in values.items():
+        spec = specs.get(name)
+        if spec is None:
+            raise ValueError(f"unknown server setting {name!r} in {source}")
+        try:
+            changes[name] = spec.metadata['parse'](value)
+        except (TypeError, ValueError):
+            raise ValueError(f"invalid value {value!r} for {name} in {source}")
+    return replace(config, **changes)
+
+
+def read_config_file(path: str) -> dict:
+    with open(path) as f:
+        values = json.load(f)
+    if not isinstance(values, dict):
+        raise ValueError(f"{path} must contain a JSON object")
+    return values
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Library gRPC server")
+    parser.add_argument('--config', help="JSON file of server settings (env: SERVER_CONFIG)")
+    parser.add_argument('--preset', choices=sorted(PRESETS), help="latency or throughput defaults (env: SERVER_PRESET)")
+    for spec in fields(ServerConfig):
+        parser.add_argument(
+            '--' + spec.name.replace('_', '-'),
+            dest=spec.name,
+            default=None,
+            help=f"{spec.metadata['help'] or spec.metadata['option']} (env: {spec.metadata['env']})"
+        )
+    return parser
+
+
+def load_server_config(argv: Sequence[str] = None, environ: Mapping[str, str] = None) -> ServerConfig:
+    environ = os.environ if environ is None else environ
+    args = build_parser().parse_args(argv if argv is not None else [])
+
+    config_path = args.config or environ.get('SERVER_CONFIG')
+    file_values = read_config_file(config_path) if config_path else {}
+    file_preset = file_values.pop('preset', None)
+    preset = args.preset or environ.get('SERVER_PRESET') or file_preset
+    if preset and preset not in PRESETS:
+        raise ValueError(f"unknown preset {preset!r}, expected one of {', '.join(sorted(PRESETS))}")
+
+    config = ServerConfig()
+    if preset:
+        config = _apply(config, PRESETS[preset], f"preset {preset}")
+    config = _apply(config, file_values, config_path or 'config file')
+    config = _apply(config, {
+        spec.name: environ[spec.metadata['env']]
+        for spec in fields(ServerConfig)
+        if environ.get(spec.metadata['env'])
+    }, 'environment')
+    config = _apply(config, {
+        spec.name: getattr(args, spec.name)
+        for spec in fields(ServerConfig)
+        if getattr(args, spec.name) is not None
+    }, 'command line')
+    return config.validate()
@@ -1,3 +1,4 @@
 from .library import ILibraryController, LibraryController
+from .async_library import IAsyncLibraryController, AsyncLibraryController
 
-__all__ = ['ILibraryController', 'LibraryController']
+__all__ = ['ILibraryController', 'LibraryController', 'IAsyncLibraryController', 'AsyncLibraryController']
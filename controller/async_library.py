@@ -0,0 +1,252 @@
+from abc import ABC, abstractmethod
+from typing import AsyncIterable, AsyncIterator, List, Optional, Tuple
+from models.book import Book, BookPage, BookRow, BookRowPage, CreateBookResult, SearchCriteria, SearchMode
+from repository.async_book_repository import IAsyncBookRepository
+from .library import (
+    DEFAULT_CREATE_BATCH_SIZE,
+    check_bulk_checkout,
+    check_bulk_copies,
+    check_change,
+    check_checkout,
+    check_found,
+    check_uuid,
+    check_uuids,
+    loan,
+    loans,
+    new_book,
+    queue_new_book,
+    returns,
+    search_criteria,
+    search_page,
+    search_page_criteria,
+    store_created,
+    stream_batch_size,
+    updated_book
+)
+from . import pagination
+
+
+class IAsyncLibraryController(ABC):
+
+    @abstractmethod
+    async def search_books(self, title: str = None, author: str = None, genre: str = None,
+                           match_all: bool = False, mode: SearchMode = SearchMode.SUBSTRING) -> List[Book]:
+        pass
+
+    @abstractmethod
+    async def search_book_rows(self, title: str = None, author: str = None, genre: str = None,
+                               match_all: bool = False, mode: SearchMode = SearchMode.SUBSTRING) -> List[BookRow]:
+        pass
+
+    @abstractmethod
+    async def checkout_book(self, user_id: str, copy_uuid: str, loan_time_days: int) -> dict:
+        pass
+
+    @abstractmethod
+    async def return_book(self, copy_uuid: str) -> bool:
+        pass
+
+    @abstractmethod
+    async def checkout_books(self, user_id: str, copy_uuids: List[str], loan_time_days: int,
+                             all_or_nothing: bool = False) -> List[dict]:
+        pass
+
+    @abstractmethod
+    async def return_books(self, copy_uuids: List[str], all_or_nothing: bool = False) -> List[dict]:
+        pass
+
+    @abstractmethod
+    async def add_book(self, title: str, author: str, genre: str, condition: str) -> str:
+        pass
+
+    @abstractmethod
+    async def add_books(self, entries: AsyncIterable[Tuple[str, str, str, str]]) -> List[CreateBookResult]:
+        pass
+
+    @abstractmethod
+    async def update_book(self, uuid: str, title: str = None, author: str = None, genre: str = None, condition: str = None) -> bool:
+        pass
+
+    @abstractmethod
+    async def remove_book(self, uuid: str) -> bool:
+        pass
+
+    @abstractmethod
+    async def get_book_details(self, uuid: str) -> Book:
+        pass
+
+    @abstractmethod
+    async def get_books_details(self, uuids: List[str]) -> List[Optional[Book]]:
+        pass
+
+    @abstractmethod
+    async def get_inventory_summary(self) -> dict:
+        pass
+
+    @abstractmethod
+    async def get_all_books(self) -> List[Book]:
+        pass
+
+    @abstractmethod
+    async def get_all_book_rows(self) -> List[BookRow]:
+        pass
+
+    @abstractmethod
+    async def list_books(self, page_size: int = 0, page_token: str = None) -> BookPage:
+        pass
+
+    @abstractmethod
+    async def list_book_rows(self, page_size: int = 0, page_token: str = None) -> BookRowPage:
+        pass
+
+    @abstractmethod
+    async def search_books_page(self, title: str = None, author: str = None, genre: str = None,
+                                match_all: bool = False, mode: SearchMode = SearchMode.SUBSTRING,
+                                page_size: int = 0, page_token: str = None) -> BookPage:
+        pass
+
+    @abstractmethod
+    async def search_book_rows_page(self, title: str = None, author: str = None, genre: str = None,
+                                    match_all: bool = False, mode: SearchMode = SearchMode.SUBSTRING,
+                                    page_size: int = 0, page_token: str = None) -> BookRowPage:
+        pass
+
+    @abstractmethod
+    def stream_all_books(self, batch_size: int = 0) -> AsyncIterator[List[Book]]:
+        pass
+
+    @abstractmethod
+    def stream_search_books(self, title: str = None, author: str = None, genre: str = None,
+                            match_all: bool = False, mode: SearchMode = SearchMode.SUBSTRING,
+                            batch_size: int = 0) -> AsyncIterator[List[Book]]:
+        pass
+
+
+class AsyncLibraryController(IAsyncLibraryController):
+
+    def __init__(self, book_repository: IAsyncBookRepository, create_batch_size: int = DEFAULT_CREATE_BATCH_SIZE):
+        if create_batch_size < 1:
+            raise ValueError("create_batch_size must be positive")
+
+        self._book_repository = book_repository
+        self._create_batch_size = create_batch_size
+
+    async def search_books(self, title: str = None, author: str = None, genre: str = None,
+                           match_all: bool = False, mode: SearchMode = SearchMode.SUBSTRING) -> List[Book]:
+        criteria = search_criteria(title, author, genre, match_all, mode)
+        if criteria is None:
+            return []
+
+        return await self._book_repository.search_books(criteria)
+
+    async def search_book_rows(self, title: str = None, author: str = None, genre: str = None,
+                               match_all: bool = False, mode: SearchMode = SearchMode.SUBSTRING) -> List[BookRow]:
+        criteria = search_criteria(title, author, genre, match_all, mode)
+        if criteria is None:
+            return []
+
+        return await self._book_repository.search_book_rows(criteria)
+
+    async def checkout_book(self, user_id: str, copy_uuid: str, loan_time_days: int) -> dict:
+        check_checkout(user_id, copy_uuid, loan_time_days)
+        return loan(copy_uuid, await self._book_repository.checkout_book(copy_uuid), loan_time_days)
+
+    async def return_book(self, copy_uuid: str) -> bool:
+        if not copy_uuid:
+            raise ValueError("copy_uuid is required")
+
+        check_change(copy_uuid, await self._book_repository.return_book(copy_uuid))
+        return True
+
+    async def checkout_books(self, user_id: str, copy_uuids: List[str], loan_time_days: int,
+                             all_or_nothing: bool = False) -> List[dict]:
+        check_bulk_checkout(user_id, copy_uuids, loan_time_days)
+        changes = await self._book_repository.checkout_books(copy_uuids, all_or_nothing)
+        return loans(copy_uuids, changes, loan_time_days)
+
+    async def return_books(self, copy_uuids: List[str], all_or_nothing: bool = False) -> List[dict]:
+        check_bulk_copies(copy_uuids)
+        return returns(copy_uuids, await self._book_repository.return_books(copy_uuids, all_or_nothing))
+
+    async def add_book(self, title: str, author: str, genre: str, condition: str) -> str:
+        book = new_book(title, author, genre, condition)
+        return await self._book_repository.create_book(book)
+
+    async def add_books(self, entries: AsyncIterable[Tuple[str, str, str, str]]) -> List[CreateBookResult]:
+        results = []
+        pending = []
+        async for entry in entries:
+            queue_new_book(entry, pending, results)
+            if len(pending) >= self._create_batch_size:
+                await self._create_pending(pending, results)
+
+        await self._create_pending(pending, results)
+        return results
+
+    async def _create_pending(self, pending: list, results: List[CreateBookResult]):
+        if pending:
+            store_created(pending, await self._book_repository.create_books([book for _, book in pending]), results)
+
+    async def update_book(self, uuid: str, title: str = None, author: str = None, genre: str = None, condition: str = None) -> bool:
+        check_uuid(uuid)
+        existing_book = check_found(uuid, await self._book_repository.get_book_by_uuid(uuid))
+        return await self._book_repository.update_book(updated_book(existing_book, title, author, genre, condition))
+
+    async def remove_book(self, uuid: str) -> bool:
+        check_uuid(uuid)
+        check_found(uuid, await self._book_repository.get_book_by_uuid(uuid))
+        return await self._book_repository.delete_book(uuid)
+
+    async def get_book_details(self, uuid: str) -> Book:
+        check_uuid(uuid)
+        return check_found(uuid, await self._book_repository.get_book_by_uuid(uuid))
+
+    async def get_books_details(self, uuids: List[str]) -> List[Optional[Book]]:
+        check_uuids(uuids)
+        if not uuids:
+            return []
+
+        return await self._book_repository.get_books_by_uuids(uuids)
+
+    async def get_inventory_summary(self) -> dict:
+        return await self._book_repository.get_inventory_summary()
+
+    async def get_all_books(self) -> List[Book]:
+        return await self._book_repository.get_all_books()
+
+    async def get_all_book_rows(self) -> List[BookRow]:
+        return await self._book_repository.get_all_book_rows()
+
+    async def list_books(self, page_size: int = 0, page_token: str = None) -> BookPage:
+        return pagination.to_book_page(await self.list_book_rows(page_size, page_token))
+
+    async def list_book_rows(self, page_size: int = 0, page_token: str = None) -> BookRowPage:
+        limit = pagination.page_size(page_size)
+        after_uuid = pagination.decode_page_token(page_token)
+
+        rows = await self._book_repository.get_book_rows_page(after_uuid, limit + 1)
+        return pagination.make_page(rows, limit)
+
+    async def search_books_page(self, title: str = None, author: str = None, genre: str = None,
+                                match_all: bool = False, mode: SearchMode = SearchMode.SUBSTRING,
+                                page_size: int = 0, page_token: str = None) -> BookPage:
+        page = await self.search_book_rows_page(title, author, genre, match_all, mode, page_size, page_token)
+        return pagination.to_book_page(page)
+
+    async def search_book_rows_page(self, title: str = None, author: str = None, genre: str = None,
+                                    match_all: bool = False, mode: SearchMode = SearchMode.SUBSTRING,
+                                    page_size: int = 0, page_token: str = None) -> BookRowPage:
+        criteria, limit = search_page_criteria(title, author, genre, match_all, mode, page_size, page_token)
+        if criteria is None:
+            return BookRowPage(rows=[], next_page_token='')
+
+        return search_page(criteria, await self._book_repository.search_book_rows(criteria), limit)
+
+    def stream_all_books(self, batch_size: int = 0) -> AsyncIterator[List[Book]]:
+        return self._book_repository.iter_all_books(stream_batch_size(batch_size))
+
+    def stream_search_books(self, title: str = None, author: str = None, genre: str = None,
+                            match_all: bool = False, mode: SearchMode = SearchMode.SUBSTRING,
+                            batch_size: int = 0) -> AsyncIterator[List[Book]]:
+        criteria = SearchCriteria(title=title, author=author, genre=genre, match_all=match_all, mode=mode)
+        return self._book_repository.iter_search_books(criteria, stream_batch_size(batch_size))
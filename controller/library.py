@@ -1,15 +1,244 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime, timedelta
-from models.book import Book
+from models.book import AvailabilityChange, AvailabilityStatus, Book, BookPage, BookRow, BookRowPage, CreateBookResult, SearchCriteria, SearchMode
 from repository.book_repository import IBookRepository
 import uuid as uuid_lib
+from . import pagination
+
+
+DEFAULT_STREAM_BATCH_SIZE = 500
+MAX_STREAM_BATCH_SIZE = 5000
+DEFAULT_CREATE_BATCH_SIZE = 500
+MAX_BATCH_GET_SIZE = 1000
+MAX_BULK_COPIES = 100
+
+AVAILABILITY_ERRORS = {
+    AvailabilityStatus.NOT_FOUND: "Book with uuid {uuid} not found",
+    AvailabilityStatus.ALREADY_CHECKED_OUT: "Book {uuid} is not available for checkout",
+    AvailabilityStatus.ALREADY_AVAILABLE: "Book {uuid} is already available",
+    AvailabilityStatus.ABORTED: "Book {uuid} was not changed because another copy in the request failed"
+}
+
+
+def stream_batch_size(batch_size: int) -> int:
+    if batch_size < 0:
+        raise ValueError("batch_size must not be negative")
+    if batch_size == 0:
+        return DEFAULT_STREAM_BATCH_SIZE
+    return min(batch_size, MAX_STREAM_BATCH_SIZE)
+
+
+def availability_error(copy_uuid: str, status: AvailabilityStatus) -> str:
+    return AVAILABILITY_ERRORS[status].format(uuid=copy_uuid)
+
+
+def check_bulk_copies(copy_uuids: List[str]):
+    if not copy_uuids:
+        raise ValueError("copy_uuids are required")
+
+    if len(copy_uuids) > MAX_BULK_COPIES:
+        raise ValueError(f"at most {MAX_BULK_COPIES} copies may be changed at once")
+
+    if not all(copy_uuids):
+        raise ValueError("copy_uuid is required")
+
+    if len(set(copy_uuids)) != len(copy_uuids):
+        raise ValueError("copy_uuids must be unique")
+
+
+def new_book(title: str, author: str, genre: str, condition: str) -> Book:
+    if not title or not author:
+        raise ValueError("title and author are required")
+
+    if not condition:
+        condition = "Good"
+
+    book_uuid = str(uuid_lib.uuid4())
+    book = Book(
+        uuid=book_uuid,
+        title=title,
+        author=author,
+        genre=genre or "",
+        is_available=True,
+        book_condition=condition
+    )
+    return book
+
+
+def search_criteria(title: str, author: str, genre: str, match_all: bool, mode: SearchMode) -> Optional[SearchCriteria]:
+    if not title and not author and not genre:
+        return None
+
+    return SearchCriteria(title=title, author=author, genre=genre, match_all=match_all, mode=mode)
+
+
+def search_page_criteria(title: str, author: str, genre: str, match_all: bool, mode: SearchMode,
+                         page_size: int, page_token: str) -> Tuple[Optional[SearchCriteria], int]:
+    limit = pagination.page_size(page_size)
+
+    if mode == SearchMode.FULLTEXT:
+        offset = pagination.decode_offset_token(page_token)
+        after_uuid = None
+    else:
+        offset = 0
+        after_uuid = pagination.decode_page_token(page_token)
+
+    if not title and not author and not genre:
+        return None, limit
+
+    criteria = SearchCriteria(
+        title=title,
+        author=author,
+        genre=genre,
+        match_all=match_all,
+        mode=mode,
+        after_uuid=after_uuid,
+        limit=limit + 1,
+        offset=offset
+    )
+    return criteria, limit
+
+
+def search_page(criteria: SearchCriteria, rows: List[BookRow], limit: int) -> BookRowPage:
+    if criteria.mode == SearchMode.FULLTEXT:
+        return pagination.make_ranked_page(rows, limit, criteria.offset)
+    return pagination.make_page(rows, limit)
+
+
+def check_uuid(uuid: str):
+    if not uuid:
+        raise ValueError("uuid is required")
+
+
+def check_found(uuid: str, book: Optional[Book]) -> Book:
+    if not book:
+        raise ValueError(f"Book with uuid {uuid} not found")
+
+    return book
+
+
+def check_uuids(uuids: List[str]):
+    if len(uuids) > MAX_BATCH_GET_SIZE:
+        raise ValueError(f"at most {MAX_BATCH_GET_SIZE} uuids may be requested at once")
+
+    if not all(uuids):
+        raise ValueError("uuid is required")
+
+
+def check_loan_time(loan_time_days: int):
+    if loan_time_days <= 0:
+        raise ValueError("loan_time_days must be positive")
+
+
+def check_checkout(user_id: str, copy_uuid: str, loan_time_days: int):
+    if not user_id or not copy_uuid:
+        raise ValueError("user_id and copy_uuid are required")
+
+    check_loan_time(loan_time_days)
+
+
+def check_bulk_checkout(user_id: str, copy_uuids: List[str], loan_time_days: int):
+    if not user_id:
+        raise ValueError("user_id is required")
+
+    check_loan_time(loan_time_days)
+    check_bulk_copies(copy_uuids)
+
+
+def check_change(copy_uuid: str, change: AvailabilityChange):
+    if change.status != AvailabilityStatus.UPDATED:
+        raise ValueError(availability_error(copy_uuid, change.status))
+
+
+def due_date(loan_time_days: int) -> str:
+    return (datetime.now() + timedelta(days=loan_time_days)).strftime("%Y-%m-%d")
+
+
+def loan(copy_uuid: str, change: AvailabilityChange, loan_time_days: int) -> dict:
+    check_change(copy_uuid, change)
+
+    return {
+        'loan_id': str(uuid_lib.uuid4()),
+        'due_date': due_date(loan_time_days),
+        'book_title': change.book.title,
+        'book_author': change.book.author
+    }
+
+
+def loans(copy_uuids: List[str], changes: List[AvailabilityChange], loan_time_days: int) -> List[dict]:
+    due_date_str = due_date(loan_time_days)
+
+    results = []
+    for copy_uuid, change in zip(copy_uuids, changes):
+        if change.status != AvailabilityStatus.UPDATED:
+            results.append({
+                'copy_uuid': copy_uuid,
+                'success': False,
+                'error': availability_error(copy_uuid, change.status)
+            })
+            continue
+
+        results.append({
+            'copy_uuid': copy_uuid,
+            'success': True,
+            'loan_id': str(uuid_lib.uuid4()),
+            'due_date': due_date_str,
+            'book_title': change.book.title,
+            'book_author': change.book.author
+        })
+    return results
+
+
+def returns(copy_uuids: List[str], changes: List[AvailabilityChange]) -> List[dict]:
+    return [
+        {
+            'copy_uuid': copy_uuid,
+            'success': change.status == AvailabilityStatus.UPDATED,
+            'error': availability_error(copy_uuid, change.status) if change.status != AvailabilityStatus.UPDATED else ''
+        }
+        for copy_uuid, change in zip(copy_uuids, changes)
+    ]
+
+
+def updated_book(existing_book: Book, title: str, author: str, genre: str, condition: str) -> Book:
+    return Book(
+        uuid=existing_book.uuid,
+        title=title if title else existing_book.title,
+        author=author if author else existing_book.author,
+        genre=genre if genre else existing_book.genre,
+        is_available=existing_book.is_available,
+        book_condition=condition if condition else existing_book.book_condition
+    )
+
+
+def queue_new_book(entry: Tuple[str, str, str, str], pending: list, results: List[CreateBookResult]):
+    try:
+        book = new_book(*entry)
+    except ValueError as e:
+        results.append(CreateBookResult(uuid=None, error=str(e)))
+        return
+
+    pending.append((len(results), book))
+    results.append(None)
+
+
+def store_created(pending: list, created: List[CreateBookResult], results: List[CreateBookResult]):
+    for (index, _), result in zip(pending, created):
+        results[index] = result
+    pending.clear()
 
 
 class ILibraryController(ABC):
 
     @abstractmethod
-    def search_books(self, title: str = None, author: str = None, genre: str = None) -> List[Book]:
+    def search_books(self, title: str = None, author: str = None, genre: str = None,
+                     match_all: bool = False, mode: SearchMode = SearchMode.SUBSTRING) -> List[Book]:
+        pass
+
+    @abstractmethod
+    def search_book_rows(self, title: str = None, author: str = None, genre: str = None,
+                         match_all: bool = False, mode: SearchMode = SearchMode.SUBSTRING) -> List[BookRow]:
         pass
 
     @abstractmethod
@@ -20,10 +249,23 @@ class ILibraryController(ABC):
     def return_book(self, copy_uuid: str) -> bool:
         pass
 
+    @abstractmethod
+    def checkout_books(self, user_id: str, copy_uuids: List[str], loan_time_days: int,
+                       all_or_nothing: bool = False) -> List[dict]:
+        pass
+
+    @abstractmethod
+    def return_books(self, copy_uuids: List[str], all_or_nothing: bool = False) -> List[dict]:
+        pass
+
     @abstractmethod
     def add_book(self, title: str, author: str, genre: str, condition: str) -> str:
         pass
 
+    @abstractmethod
+    def add_books(self, entries: Iterable[Tuple[str, str, str, str]]) -> List[CreateBookResult]:
+        pass
+
     @abstractmethod
     def update_book(self, uuid: str, title: str = None, author: str = None, genre: str = None, condition: str = None) -> bool:
         pass
@@ -36,6 +278,10 @@ class ILibraryController(ABC):
     def get_book_details(self, uuid: str) -> Book:
         pass
 
+    @abstractmethod
+    def get_books_details(self, uuids: List[str]) -> List[Optional[Book]]:
+        pass
+
     @abstractmethod
     def get_inventory_summary(self) -> dict:
         pass
@@ -44,140 +290,166 @@ class ILibraryController(ABC):
     def get_all_books(self) -> List[Book]:
         pass
 
+    @abstractmethod
+    def get_all_book_rows(self) -> List[BookRow]:
+        pass
 
-class LibraryController(ILibraryController):
-
-    def __init__(self, book_repository: IBookRepository):
-        self._book_repository = book_repository
+    @abstractmethod
+    def list_books(self, page_size: int = 0, page_token: str = None) -> BookPage:
+        pass
 
-    def search_books(self, title: str = None, author: str = None, genre: str = None) -> List[Book]:
-        if not title and not author and not genre:
-            return []
+    @abstractmethod
+    def list_book_rows(self, page_size: int = 0, page_token: str = None) -> BookRowPage:
+        pass
 
-        results = []
+    @abstractmethod
+    def search_books_page(self, title: str = None, author: str = None, genre: str = None,
+                          match_all: bool = False, mode: SearchMode = SearchMode.SUBSTRING,
+                          page_size: int = 0, page_token: str = None) -> BookPage:
+        pass
 
-        if title:
-            results.extend(self._book_repository.search_books_by_title(title))
+    @abstractmethod
+    def search_book_rows_page(self, title: str = None, author: str = None, genre: str = None,
+                              match_all: bool = False, mode: SearchMode = SearchMode.SUBSTRING,
+                              page_size: int = 0, page_token: str = None) -> BookRowPage:
+        pass
 
-        if author:
-            author_results = self._book_repository.search_books_by_author(author)
-            results.extend(author_results)
+    @abstractmethod
+    def stream_all_books(self, batch_size: int = 0) -> Iterator[List[Book]]:
+        pass
 
-        if genre:
-            genre_results = self._book_repository.search_books_by_genre(genre)
-            results.extend(genre_results)
+    @abstractmethod
+    def stream_search_books(self, title: str = None, author: str = None, genre: str = None,
+                            match_all: bool = False, mode: SearchMode = SearchMode.SUBSTRING,
+                            batch_size: int = 0) -> Iterator[List[Book]]:
+        pass
 
-        seen = set()
-        unique_results = []
-        for book in results:
-            if book.uuid not in seen:
-                seen.add(book.uuid)
-                unique_results.append(book)
 
-        return unique_results
+class LibraryController(ILibraryController):
 
-    def checkout_book(self, user_id: str, copy_uuid: str, loan_time_days: int) -> dict:
-        if not user_id or not copy_uuid:
-            raise ValueError("user_id and copy_uuid are required")
+    def __init__(self, book_repository: IBookRepository, create_batch_size: int = DEFAULT_CREATE_BATCH_SIZE):
+        if create_batch_size < 1:
+            raise ValueError("create_batch_size must be positive")
 
-        if loan_time_days <= 0:
-            raise ValueError("loan_time_days must be positive")
+        self._book_repository = book_repository
+        self._create_batch_size = create_batch_size
 
-        book = self._book_repository.get_book_by_uuid(copy_uuid)
-        if not book:
-            raise ValueError(f"Book with uuid {copy_uuid} not found")
+    def search_books(self, title: str = None, author: str = None, genre: str = None,
+                     match_all: bool = False, mode: SearchMode = SearchMode.SUBSTRING) -> List[Book]:
+        criteria = search_criteria(title, author, genre, match_all, mode)
+        if criteria is None:
+            return []
 
-        if not book.is_available:
-            raise ValueError(f"Book {copy_uuid} is not available for checkout")
+        return self._book_repository.search_books(criteria)
 
-        success = self._book_repository.checkout_book(copy_uuid)
-        if not success:
-            raise ValueError(f"Failed to checkout book {copy_uuid}")
+    def search_book_rows(self, title: str = None, author: str = None, genre: str = None,
+                         match_all: bool = False, mode: SearchMode = SearchMode.SUBSTRING) -> List[BookRow]:
+        criteria = search_criteria(title, author, genre, match_all, mode)
+        if criteria is None:
+            return []
 
-        loan_id = str(uuid_lib.uuid4())
-        due_date = datetime.now() + timedelta(days=loan_time_days)
-        due_date_str = due_date.strftime("%Y-%m-%d")
+        return self._book_repository.search_book_rows(criteria)
 
-        return {
-            'loan_id': loan_id,
-            'due_date': due_date_str,
-            'book_title': book.title,
-            'book_author': book.author
-        }
+    def checkout_book(self, user_id: str, copy_uuid: str, loan_time_days: int) -> dict:
+        check_checkout(user_id, copy_uuid, loan_time_days)
+        return loan(copy_uuid, self._book_repository.checkout_book(copy_uuid), loan_time_days)
 
     def return_book(self, copy_uuid: str) -> bool:
         if not copy_uuid:
             raise ValueError("copy_uuid is required")
 
-        book = self._book_repository.get_book_by_uuid(copy_uuid)
-        if not book:
-            raise ValueError(f"Book with uuid {copy_uuid} not found")
+        check_change(copy_uuid, self._book_repository.return_book(copy_uuid))
+        return True
 
-        if book.is_available:
-            raise ValueError(f"Book {copy_uuid} is already available")
+    def checkout_books(self, user_id: str, copy_uuids: List[str], loan_time_days: int,
+                       all_or_nothing: bool = False) -> List[dict]:
+        check_bulk_checkout(user_id, copy_uuids, loan_time_days)
+        changes = self._book_repository.checkout_books(copy_uuids, all_or_nothing)
+        return loans(copy_uuids, changes, loan_time_days)
 
-        return self._book_repository.return_book(copy_uuid)
+    def return_books(self, copy_uuids: List[str], all_or_nothing: bool = False) -> List[dict]:
+        check_bulk_copies(copy_uuids)
+        return returns(copy_uuids, self._book_repository.return_books(copy_uuids, all_or_nothing))
 
     def add_book(self, title: str, author: str, genre: str, condition: str) -> str:
-        if not title or not author:
-            raise ValueError("title and author are required")
-
-        if not condition:
-            condition = "Good"
-
-        book_uuid = str(uuid_lib.uuid4())
-        book = Book(
-            uuid=book_uuid,
-            title=title,
-            author=author,
-            genre=genre or "",
-            is_available=True,
-            book_condition=condition
-        )
-
+        book = new_book(title, author, genre, condition)
         return self._book_repository.create_book(book)
 
-    def update_book(self, uuid: str, title: str = None, author: str = None, genre: str = None, condition: str = None) -> bool:
-        if not uuid:
-            raise ValueError("uuid is required")
+    def add_books(self, entries: Iterable[Tuple[str, str, str, str]]) -> List[CreateBookResult]:
+        results = []
+        pending = []
+        for entry in entries:
+            queue_new_book(entry, pending, results)
+            if len(pending) >= self._create_batch_size:
+                self._create_pending(pending, results)
 
-        existing_book = self._book_repository.get_book_by_uuid(uuid)
-        if not existing_book:
-            raise ValueError(f"Book with uuid {uuid} not found")
+        self._create_pending(pending, results)
+        return results
 
-        updated_book = Book(
-            uuid=uuid,
-            title=title if title else existing_book.title,
-            author=author if author else existing_book.author,
-            genre=genre if genre else existing_book.genre,
-            is_available=existing_book.is_available,
-            book_condition=condition if condition else existing_book.book_condition
-        )
+    def _create_pending(self, pending: list, results: List[CreateBookResult]):
+        if pending:
+            store_created(pending, self._book_repository.create_books([book for _, book in pending]), results)
 
-        return self._book_repository.update_book(updated_book)
+    def update_book(self, uuid: str, title: str = None, author: str = None, genre: str = None, condition: str = None) -> bool:
+        check_uuid(uuid)
+        existing_book = check_found(uuid, self._book_repository.get_book_by_uuid(uuid))
+        return self._book_repository.update_book(updated_book(existing_book, title, author, genre, condition))
 
     def remove_book(self, uuid: str) -> bool:
-        if not uuid:
-            raise ValueError("uuid is required")
-
-        book = self._book_repository.get_book_by_uuid(uuid)
-        if not book:
-            raise ValueError(f"Book with uuid {uuid} not found")
-
+        check_uuid(uuid)
+        check_found(uuid, self._book_repository.get_book_by_uuid(uuid))
         return self._book_repository.delete_book(uuid)
 
     def get_book_details(self, uuid: str) -> Book:
-        if not uuid:
-            raise ValueError("uuid is required")
+        check_uuid(uuid)
+        return check_found(uuid, self._book_repository.get_book_by_uuid(uuid))
 
-        book = self._book_repository.get_book_by_uuid(uuid)
-        if not book:
-            raise ValueError(f"Book with uuid {uuid} not found")
+    def get_books_details(self, uuids: List[str]) -> List[Optional[Book]]:
+        check_uuids(uuids)
+        if not uuids:
+            return []
 
-        return book
+        return self._book_repository.get_books_by_uuids(uuids)
 
     def get_inventory_summary(self) -> dict:
         return self._book_repository.get_inventory_summary()
 
     def get_all_books(self) -> List[Book]:
         return self._book_repository.get_all_books()
+
+    def get_all_book_rows(self) -> List[BookRow]:
+        return self._book_repository.get_all_book_rows()
+
+    def list_books(self, page_size: int = 0, page_token: str = None) -> BookPage:
+        return pagination.to_book_page(self.list_book_rows(page_size, page_token))
+
+    def list_book_rows(self, page_size: int = 0, page_token: str = None) -> BookRowPage:
+        limit = pagination.page_size(page_size)
+        after_uuid = pagination.decode_page_token(page_token)
+
+        rows = self._book_repository.get_book_rows_page(after_uuid, limit + 1)
+        return pagination.make_page(rows, limit)
+
+    def search_books_page(self, title: str = None, author: str = None, genre: str = None,
+                          match_all: bool = False, mode: SearchMode = SearchMode.SUBSTRING,
+                          page_size: int = 0, page_token: str = None) -> BookPage:
+        page = self.search_book_rows_page(title, author, genre, match_all, mode, page_size, page_token)
+        return pagination.to_book_page(page)
+
+    def search_book_rows_page(self, title: str = None, author: str = None, genre: str = None,
+                              match_all: bool = False, mode: SearchMode = SearchMode.SUBSTRING,
+                              page_size: int = 0, page_token: str = None) -> BookRowPage:
+        criteria, limit = search_page_criteria(title, author, genre, match_all, mode, page_size, page_token)
+        if criteria is None:
+            return BookRowPage(rows=[], next_page_token='')
+
+        return search_page(criteria, self._book_repository.search_book_rows(criteria), limit)
+
+    def stream_all_books(self, batch_size: int = 0) -> Iterator[List[Book]]:
+        return self._book_repository.iter_all_books(stream_batch_size(batch_size))
+
+    def stream_search_books(self, title: str = None, author: str = None, genre: str = None,
+                            match_all: bool = False, mode: SearchMode = SearchMode.SUBSTRING,
+                            batch_size: int = 0) -> Iterator[List[Book]]:
+        criteria = SearchCriteria(title=title, author=author, genre=genre, match_all=match_all, mode=mode)
+        return self._book_repository.iter_search_books(criteria, stream_batch_size(batch_size))
@@ -0,0 +1,79 @@
+import base64
+import binascii
+from typing import List, Optional
+from models.book import Book, BookPage, BookRow, BookRowPage
+
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+MAX_RANKED_OFFSET = 10000
+
+KEYSET_TOKEN_PREFIX = 'k:'
+OFFSET_TOKEN_PREFIX = 'o:'
+
+
+def page_size(requested: int) -> int:
+    if requested < 0:
+        raise ValueError("page_size must not be negative")
+    if requested == 0:
+        return DEFAULT_PAGE_SIZE
+    return min(requested, MAX_PAGE_SIZE)
+
+
+def encode_page_token(last_uuid: str) -> str:
+    return _encode(KEYSET_TOKEN_PREFIX + last_uuid)
+
+
+def decode_page_token(token: str) -> Optional[str]:
+    if not token:
+        return None
+    return _decode(token, KEYSET_TOKEN_PREFIX)
+
+
+def encode_offset_token(offset: int) -> str:
+    return _encode(f"{OFFSET_TOKEN_PREFIX}{offset}")
+
+
+def decode_offset_token(token: str) -> int:
+    if not token:
+        return 0
+
+    value = _decode(token, OFFSET_TOKEN_PREFIX)
+    if not value.isdigit() or int(value) >= MAX_RANKED_OFFSET:
+        raise ValueError("invalid page_token")
+    return int(value)
+
+
+def make_page(rows: List[BookRow], limit: int) -> BookRowPage:
+    if len(rows) <= limit:
+        return BookRowPage(rows=rows, next_page_token='')
+
+    rows = rows[:limit]
+    return BookRowPage(rows=rows, next_page_token=encode_page_token(rows[-1][0]))
+
+
+def make_ranked_page(rows: List[BookRow], limit: int, offset: int) -> BookRowPage:
+    if len(rows) <= limit or offset + limit >= MAX_RANKED_OFFSET:
+        return BookRowPage(rows=rows, next_page_token='')
+
+    return BookRowPage(rows=rows[:limit], next_page_token=encode_offset_token(offset + limit))
+
+
+def to_book_page(page: BookRowPage) -> BookPage:
+    return BookPage(books=[Book(*row) for row in page.rows], next_page_token=page.next_page_token)
+
+
+def _encode(raw: str) -> str:
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def _decode(token: str, prefix: str) -> str:
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)).decode('utf-8')
+    except (binascii.Error, UnicodeDecodeError):
+        raise ValueError("invalid page_token")
+
+    if not raw.startswith(prefix) or len(raw) == len(prefix):
+        raise ValueError("invalid page_token")
+
+    return raw[len(prefix):]
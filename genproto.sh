@@ -1,3 +1,3 @@
 #!/bin/bash
 
-python -m grpc.tools.protoc --proto_path=. --python_out=. --grpc_python_out=. proto/library.proto
\ No newline at end of file
+python -m grpc.tools.protoc --proto_path=. --python_out=. --grpc_python_out=. proto/library.proto proto/admin.proto
\ No newline at end of file
@@ -1,3 +1,23 @@
-from .library_handler import LibraryHandler
-
-__all__ = ['LibraryHandler']
+from .library_handler import LibraryHandler
+from .async_library_handler import AsyncLibraryHandler
+from .admin_handler import AdminHandler, AsyncAdminHandler, server_stats_to_proto, trace_to_proto
+from .metrics_interceptor import MetricsInterceptor, AsyncMetricsInterceptor
+from .tracing_interceptor import TracingInterceptor, AsyncTracingInterceptor, incoming_trace
+from .response_snapshots import ResponseSnapshots, add_library_servicer_to_server, serialize_response
+
+__all__ = [
+    'LibraryHandler',
+    'AsyncLibraryHandler',
+    'AdminHandler',
+    'AsyncAdminHandler',
+    'server_stats_to_proto',
+    'trace_to_proto',
+    'MetricsInterceptor',
+    'AsyncMetricsInterceptor',
+    'TracingInterceptor',
+    'AsyncTracingInterceptor',
+    'incoming_trace',
+    'ResponseSnapshots',
+    'add_library_servicer_to_server',
+    'serialize_response'
+]
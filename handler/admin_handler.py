@@ -0,0 +1,218 @@
+import asyncio
+import grpc
+from google.protobuf import json_format
+from proto import admin_pb2, admin_pb2_grpc
+from metrics import ServerStats
+from profiling import ProfilerBusyError, SamplingProfiler, SlowQueryLog, collapsed
+from tracing import Trace, Tracer
+
+
+DEFAULT_TRACE_LIMIT = 100
+DEFAULT_PROFILE_INTERVAL_MS = 10.0
+
+
+def fill_histogram(histogram: admin_pb2.LatencyHistogram, snapshot: dict):
+    histogram.count = snapshot['count']
+    histogram.meanMs = snapshot['mean_ms']
+    histogram.p50Ms = snapshot['p50_ms']
+    histogram.p95Ms = snapshot['p95_ms']
+    histogram.p99Ms = snapshot['p99_ms']
+    histogram.maxMs = snapshot['max_ms']
+    for upper_bound_ms, count in snapshot['buckets']:
+        histogram.buckets.add(upperBoundMs=upper_bound_ms, count=count)
+
+
+def server_stats_to_proto(stats: dict) -> admin_pb2.GetServerStatsResponse:
+    response = admin_pb2.GetServerStatsResponse(uptimeSeconds=stats['uptime_seconds'])
+    for method, method_stats in stats['rpcs'].items():
+        entry = response.methods.add(method=method, inFlight=method_stats['in_flight'])
+        entry.statusCodes.update(method_stats['status_codes'])
+        fill_histogram(entry.latency, method_stats['latency'])
+    for query, query_stats in stats['queries'].items():
+        entry = response.queries.add(query=query, rows=query_stats['rows'], errors=query_stats['errors'])
+        fill_histogram(entry.latency, query_stats['latency'])
+    json_format.ParseDict(stats['components'], response.components)
+    return response
+
+
+def trace_to_proto(trace: Trace) -> admin_pb2.Trace:
+    message = admin_pb2.Trace(
+        traceId=trace.trace_id,
+        name=trace.name,
+        startedAt=trace.started_at,
+        durationMs=trace.duration_seconds * 1000
+    )
+    for layer, seconds in trace.layer_seconds().items():
+        message.layerMs[layer] = seconds * 1000
+    for span in trace.spans:
+        message.spans.add(
+            spanId=span.span_id,
+            parentId=span.parent_id or '',
+            name=span.name,
+            layer=span.layer,
+            offsetMs=span.offset_seconds * 1000,
+            durationMs=span.duration_seconds * 1000,
+            error=span.error or '',
+            attributes=span.attributes
+        )
+    return message
+
+
+def get_traces(tracer: Tracer, request) -> admin_pb2.GetTracesResponse:
+    if request.limit < 0:
+        raise ValueError("limit must not be negative")
+    if request.minDurationMs < 0:
+        raise ValueError("minDurationMs must not be negative")
+
+    traces = tracer.buffer.traces(
+        limit=request.limit or DEFAULT_TRACE_LIMIT,
+        trace_id=request.traceId or None,
+        min_duration_seconds=request.minDurationMs / 1000
+    )
+    return admin_pb2.GetTracesResponse(traces=[trace_to_proto(trace) for trace in traces])
+
+
+def profile(profiler: SamplingProfiler, request) -> admin_pb2.ProfileResponse:
+    result = profiler.profile(
+        request.durationSeconds,
+        interval=(request.intervalMs or DEFAULT_PROFILE_INTERVAL_MS) / 1000,
+        include_idle=request.includeIdle
+    )
+    return admin_pb2.ProfileResponse(
+        samples=result['samples'],
+        durationSeconds=result['duration_seconds'],
+        collapsedStacks=collapsed(result['stacks'])
+    )
+
+
+def explain_value(value):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode('utf-8', 'replace')
+    return str(value)
+
+
+def get_slow_queries(slow_queries: SlowQueryLog, request) -> admin_pb2.GetSlowQueriesResponse:
+    if request.limit < 0:
+        raise ValueError("limit must not be negative")
+
+    entries = slow_queries.entries(limit=request.limit, explain=request.explain)
+    stats = slow_queries.stats()
+    response = admin_pb2.GetSlowQueriesResponse(thresholdMs=stats['threshold_ms'], recorded=stats['recorded'])
+    for entry in entries:
+        message = response.queries.add(
+            query=entry.query,
+            sql=entry.sql,
+            parameterShape=entry.parameter_shape,
+            durationMs=entry.duration_seconds * 1000,
+            startedAt=entry.started_at,
+            explainError=entry.explain_error or ''
+        )
+        for row in entry.explain or ():
+            json_format.ParseDict({column: explain_value(value) for column, value in row.items()}, message.explain.add())
+    return response
+
+
+ERROR_CODES = (
+    (ValueError, grpc.StatusCode.INVALID_ARGUMENT),
+    (ProfilerBusyError, grpc.StatusCode.FAILED_PRECONDITION)
+)
+
+
+def set_error(context, error: Exception):
+    codes = (code for error_type, code in ERROR_CODES if isinstance(error, error_type))
+    context.set_code(next(codes, grpc.StatusCode.INTERNAL))
+    context.set_details(str(error))
+
+
+class AdminHandler(admin_pb2_grpc.AdminServicer):
+
+    def __init__(self, server_stats: ServerStats = None, tracer: Tracer = None,
+                 profiler: SamplingProfiler = None, slow_queries: SlowQueryLog = None):
+        self._server_stats = server_stats
+        self._tracer = tracer
+        self._profiler = profiler
+        self._slow_queries = slow_queries
+
+    def _disabled(self, method: str, context) -> bool:
+        disabled = {
+            'GetServerStats': (self._server_stats is None, "Metrics are disabled"),
+            'GetTraces': (self._tracer is None or self._tracer.buffer is None, "Trace buffer is disabled"),
+            'Profile': (self._profiler is None, "Profiler is disabled"),
+            'GetSlowQueries': (self._slow_queries is None, "Slow query log is disabled")
+        }
+        is_disabled, details = disabled[method]
+        if is_disabled:
+            context.set_code(grpc.StatusCode.FAILED_PRECONDITION)
+            context.set_details(details)
+        return is_disabled
+
+    def GetServerStats(self, request, context):
+        if self._disabled('GetServerStats', context):
+            return admin_pb2.GetServerStatsResponse()
+
+        try:
+            return server_stats_to_proto(self._server_stats.collect())
+        except Exception as e:
+            set_error(context, e)
+            return admin_pb2.GetServerStatsResponse()
+
+    def GetTraces(self, request, context):
+        if self._disabled('GetTraces', context):
+            return admin_pb2.GetTracesResponse()
+
+        try:
+            return get_traces(self._tracer, request)
+        except Exception as e:
+            set_error(context, e)
+            return admin_pb2.GetTracesResponse()
+
+    def Profile(self, request, context):
+        if self._disabled('Profile', context):
+            return admin_pb2.ProfileResponse()
+
+        try:
+            return profile(self._profiler, request)
+        except Exception as e:
+            set_error(context, e)
+            return admin_pb2.ProfileResponse()
+
+    def GetSlowQueries(self, request, context):
+        if self._disabled('GetSlowQueries', context):
+            return admin_pb2.GetSlowQueriesResponse()
+
+        try:
+            return get_slow_queries(self._slow_queries, request)
+        except Exception as e:
+            set_error(context, e)
+            return admin_pb2.GetSlowQueriesResponse()
+
+
+class AsyncAdminHandler(AdminHandler):
+
+    async def GetServerStats(self, request, context):
+        return super().GetServerStats(request, context)
+
+    async def GetTraces(self, request, context):
+        return super().GetTraces(request, context)
+
+    async def Profile(self, request, context):
+        if self._disabled('Profile', context):
+            return admin_pb2.ProfileResponse()
+
+        try:
+            return await asyncio.to_thread(profile, self._profiler, request)
+        except Exception as e:
+            set_error(context, e)
+            return admin_pb2.ProfileResponse()
+
+    async def GetSlowQueries(self, request, context):
+        if self._disabled('GetSlowQueries', context):
+            return admin_pb2.GetSlowQueriesResponse()
+
+        try:
+            return await asyncio.to_thread(get_slow_queries, self._slow_queries, request)
+        except Exception as e:
+            set_error(context, e)
+            return admin_pb2.GetSlowQueriesResponse()
@@ -0,0 +1,200 @@
+import grpc
+from proto import library_pb2, library_pb2_grpc
+from controller.async_library import IAsyncLibraryController
+from .response_snapshots import ResponseSnapshots
+from .library_handler import (
+    all_books_response,
+    batch_create_response,
+    batch_get_response,
+    book_batch,
+    book_to_proto,
+    bulk_checkout_response,
+    bulk_return_response,
+    checkout_response,
+    create_entry,
+    inventory_response,
+    is_paged,
+    search_response,
+    search_terms,
+    set_error,
+    update_terms
+)
+
+
+class AsyncLibraryHandler(library_pb2_grpc.LibraryServicer):
+
+    def __init__(self, library_controller: IAsyncLibraryController, snapshots: ResponseSnapshots = None):
+        self._library_controller = library_controller
+        self._snapshots = snapshots
+
+    async def SearchBook(self, request, context):
+        try:
+            terms = search_terms(request)
+
+            if is_paged(request):
+                page = await self._library_controller.search_book_rows_page(
+                    **terms,
+                    page_size=request.pageSize,
+                    page_token=request.pageToken
+                )
+                return search_response(page.rows, page.next_page_token)
+
+            return search_response(await self._library_controller.search_book_rows(**terms))
+
+        except Exception as e:
+            set_error(context, e)
+            return library_pb2.SearchBookResponse()
+
+    async def CheckoutBook(self, request, context):
+        try:
+            result = await self._library_controller.checkout_book(
+                user_id=request.userId,
+                copy_uuid=request.copyUuid,
+                loan_time_days=request.loanTime
+            )
+            return checkout_response(result)
+
+        except Exception as e:
+            set_error(context, e)
+            return library_pb2.CheckoutBookResponse()
+
+    async def ReturnBook(self, request, context):
+        try:
+            success = await self._library_controller.return_book(request.copyUuid)
+            return library_pb2.ReturnBookResponse(success=success)
+
+        except Exception as e:
+            set_error(context, e)
+            return library_pb2.ReturnBookResponse(success=False)
+
+    async def BulkCheckout(self, request, context):
+        try:
+            results = await self._library_controller.checkout_books(
+                user_id=request.userId,
+                copy_uuids=list(request.copyUuids),
+                loan_time_days=request.loanTime,
+                all_or_nothing=request.allOrNothing
+            )
+            return bulk_checkout_response(results)
+
+        except Exception as e:
+            set_error(context, e)
+            return library_pb2.BulkCheckoutResponse(success=False)
+
+    async def BulkReturn(self, request, context):
+        try:
+            results = await self._library_controller.return_books(
+                copy_uuids=list(request.copyUuids),
+                all_or_nothing=request.allOrNothing
+            )
+            return bulk_return_response(results)
+
+        except Exception as e:
+            set_error(context, e)
+            return library_pb2.BulkReturnResponse(success=False)
+
+    async def CreateBook(self, request, context):
+        try:
+            uuid = await self._library_controller.add_book(*create_entry(request))
+            return library_pb2.CreateBookResponse(uuid=uuid)
+
+        except Exception as e:
+            set_error(context, e)
+            return library_pb2.CreateBookResponse()
+
+    async def BatchCreateBooks(self, request_iterator, context):
+        try:
+            results = await self._library_controller.add_books(
+                create_entry(request) async for request in request_iterator
+            )
+            return batch_create_response(results)
+
+        except Exception as e:
+            set_error(context, e)
+            return library_pb2.BatchCreateBooksResponse()
+
+    async def GetBook(self, request, context):
+        try:
+            book = await self._library_controller.get_book_details(request.uuid)
+            return library_pb2.GetBookResponse(book=book_to_proto(book))
+
+        except Exception as e:
+            set_error(context, e, grpc.StatusCode.NOT_FOUND)
+            return library_pb2.GetBookResponse()
+
+    async def BatchGetBooks(self, request, context):
+        try:
+            books = await self._library_controller.get_books_details(list(request.uuids))
+            return batch_get_response(request.uuids, books)
+
+        except Exception as e:
+            set_error(context, e)
+            return library_pb2.BatchGetBooksResponse()
+
+    async def UpdateBook(self, request, context):
+        try:
+            success = await self._library_controller.update_book(**update_terms(request))
+            return library_pb2.UpdateBookResponse(success=success)
+
+        except Exception as e:
+            set_error(context, e)
+            return library_pb2.UpdateBookResponse(success=False)
+
+    async def DeleteBook(self, request, context):
+        try:
+            success = await self._library_controller.remove_book(request.uuid)
+            return library_pb2.DeleteBookResponse(success=success)
+
+        except Exception as e:
+            set_error(context, e)
+            return library_pb2.DeleteBookResponse(success=False)
+
+    async def GetAllBooks(self, request, context):
+        try:
+            if self._snapshots is None:
+                return await self._all_books_response(request)
+
+            key = self._snapshots.key('GetAllBooks', request.pageSize, request.pageToken)
+            return await self._snapshots.get_or_build_async(key, lambda: self._all_books_response(request))
+
+        except Exception as e:
+            set_error(context, e)
+            return library_pb2.GetAllBooksResponse()
+
+    async def _all_books_response(self, request) -> library_pb2.GetAllBooksResponse:
+        if is_paged(request):
+            page = await self._library_controller.list_book_rows(
+                page_size=request.pageSize,
+                page_token=request.pageToken
+            )
+            return all_books_response(page.rows, page.next_page_token)
+
+        return all_books_response(await self._library_controller.get_all_book_rows())
+
+    async def GetInventorySummary(self, request, context):
+        try:
+            return inventory_response(await self._library_controller.get_inventory_summary())
+
+        except Exception as e:
+            set_error(context, e, grpc.StatusCode.INTERNAL)
+            return library_pb2.GetInventorySummaryResponse()
+
+    async def StreamAllBooks(self, request, context):
+        try:
+            async for books in self._library_controller.stream_all_books(request.batchSize):
+                yield book_batch(books)
+
+        except Exception as e:
+            set_error(context, e)
+
+    async def StreamSearchBook(self, request, context):
+        try:
+            batches = self._library_controller.stream_search_books(
+                **search_terms(request),
+                batch_size=request.batchSize
+            )
+            async for books in batches:
+                yield book_batch(books)
+
+        except Exception as e:
+            set_error(context, e)
@@ -1,38 +1,177 @@
 import grpc
 from proto import library_pb2, library_pb2_grpc
 from controller.library import ILibraryController
+from .response_snapshots import ResponseSnapshots
+from typing import List, Optional, Tuple
+from models.book import Book, BookRow, CreateBookResult, SearchMode
+
+
+def book_to_proto(book: Book) -> library_pb2.BookCopy:
+    return library_pb2.BookCopy(
+        uuid=book.uuid,
+        author=book.author,
+        title=book.title,
+        genre=book.genre,
+        isAvaliable=book.is_available,
+        condition=book.book_condition
+    )
+
+
+def add_book_rows(book_copies, rows: List[BookRow]):
+    add = book_copies.add
+    for uuid, title, author, genre, is_available, condition in rows:
+        book_copy = add()
+        book_copy.uuid = uuid
+        book_copy.author = author
+        book_copy.title = title
+        book_copy.genre = genre or ''
+        book_copy.isAvaliable = is_available
+        book_copy.condition = condition or ''
+
+
+def batch_create_response(results: List[CreateBookResult]) -> library_pb2.BatchCreateBooksResponse:
+    response = library_pb2.BatchCreateBooksResponse()
+    for index, result in enumerate(results):
+        response.results.add(index=index, uuid=result.uuid or '', error=result.error or '')
+        if result.error is None:
+            response.createdCount += 1
+        else:
+            response.failedCount += 1
+    return response
+
+
+SEARCH_MODES = {
+    library_pb2.SEARCH_MODE_SUBSTRING: SearchMode.SUBSTRING,
+    library_pb2.SEARCH_MODE_FULLTEXT: SearchMode.FULLTEXT
+}
+
+
+def search_mode(mode: int) -> SearchMode:
+    if mode not in SEARCH_MODES:
+        raise ValueError(f"unknown search mode {mode}")
+    return SEARCH_MODES[mode]
+
+
+def set_error(context, error: Exception, invalid_code: grpc.StatusCode = grpc.StatusCode.INVALID_ARGUMENT):
+    context.set_code(invalid_code if isinstance(error, ValueError) else grpc.StatusCode.INTERNAL)
+    context.set_details(str(error))
+
+
+def search_terms(request) -> dict:
+    return {
+        'title': request.bookName if request.bookName else None,
+        'author': request.bookAuthor if request.bookAuthor else None,
+        'genre': request.bookGenre if request.bookGenre else None,
+        'match_all': request.matchAll,
+        'mode': search_mode(request.mode)
+    }
+
+
+def is_paged(request) -> bool:
+    return bool(request.pageSize or request.pageToken)
+
+
+def search_response(rows: List[BookRow], next_page_token: str = '') -> library_pb2.SearchBookResponse:
+    response = library_pb2.SearchBookResponse(nextPageToken=next_page_token)
+    add_book_rows(response.avaliableCopies, rows)
+    return response
+
+
+def all_books_response(rows: List[BookRow], next_page_token: str = '') -> library_pb2.GetAllBooksResponse:
+    response = library_pb2.GetAllBooksResponse(nextPageToken=next_page_token)
+    add_book_rows(response.books, rows)
+    return response
+
+
+def checkout_response(result: dict) -> library_pb2.CheckoutBookResponse:
+    return library_pb2.CheckoutBookResponse(
+        loanId=result['loan_id'],
+        dueDate=result['due_date'],
+        bookTitle=result['book_title'],
+        bookAuthor=result['book_author']
+    )
+
+
+def bulk_checkout_response(results: List[dict]) -> library_pb2.BulkCheckoutResponse:
+    response = library_pb2.BulkCheckoutResponse(success=all(result['success'] for result in results))
+    for result in results:
+        response.results.add(
+            copyUuid=result['copy_uuid'],
+            success=result['success'],
+            error=result.get('error', ''),
+            loanId=result.get('loan_id', ''),
+            dueDate=result.get('due_date', ''),
+            bookTitle=result.get('book_title', ''),
+            bookAuthor=result.get('book_author', '')
+        )
+    return response
+
+
+def bulk_return_response(results: List[dict]) -> library_pb2.BulkReturnResponse:
+    response = library_pb2.BulkReturnResponse(success=all(result['success'] for result in results))
+    for result in results:
+        response.results.add(copyUuid=result['copy_uuid'], success=result['success'], error=result['error'])
+    return response
+
+
+def create_entry(request) -> Tuple[str, str, str, str]:
+    return request.title, request.author, request.genre, request.condition
+
+
+def batch_get_response(uuids: List[str], books: List[Optional[Book]]) -> library_pb2.BatchGetBooksResponse:
+    response = library_pb2.BatchGetBooksResponse()
+    for uuid, book in zip(uuids, books):
+        if book is None:
+            response.results.add(uuid=uuid, found=False)
+        else:
+            response.results.add(uuid=uuid, found=True, book=book_to_proto(book))
+    return response
+
+
+def update_terms(request) -> dict:
+    return {
+        'uuid': request.uuid,
+        'title': request.title if request.title else None,
+        'author': request.author if request.author else None,
+        'genre': request.genre if request.genre else None,
+        'condition': request.condition if request.condition else None
+    }
+
+
+def inventory_response(summary: dict) -> library_pb2.GetInventorySummaryResponse:
+    return library_pb2.GetInventorySummaryResponse(
+        totalBooks=summary['total_books'],
+        availableBooks=summary['available_books'],
+        checkedOutBooks=summary['checked_out_books']
+    )
+
+
+def book_batch(books: List[Book]) -> library_pb2.BookCopyBatch:
+    return library_pb2.BookCopyBatch(books=[book_to_proto(book) for book in books])
 
 
 class LibraryHandler(library_pb2_grpc.LibraryServicer):
 
-    def __init__(self, library_controller: ILibraryController):
+    def __init__(self, library_controller: ILibraryController, snapshots: ResponseSnapshots = None):
         self._library_controller = library_controller
+        self._snapshots = snapshots
 
     def SearchBook(self, request, context):
         try:
-            books = self._library_controller.search_books(
-                title=request.bookName if request.bookName else None,
-                author=request.bookAuthor if request.bookAuthor else None,
-                genre=request.bookGenre if request.bookGenre else None
-            )
+            terms = search_terms(request)
 
-            book_copies = []
-            for book in books:
-                book_copy = library_pb2.BookCopy(
-                    uuid=book.uuid,
-                    author=book.author,
-                    title=book.title,
-                    genre=book.genre,
-                    isAvaliable=book.is_available,
-                    condition=book.book_condition
+            if is_paged(request):
+                page = self._library_controller.search_book_rows_page(
+                    **terms,
+                    page_size=request.pageSize,
+                    page_token=request.pageToken
                 )
-                book_copies.append(book_copy)
+                return search_response(page.rows, page.next_page_token)
 
-            return library_pb2.SearchBookResponse(avaliableCopies=book_copies)
+            return search_response(self._library_controller.search_book_rows(**terms))
 
         except Exception as e:
-            context.set_code(grpc.StatusCode.INTERNAL)
-            context.set_details(str(e))
+            set_error(context, e)
             return library_pb2.SearchBookResponse()
 
     def CheckoutBook(self, request, context):
@@ -42,21 +181,10 @@ class LibraryHandler(library_pb2_grpc.LibraryServicer):
                 copy_uuid=request.copyUuid,
                 loan_time_days=request.loanTime
             )
+            return checkout_response(result)
 
-            return library_pb2.CheckoutBookResponse(
-                loanId=result['loan_id'],
-                dueDate=result['due_date'],
-                bookTitle=result['book_title'],
-                bookAuthor=result['book_author']
-            )
-
-        except ValueError as e:
-            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
-            context.set_details(str(e))
-            return library_pb2.CheckoutBookResponse()
         except Exception as e:
-            context.set_code(grpc.StatusCode.INTERNAL)
-            context.set_details(str(e))
+            set_error(context, e)
             return library_pb2.CheckoutBookResponse()
 
     def ReturnBook(self, request, context):
@@ -64,75 +192,79 @@ class LibraryHandler(library_pb2_grpc.LibraryServicer):
             success = self._library_controller.return_book(request.copyUuid)
             return library_pb2.ReturnBookResponse(success=success)
 
-        except ValueError as e:
-            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
-            context.set_details(str(e))
-            return library_pb2.ReturnBookResponse(success=False)
         except Exception as e:
-            context.set_code(grpc.StatusCode.INTERNAL)
-            context.set_details(str(e))
+            set_error(context, e)
             return library_pb2.ReturnBookResponse(success=False)
 
-    def CreateBook(self, request, context):
+    def BulkCheckout(self, request, context):
+        try:
+            results = self._library_controller.checkout_books(
+                user_id=request.userId,
+                copy_uuids=list(request.copyUuids),
+                loan_time_days=request.loanTime,
+                all_or_nothing=request.allOrNothing
+            )
+            return bulk_checkout_response(results)
+
+        except Exception as e:
+            set_error(context, e)
+            return library_pb2.BulkCheckoutResponse(success=False)
+
+    def BulkReturn(self, request, context):
         try:
-            uuid = self._library_controller.add_book(
-                title=request.title,
-                author=request.author,
-                genre=request.genre,
-                condition=request.condition
+            results = self._library_controller.return_books(
+                copy_uuids=list(request.copyUuids),
+                all_or_nothing=request.allOrNothing
             )
+            return bulk_return_response(results)
+
+        except Exception as e:
+            set_error(context, e)
+            return library_pb2.BulkReturnResponse(success=False)
+
+    def CreateBook(self, request, context):
+        try:
+            uuid = self._library_controller.add_book(*create_entry(request))
             return library_pb2.CreateBookResponse(uuid=uuid)
 
-        except ValueError as e:
-            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
-            context.set_details(str(e))
-            return library_pb2.CreateBookResponse()
         except Exception as e:
-            context.set_code(grpc.StatusCode.INTERNAL)
-            context.set_details(str(e))
+            set_error(context, e)
             return library_pb2.CreateBookResponse()
 
+    def BatchCreateBooks(self, request_iterator, context):
+        try:
+            results = self._library_controller.add_books(create_entry(request) for request in request_iterator)
+            return batch_create_response(results)
+
+        except Exception as e:
+            set_error(context, e)
+            return library_pb2.BatchCreateBooksResponse()
+
     def GetBook(self, request, context):
         try:
             book = self._library_controller.get_book_details(request.uuid)
+            return library_pb2.GetBookResponse(book=book_to_proto(book))
 
-            book_copy = library_pb2.BookCopy(
-                uuid=book.uuid,
-                author=book.author,
-                title=book.title,
-                genre=book.genre,
-                isAvaliable=book.is_available,
-                condition=book.book_condition
-            )
-            return library_pb2.GetBookResponse(book=book_copy)
-
-        except ValueError as e:
-            context.set_code(grpc.StatusCode.NOT_FOUND)
-            context.set_details(str(e))
-            return library_pb2.GetBookResponse()
         except Exception as e:
-            context.set_code(grpc.StatusCode.INTERNAL)
-            context.set_details(str(e))
+            set_error(context, e, grpc.StatusCode.NOT_FOUND)
             return library_pb2.GetBookResponse()
 
+    def BatchGetBooks(self, request, context):
+        try:
+            books = self._library_controller.get_books_details(list(request.uuids))
+            return batch_get_response(request.uuids, books)
+
+        except Exception as e:
+            set_error(context, e)
+            return library_pb2.BatchGetBooksResponse()
+
     def UpdateBook(self, request, context):
         try:
-            success = self._library_controller.update_book(
-                uuid=request.uuid,
-                title=request.title if request.title else None,
-                author=request.author if request.author else None,
-                genre=request.genre if request.genre else None,
-                condition=request.condition if request.condition else None
-            )
+            success = self._library_controller.update_book(**update_terms(request))
             return library_pb2.UpdateBookResponse(success=success)
 
-        except ValueError as e:
-            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
-            context.set_details(str(e))
-            return library_pb2.UpdateBookResponse(success=False)
         except Exception as e:
-            context.set_code(grpc.StatusCode.INTERNAL)
-            context.set_details(str(e))
+            set_error(context, e)
             return library_pb2.UpdateBookResponse(success=False)
 
     def DeleteBook(self, request, context):
@@ -140,49 +272,56 @@ class LibraryHandler(library_pb2_grpc.LibraryServicer):
             success = self._library_controller.remove_book(request.uuid)
             return library_pb2.DeleteBookResponse(success=success)
 
-        except ValueError as e:
-            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
-            context.set_details(str(e))
-            return library_pb2.DeleteBookResponse(success=False)
         except Exception as e:
-            context.set_code(grpc.StatusCode.INTERNAL)
-            context.set_details(str(e))
+            set_error(context, e)
             return library_pb2.DeleteBookResponse(success=False)
 
     def GetAllBooks(self, request, context):
         try:
-            books = self._library_controller.get_all_books()
-
-            book_copies = []
-            for book in books:
-                book_copy = library_pb2.BookCopy(
-                    uuid=book.uuid,
-                    author=book.author,
-                    title=book.title,
-                    genre=book.genre,
-                    isAvaliable=book.is_available,
-                    condition=book.book_condition
-                )
-                book_copies.append(book_copy)
+            if self._snapshots is None:
+                return self._all_books_response(request)
 
-            return library_pb2.GetAllBooksResponse(books=book_copies)
+            key = self._snapshots.key('GetAllBooks', request.pageSize, request.pageToken)
+            return self._snapshots.get_or_build(key, lambda: self._all_books_response(request))
 
         except Exception as e:
-            context.set_code(grpc.StatusCode.INTERNAL)
-            context.set_details(str(e))
+            set_error(context, e)
             return library_pb2.GetAllBooksResponse()
 
+    def _all_books_response(self, request) -> library_pb2.GetAllBooksResponse:
+        if is_paged(request):
+            page = self._library_controller.list_book_rows(
+                page_size=request.pageSize,
+                page_token=request.pageToken
+            )
+            return all_books_response(page.rows, page.next_page_token)
+
+        return all_books_response(self._library_controller.get_all_book_rows())
+
     def GetInventorySummary(self, request, context):
         try:
-            summary = self._library_controller.get_inventory_summary()
+            return inventory_response(self._library_controller.get_inventory_summary())
+
+        except Exception as e:
+            set_error(context, e, grpc.StatusCode.INTERNAL)
+            return library_pb2.GetInventorySummaryResponse()
+
+    def StreamAllBooks(self, request, context):
+        try:
+            for books in self._library_controller.stream_all_books(request.batchSize):
+                yield book_batch(books)
+
+        except Exception as e:
+            set_error(context, e)
 
-            return library_pb2.GetInventorySummaryResponse(
-                totalBooks=summary['total_books'],
-                availableBooks=summary['available_books'],
-                checkedOutBooks=summary['checked_out_books']
+    def StreamSearchBook(self, request, context):
+        try:
+            batches = self._library_controller.stream_search_books(
+                **search_terms(request),
+                batch_size=request.batchSize
             )
+            for books in batches:
+                yield book_batch(books)
 
         except Exception as e:
-            context.set_code(grpc.StatusCode.INTERNAL)
-            context.set_details(str(e))
-            return library_pb2.GetInventorySummaryResponse()
+            set_error(context, e)
@@ -0,0 +1,144 @@
+import inspect
+import time
+import grpc
+from metrics import MethodMetrics, RpcMetrics
+
+
+def method_name(handler_call_details) -> str:
+    return handler_call_details.method.lstrip('/')
+
+
+def status_name(context, default: grpc.StatusCode) -> str:
+    code = context.code()
+    return (code if isinstance(code, grpc.StatusCode) else default).name
+
+
+def wrap_handler(handler: grpc.RpcMethodHandler, wrap_unary, wrap_stream) -> grpc.RpcMethodHandler:
+    if handler.unary_unary:
+        return grpc.unary_unary_rpc_method_handler(
+            wrap_unary(handler.unary_unary),
+            request_deserializer=handler.request_deserializer,
+            response_serializer=handler.response_serializer
+        )
+    if handler.unary_stream:
+        return grpc.unary_stream_rpc_method_handler(
+            wrap_stream(handler.unary_stream),
+            request_deserializer=handler.request_deserializer,
+            response_serializer=handler.response_serializer
+        )
+    if handler.stream_unary:
+        return grpc.stream_unary_rpc_method_handler(
+            wrap_unary(handler.stream_unary),
+            request_deserializer=handler.request_deserializer,
+            response_serializer=handler.response_serializer
+        )
+    return grpc.stream_stream_rpc_method_handler(
+        wrap_stream(handler.stream_stream),
+        request_deserializer=handler.request_deserializer,
+        response_serializer=handler.response_serializer
+    )
+
+
+class MetricsInterceptor(grpc.ServerInterceptor):
+
+    def __init__(self, metrics: RpcMetrics):
+        self._metrics = metrics
+        self._handlers = {}
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        if handler is None:
+            return None
+
+        cached = self._handlers.get(handler_call_details.method)
+        if cached is None or cached[0] is not handler:
+            cached = (handler, self._observe(handler, self._metrics.method(method_name(handler_call_details))))
+            self._handlers[handler_call_details.method] = cached
+        return cached[1]
+
+    @staticmethod
+    def _observe(handler: grpc.RpcMethodHandler, method: MethodMetrics) -> grpc.RpcMethodHandler:
+        def wrap_unary(behavior):
+            def observed(request, context):
+                method.start()
+                started = time.perf_counter()
+                status = grpc.StatusCode.UNKNOWN
+                try:
+                    response = behavior(request, context)
+                    status = grpc.StatusCode.OK
+                    return response
+                finally:
+                    method.finish(status_name(context, status), time.perf_counter() - started)
+            return observed
+
+        def wrap_stream(behavior):
+            def observed(request, context):
+                method.start()
+                started = time.perf_counter()
+                status = grpc.StatusCode.UNKNOWN
+                try:
+                    yield from behavior(request, context)
+                    status = grpc.StatusCode.OK
+                except GeneratorExit:
+                    status = grpc.StatusCode.CANCELLED
+                    raise
+                finally:
+                    method.finish(status_name(context, status), time.perf_counter() - started)
+            return observed
+
+        return wrap_handler(handler, wrap_unary, wrap_stream)
+
+
+class AsyncMetricsInterceptor(grpc.aio.ServerInterceptor):
+
+    def __init__(self, metrics: RpcMetrics):
+        self._metrics = metrics
+        self._handlers = {}
+
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        if handler is None:
+            return None
+
+        cached = self._handlers.get(handler_call_details.method)
+        if cached is None or cached[0] is not handler:
+            cached = (handler, self._observe(handler, self._metrics.method(method_name(handler_call_details))))
+            self._handlers[handler_call_details.method] = cached
+        return cached[1]
+
+    @staticmethod
+    def _observe(handler: grpc.RpcMethodHandler, method: MethodMetrics) -> grpc.RpcMethodHandler:
+        def wrap_unary(behavior):
+            async def observed(request, context):
+                method.start()
+                started = time.perf_counter()
+                status = grpc.StatusCode.UNKNOWN
+                try:
+                    response = await behavior(request, context)
+                    status = grpc.StatusCode.OK
+                    return response
+                finally:
+                    method.finish(status_name(context, status), time.perf_counter() - started)
+            return observed
+
+        def wrap_stream(behavior):
+            async def observed(request, context):
+                method.start()
+                started = time.perf_counter()
+                status = grpc.StatusCode.UNKNOWN
+                try:
+                    responses = behavior(request, context)
+                    if inspect.isawaitable(responses):
+                        await responses
+                    else:
+                        async for response in responses:
+                            yield response
+                    status = grpc.StatusCode.OK
+                except GeneratorExit:
+                    status = grpc.StatusCode.CANCELLED
+                    raise
+                finally:
+                    method.finish(status_name(context, status), time.perf_counter() - started)
+            return observed
+
+        return wrap_handler(handler, wrap_unary, wrap_stream)
@@ -0,0 +1,134 @@
+import asyncio
+import threading
+import grpc
+from concurrent import futures
+from typing import Awaitable, Callable, Hashable, Optional, Union
+from google.protobuf.message import Message
+from proto import library_pb2, library_pb2_grpc
+from repository.cache import LRUCache
+from repository.catalog_version import CatalogVersion
+
+
+SERVICE_NAME = 'bookservice.Library'
+
+
+def serialize_response(response: Union[bytes, Message]) -> bytes:
+    if isinstance(response, bytes):
+        return response
+    return response.SerializeToString()
+
+
+class ResponseSnapshots:
+
+    def __init__(self, cache: LRUCache, catalog_version: CatalogVersion):
+        self._cache = cache
+        self._catalog_version = catalog_version
+        self._lock = threading.Lock()
+        self._builds = {}
+        self._async_builds = {}
+        self._coalesced = 0
+
+    def key(self, *parts: Hashable) -> tuple:
+        return (self._catalog_version.value,) + parts
+
+    def get(self, key: tuple) -> Optional[bytes]:
+        return self._cache.get(key)
+
+    def put(self, key: tuple, response: Message) -> bytes:
+        data = response.SerializeToString()
+        self._cache.put(key, data)
+        return data
+
+    def get_or_build(self, key: tuple, build: Callable[[], Message]) -> bytes:
+        data = self._cache.get(key)
+        if data is not None:
+            return data
+
+        with self._lock:
+            pending = self._builds.get(key)
+            leader = pending is None
+            if leader:
+                pending = self._builds[key] = futures.Future()
+            else:
+                self._coalesced += 1
+        if not leader:
+            return pending.result()
+
+        try:
+            data = self.put(key, build())
+        except BaseException as e:
+            pending.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._builds[key]
+        pending.set_result(data)
+        return data
+
+    async def get_or_build_async(self, key: tuple, build: Callable[[], Awaitable[Message]]) -> bytes:
+        while True:
+            data = self._cache.get(key)
+            if data is not None:
+                return data
+
+            pending = self._async_builds.get(key)
+            if pending is None:
+                break
+            self._coalesced += 1
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+
+        pending = self._async_builds[key] = asyncio.get_running_loop().create_future()
+        try:
+            data = self.put(key, await build())
+            pending.set_result(data)
+            return data
+        except asyncio.CancelledError:
+            pending.cancel()
+            raise
+        except BaseException as e:
+            pending.set_exception(e)
+            pending.exception()
+            raise
+        finally:
+            del self._async_builds[key]
+
+    def stats(self) -> dict:
+        stats = self._cache.stats()
+        stats['coalesced_builds'] = self._coalesced
+        return stats
+
+
+METHOD_HANDLERS = {
+    (False, False): grpc.unary_unary_rpc_method_handler,
+    (False, True): grpc.unary_stream_rpc_method_handler,
+    (True, False): grpc.stream_unary_rpc_method_handler,
+    (True, True): grpc.stream_stream_rpc_method_handler
+}
+
+
+def library_method_handlers(servicer: library_pb2_grpc.LibraryServicer) -> dict:
+    handlers = {}
+    for method in library_pb2.DESCRIPTOR.services_by_name['Library'].methods:
+        method_handler = METHOD_HANDLERS[method.client_streaming, method.server_streaming]
+        handlers[method.name] = method_handler(
+            getattr(servicer, method.name),
+            request_deserializer=getattr(library_pb2, method.input_type.name).FromString,
+            response_serializer=getattr(library_pb2, method.output_type.name).SerializeToString
+        )
+
+    handlers['GetAllBooks'] = grpc.unary_unary_rpc_method_handler(
+        servicer.GetAllBooks,
+        request_deserializer=library_pb2.GetAllBooksRequest.FromString,
+        response_serializer=serialize_response
+    )
+    return handlers
+
+
+def add_library_servicer_to_server(servicer: library_pb2_grpc.LibraryServicer, server):
+    handlers = library_method_handlers(servicer)
+    server.add_generic_rpc_handlers((grpc.method_handlers_generic_handler(SERVICE_NAME, handlers),))
+    server.add_registered_method_handlers(SERVICE_NAME, handlers)
@@ -0,0 +1,179 @@
+import inspect
+from typing import Optional, Tuple
+import grpc
+from tracing import ActiveSpan, Tracer, current_span
+from .metrics_interceptor import method_name, status_name, wrap_handler
+
+
+TRACE_ID_HEADER = 'x-trace-id'
+TRACEPARENT_HEADER = 'traceparent'
+UNTRACED_PREFIXES = ('/bookservice.Admin/',)
+
+_DONE = object()
+
+
+def incoming_trace(metadata) -> Tuple[Optional[str], Optional[bool], Optional[str]]:
+    traceparent = None
+    for key, value in metadata or ():
+        if key == TRACE_ID_HEADER and value:
+            return value, None, None
+        if key == TRACEPARENT_HEADER:
+            traceparent = value
+
+    if traceparent:
+        parts = traceparent.split('-')
+        if len(parts) == 4 and len(parts[1]) == 32 and len(parts[2]) == 16:
+            try:
+                return parts[1], bool(int(parts[3], 16) & 1), parts[2]
+            except ValueError:
+                pass
+    return None, None, None
+
+
+def start_trace(tracer: Tracer, handler_call_details) -> Optional[ActiveSpan]:
+    if handler_call_details.method.startswith(UNTRACED_PREFIXES):
+        return None
+
+    trace_id, sampled, remote_parent = incoming_trace(handler_call_details.invocation_metadata)
+    root = tracer.start(method_name(handler_call_details), trace_id, sampled)
+    if root is not None and remote_parent:
+        root.attributes['remote_parent'] = remote_parent
+    return root
+
+
+def begin(root: ActiveSpan, context):
+    queued = root.child('grpc.queue', 'queue')
+    queued.started = root.started
+    queued.finish()
+    context.set_trailing_metadata(((TRACE_ID_HEADER, root.trace_id),))
+
+
+def finish(root: ActiveSpan, context, default: grpc.StatusCode):
+    root.attributes['status'] = status_name(context, default)
+    root.finish()
+
+
+def run_in_span(span: ActiveSpan, function, *args):
+    token = current_span.set(span)
+    try:
+        return function(*args)
+    finally:
+        current_span.reset(token)
+
+
+class TracingInterceptor(grpc.ServerInterceptor):
+
+    def __init__(self, tracer: Tracer):
+        self._tracer = tracer
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        if handler is None:
+            return None
+
+        root = start_trace(self._tracer, handler_call_details)
+        if root is None:
+            return handler
+        return self._trace(handler, root)
+
+    @staticmethod
+    def _trace(handler: grpc.RpcMethodHandler, root: ActiveSpan) -> grpc.RpcMethodHandler:
+        def wrap_unary(behavior):
+            def traced(request, context):
+                begin(root, context)
+                status = grpc.StatusCode.UNKNOWN
+                try:
+                    response = run_in_span(root, behavior, request, context)
+                    status = grpc.StatusCode.OK
+                    return response
+                except BaseException as e:
+                    root.error = type(e).__name__
+                    raise
+                finally:
+                    finish(root, context, status)
+            return traced
+
+        def wrap_stream(behavior):
+            def traced(request, context):
+                begin(root, context)
+                status = grpc.StatusCode.UNKNOWN
+                try:
+                    responses = run_in_span(root, behavior, request, context)
+                    while True:
+                        response = run_in_span(root, next, responses, _DONE)
+                        if response is _DONE:
+                            break
+                        yield response
+                    status = grpc.StatusCode.OK
+                except GeneratorExit:
+                    status = grpc.StatusCode.CANCELLED
+                    raise
+                except BaseException as e:
+                    root.error = type(e).__name__
+                    raise
+                finally:
+                    finish(root, context, status)
+            return traced
+
+        return wrap_handler(handler, wrap_unary, wrap_stream)
+
+
+class AsyncTracingInterceptor(grpc.aio.ServerInterceptor):
+
+    def __init__(self, tracer: Tracer):
+        self._tracer = tracer
+
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        if handler is None:
+            return None
+
+        root = start_trace(self._tracer, handler_call_details)
+        if root is None:
+            return handler
+        return self._trace(handler, root)
+
+    @staticmethod
+    def _trace(handler: grpc.RpcMethodHandler, root: ActiveSpan) -> grpc.RpcMethodHandler:
+        def wrap_unary(behavior):
+            async def traced(request, context):
+                begin(root, context)
+                status = grpc.StatusCode.UNKNOWN
+                token = current_span.set(root)
+                try:
+                    response = await behavior(request, context)
+                    status = grpc.StatusCode.OK
+                    return response
+                except BaseException as e:
+                    root.error = type(e).__name__
+                    raise
+                finally:
+                    current_span.reset(token)
+                    finish(root, context, status)
+            return traced
+
+        def wrap_stream(behavior):
+            async def traced(request, context):
+                begin(root, context)
+                status = grpc.StatusCode.UNKNOWN
+                token = current_span.set(root)
+                try:
+                    responses = behavior(request, context)
+                    if inspect.isawaitable(responses):
+                        await responses
+                    else:
+                        async for response in responses:
+                            yield response
+                    status = grpc.StatusCode.OK
+                except GeneratorExit:
+                    status = grpc.StatusCode.CANCELLED
+                    raise
+                except BaseException as e:
+                    root.error = type(e).__name__
+                    raise
+                finally:
+                    current_span.reset(token)
+                    finish(root, context, status)
+            return traced
+
+        return wrap_handler(handler, wrap_unary, wrap_stream)
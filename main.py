@@ -1,25 +1,317 @@
+import asyncio
+import os
+import sys
 import grpc
 from concurrent import futures
-from proto import library_pb2_grpc
-from handler import LibraryHandler
-from controller import LibraryController
-from repository import BookRepository, connect_db
+from contextlib import contextmanager
+from typing import Iterator, Optional, Sequence, Tuple
+from config import ServerConfig, load_server_config
+from handler import (
+    LibraryHandler,
+    AsyncLibraryHandler,
+    AdminHandler,
+    AsyncAdminHandler,
+    MetricsInterceptor,
+    AsyncMetricsInterceptor,
+    TracingInterceptor,
+    AsyncTracingInterceptor,
+    ResponseSnapshots,
+    add_library_servicer_to_server
+)
+from metrics import ServerStats, create_server_stats
+from prefork import PreforkSupervisor, handle_shutdown
+from profiling import SamplingProfiler, SlowQueryLog, create_profiler, create_slow_query_log
+from tracing import Traced, Tracer, create_tracer
+from proto import admin_pb2_grpc
+from controller import LibraryController, AsyncLibraryController
+from repository import (
+    IBookRepository,
+    BookRepository,
+    CachingBookRepository,
+    CatalogVersion,
+    ConnectionPool,
+    ExecutorBookRepository,
+    LRUCache,
+    QUERY_TEMPLATES,
+    SearchCachingBookRepository,
+    SharedCatalogVersion,
+    SqliteBookRepository,
+    GroupCommitWriter,
+    InMemoryBookRepository,
+    create_group_commit_writer,
+    create_pool,
+    create_statement_cache,
+    estimate_book_rows_size
+)
 
 
-def serve():
-    db = connect_db()
-    book_repository = BookRepository(db)
-    library_controller = LibraryController(book_repository)
-    library_handler = LibraryHandler(library_controller)
+def build_book_repository(pool: ConnectionPool, writer: GroupCommitWriter = None,
+                          stats: ServerStats = None, tracer: Tracer = None,
+                          slow_queries: SlowQueryLog = None, catalog_version: CatalogVersion = None) -> IBookRepository:
+    statements = create_statement_cache()
+    book_repository = BookRepository(
+        pool,
+        catalog_version=catalog_version,
+        writer=writer,
+        statements=statements,
+        queries=stats.queries if stats else None,
+        trace_queries=tracer is not None,
+        slow_queries=slow_queries
+    )
+    book_repository.prepare_inventory()
 
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
-    library_pb2_grpc.add_LibraryServicer_to_server(library_handler, server)
+    if stats:
+        stats.register('connection_pool', pool.stats)
+        if writer:
+            stats.register('group_commit', writer.stats)
+        if statements:
+            stats.register('prepared_statements', statements.stats)
+        if slow_queries:
+            stats.register('slow_queries', slow_queries.stats)
+    return decorate_book_repository(book_repository, stats, versioned=catalog_version is not None)
 
-    server.add_insecure_port('[::]:50051')
-    print("Library gRPC server starting on port 50051...")
-    server.start()
-    server.wait_for_termination()
+
+def build_memory_book_repository() -> IBookRepository:
+    book_repository = InMemoryBookRepository()
+    seed = os.getenv('BOOK_STORE_SEED', 'migrations/create_table.sql')
+    if seed:
+        book_repository.load_sql_dump(seed)
+    return book_repository
+
+
+def build_sqlite_book_repository(catalog_version: CatalogVersion = None) -> SqliteBookRepository:
+    book_repository = SqliteBookRepository(
+        os.getenv('SQLITE_PATH', 'library.db'),
+        catalog_version=catalog_version,
+        busy_timeout=float(os.getenv('SQLITE_BUSY_TIMEOUT', '5'))
+    )
+    seed = os.getenv('BOOK_STORE_SEED', 'migrations/create_table.sql')
+    if seed and book_repository.get_inventory_summary()['total_books'] == 0:
+        book_repository.load_sql_dump(seed)
+    return book_repository
+
+
+@contextmanager
+def open_book_repository(stats: ServerStats = None, tracer: Tracer = None, slow_queries: SlowQueryLog = None,
+                         config: ServerConfig = None,
+                         catalog_version: CatalogVersion = None) -> Iterator[IBookRepository]:
+    store = os.getenv('BOOK_STORE', 'mysql')
+    if store == 'memory':
+        yield build_memory_book_repository()
+        return
+
+    if store == 'sqlite':
+        book_repository = build_sqlite_book_repository(catalog_version)
+        try:
+            yield decorate_book_repository(book_repository, stats, versioned=catalog_version is not None)
+        finally:
+            book_repository.close()
+        return
+
+    pool = create_pool(min_size=config.db_pool_min_size, max_size=config.db_pool_max_size) if config else create_pool()
+    writer = create_group_commit_writer(pool)
+    try:
+        yield build_book_repository(pool, writer, stats, tracer, slow_queries, catalog_version)
+    finally:
+        if writer:
+            writer.close()
+        pool.close()
+
+
+def decorate_book_repository(book_repository: IBookRepository, stats: ServerStats = None,
+                             versioned: bool = False) -> IBookRepository:
+    cache_size = int(os.getenv('BOOK_CACHE_SIZE', '10000'))
+    if cache_size > 0:
+        cache = LRUCache(cache_size, ttl=float(os.getenv('BOOK_CACHE_TTL', '30')))
+        book_repository = CachingBookRepository(book_repository, cache, versioned=versioned)
+        if stats:
+            stats.register('book_cache', cache.stats)
+
+    search_cache_size = int(os.getenv('SEARCH_CACHE_SIZE', '1000'))
+    if search_cache_size > 0:
+        search_cache = LRUCache(
+            search_cache_size,
+            ttl=float(os.getenv('SEARCH_CACHE_TTL', '30')),
+            max_bytes=int(float(os.getenv('SEARCH_CACHE_MAX_MB', '64')) * 1024 * 1024),
+            sizeof=estimate_book_rows_size
+        )
+        book_repository = SearchCachingBookRepository(book_repository, search_cache)
+        if stats:
+            stats.register('search_cache', search_cache.stats)
+
+    return book_repository
+
+
+def build_response_snapshots(book_repository: IBookRepository, stats: ServerStats = None) -> Optional[ResponseSnapshots]:
+    cache_size = int(os.getenv('RESPONSE_CACHE_SIZE', '64'))
+    if cache_size <= 0:
+        return None
+
+    cache = LRUCache(
+        cache_size,
+        ttl=float(os.getenv('RESPONSE_CACHE_TTL', '30')),
+        max_bytes=int(float(os.getenv('RESPONSE_CACHE_MAX_MB', '256')) * 1024 * 1024),
+        sizeof=len
+    )
+    snapshots = ResponseSnapshots(cache, book_repository.catalog_version)
+    if stats:
+        stats.register('response_cache', snapshots.stats)
+    return snapshots
+
+
+def build_server(book_repository: IBookRepository, max_workers: int = 10, stats: ServerStats = None,
+                 tracer: Tracer = None, profiler: SamplingProfiler = None, slow_queries: SlowQueryLog = None,
+                 options: Sequence[Tuple[str, int]] = (), maximum_concurrent_rpcs: int = None) -> grpc.Server:
+    library_controller = LibraryController(
+        Traced(book_repository, 'repository') if tracer else book_repository,
+        create_batch_size=int(os.getenv('CREATE_BATCH_SIZE', '500'))
+    )
+    library_handler = LibraryHandler(
+        Traced(library_controller, 'controller') if tracer else library_controller,
+        build_response_snapshots(book_repository, stats)
+    )
+
+    interceptors = []
+    if tracer:
+        interceptors.append(TracingInterceptor(tracer))
+    if stats:
+        interceptors.append(MetricsInterceptor(stats.rpcs))
+    server = grpc.server(
+        futures.ThreadPoolExecutor(max_workers=max_workers),
+        interceptors=interceptors,
+        options=options,
+        maximum_concurrent_rpcs=maximum_concurrent_rpcs
+    )
+    add_library_servicer_to_server(library_handler, server)
+    if stats or tracer or profiler or slow_queries:
+        admin_pb2_grpc.add_AdminServicer_to_server(AdminHandler(stats, tracer, profiler, slow_queries), server)
+    return server
+
+
+def build_async_server(book_repository: IBookRepository, executor: futures.Executor,
+                       stats: ServerStats = None, tracer: Tracer = None, profiler: SamplingProfiler = None,
+                       slow_queries: SlowQueryLog = None, options: Sequence[Tuple[str, int]] = (),
+                       maximum_concurrent_rpcs: int = None) -> grpc.aio.Server:
+    async_book_repository = ExecutorBookRepository(
+        Traced(book_repository, 'repository') if tracer else book_repository, executor)
+    library_controller = AsyncLibraryController(
+        async_book_repository,
+        create_batch_size=int(os.getenv('CREATE_BATCH_SIZE', '500'))
+    )
+    library_handler = AsyncLibraryHandler(
+        Traced(library_controller, 'controller') if tracer else library_controller,
+        build_response_snapshots(book_repository, stats)
+    )
+
+    interceptors = []
+    if tracer:
+        interceptors.append(AsyncTracingInterceptor(tracer))
+    if stats:
+        interceptors.append(AsyncMetricsInterceptor(stats.rpcs))
+    server = grpc.aio.server(
+        interceptors=interceptors,
+        options=options,
+        maximum_concurrent_rpcs=maximum_concurrent_rpcs
+    )
+    add_library_servicer_to_server(library_handler, server)
+    if stats or tracer or profiler or slow_queries:
+        admin_pb2_grpc.add_AdminServicer_to_server(
+            AsyncAdminHandler(stats, tracer, profiler, slow_queries), server)
+    return server
+
+
+def register_worker_stats(stats: ServerStats, config: ServerConfig, worker: int = None):
+    if stats and worker is not None:
+        stats.register('process', lambda: {'worker': worker, 'pid': os.getpid(), 'processes': config.processes})
+
+
+def serve(config: ServerConfig = None, worker: int = None, catalog_version: CatalogVersion = None):
+    config = config or load_server_config()
+    stats = create_server_stats(QUERY_TEMPLATES)
+    tracer = create_tracer()
+    slow_queries = create_slow_query_log()
+    register_worker_stats(stats, config, worker)
+    with open_book_repository(stats, tracer, slow_queries, config, catalog_version) as book_repository:
+        server = build_server(
+            book_repository,
+            max_workers=config.workers,
+            stats=stats,
+            tracer=tracer,
+            profiler=create_profiler(),
+            slow_queries=slow_queries,
+            options=config.grpc_options(),
+            maximum_concurrent_rpcs=config.max_concurrent_rpcs
+        )
+
+        server.add_insecure_port(config.address)
+        print(f"Library gRPC server starting on {config.address} (pid {os.getpid()})...")
+        server.start()
+        handle_shutdown(lambda: server.stop(config.shutdown_grace_seconds))
+        try:
+            server.wait_for_termination()
+        finally:
+            if tracer:
+                tracer.close()
+
+
+async def serve_async(config: ServerConfig = None, worker: int = None, catalog_version: CatalogVersion = None):
+    config = config or load_server_config()
+    stats = create_server_stats(QUERY_TEMPLATES)
+    tracer = create_tracer()
+    slow_queries = create_slow_query_log()
+    register_worker_stats(stats, config, worker)
+    with open_book_repository(stats, tracer, slow_queries, config, catalog_version) as book_repository:
+        executor = futures.ThreadPoolExecutor(max_workers=config.db_pool_max_size)
+        server = build_async_server(
+            book_repository,
+            executor,
+            stats=stats,
+            tracer=tracer,
+            profiler=create_profiler(),
+            slow_queries=slow_queries,
+            options=config.grpc_options(),
+            maximum_concurrent_rpcs=config.max_concurrent_rpcs
+        )
+
+        server.add_insecure_port(config.address)
+        print(f"Library gRPC asyncio server starting on {config.address} (pid {os.getpid()})...")
+        await server.start()
+        loop = asyncio.get_running_loop()
+        stopping = []
+        handle_shutdown(lambda: loop.call_soon_threadsafe(
+            lambda: stopping.append(asyncio.ensure_future(server.stop(config.shutdown_grace_seconds)))))
+        try:
+            await server.wait_for_termination()
+        finally:
+            executor.shutdown()
+            if tracer:
+                tracer.close()
+
+
+def serve_worker(worker: int, config: ServerConfig, catalog_version: SharedCatalogVersion):
+    if config.mode == 'async':
+        asyncio.run(serve_async(config, worker, catalog_version))
+    else:
+        serve(config, worker, catalog_version)
+
+
+def serve_prefork(config: ServerConfig):
+    print(f"Library gRPC supervisor starting {config.processes} {config.mode} server processes on {config.address}...")
+    supervisor = PreforkSupervisor(
+        serve_worker, config.processes, (config, SharedCatalogVersion()), config.shutdown_grace_seconds)
+    supervisor.run()
 
 
 if __name__ == '__main__':
-    serve()
+    try:
+        server_config = load_server_config(sys.argv[1:])
+        if server_config.processes > 1 and os.getenv('BOOK_STORE', 'mysql') == 'memory':
+            raise ValueError("BOOK_STORE=memory keeps a separate catalog in every process, serve it from one process")
+    except (OSError, ValueError) as e:
+        sys.exit(f"Invalid server configuration: {e}")
+    if server_config.processes > 1:
+        serve_prefork(server_config)
+    elif server_config.mode == 'async':
+        asyncio.run(serve_async(server_config))
+    else:
+        serve(server_config)
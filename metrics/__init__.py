@@ -0,0 +1,16 @@
+from .histogram import LatencyHistogram, LATENCY_BUCKETS
+from .rpc_metrics import MethodMetrics, RpcMetrics
+from .query_metrics import QueryMetrics, QueryNames, InstrumentedCursor
+from .server_stats import ServerStats, create_server_stats
+
+__all__ = [
+    'LatencyHistogram',
+    'LATENCY_BUCKETS',
+    'MethodMetrics',
+    'RpcMetrics',
+    'QueryMetrics',
+    'QueryNames',
+    'InstrumentedCursor',
+    'ServerStats',
+    'create_server_stats'
+]
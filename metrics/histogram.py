@@ -0,0 +1,66 @@
+import bisect
+import threading
+from typing import List, Sequence
+
+
+LATENCY_BUCKETS = tuple(0.00005 * 2 ** i for i in range(22))
+
+
+class LatencyHistogram:
+
+    def __init__(self, bounds: Sequence[float] = LATENCY_BUCKETS):
+        self._bounds = tuple(bounds)
+        self._local = threading.local()
+        self._shards: List[list] = []
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._new_shard()
+        shard[bisect.bisect_left(self._bounds, seconds)] += 1
+        shard[-2] += seconds
+        if seconds > shard[-1]:
+            shard[-1] = seconds
+
+    def _new_shard(self) -> list:
+        shard = [0] * (len(self._bounds) + 1) + [0.0, 0.0]
+        with self._lock:
+            self._shards.append(shard)
+        self._local.shard = shard
+        return shard
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            shards = [list(shard) for shard in self._shards]
+
+        counts = [sum(bucket) for bucket in zip(*(shard[:-2] for shard in shards))] or [0] * (len(self._bounds) + 1)
+        count = sum(counts)
+        total = sum(shard[-2] for shard in shards)
+        maximum = max((shard[-1] for shard in shards), default=0.0)
+        return {
+            'count': count,
+            'mean_ms': total / count * 1000 if count else 0.0,
+            'p50_ms': self._quantile(counts, count, maximum, 0.50) * 1000,
+            'p95_ms': self._quantile(counts, count, maximum, 0.95) * 1000,
+            'p99_ms': self._quantile(counts, count, maximum, 0.99) * 1000,
+            'max_ms': maximum * 1000,
+            'buckets': [
+                (self._bounds[index] * 1000 if index < len(self._bounds) else float('inf'), bucket_count)
+                for index, bucket_count in enumerate(counts)
+                if bucket_count
+            ]
+        }
+
+    def _quantile(self, counts: list, count: int, maximum: float, fraction: float) -> float:
+        if not count:
+            return 0.0
+
+        rank = fraction * count
+        seen = 0
+        for index, bucket_count in enumerate(counts):
+            seen += bucket_count
+            if seen >= rank:
+                return min(self._bounds[index], maximum) if index < len(self._bounds) else maximum
+        return maximum
@@ -0,0 +1,138 @@
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+from .histogram import LatencyHistogram
+
+
+UNKNOWN_QUERY = 'OTHER'
+MAX_CACHED_QUERY_NAMES = 4096
+TEMPLATE_FIELD_PATTERN = re.compile(r"\\\{\w+\\\}")
+TRAILING_LIMIT_PATTERN = r"(?: LIMIT %s(?: OFFSET %s)?)?"
+
+
+class _QueryStats:
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self._local = threading.local()
+        self._shards: List[list] = []
+        self._lock = threading.Lock()
+        self._errors = 0
+
+    def add_rows(self, count: int):
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = [0]
+            with self._lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+        shard[0] += count
+
+    def add_error(self):
+        with self._lock:
+            self._errors += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            rows, errors = sum(shard[0] for shard in self._shards), self._errors
+        return {
+            'rows': rows,
+            'errors': errors,
+            'latency': self.latency.snapshot()
+        }
+
+
+class QueryNames:
+
+    def __init__(self, templates: Dict[str, str]):
+        self._exact = {sql: name for name, sql in templates.items() if '{' not in sql}
+        self._patterns = [
+            (name, re.compile(TEMPLATE_FIELD_PATTERN.sub('.*', re.escape(sql)) + TRAILING_LIMIT_PATTERN, re.DOTALL))
+            for name, sql in sorted(templates.items(), key=lambda item: len(item[1]), reverse=True)
+            if '{' in sql
+        ]
+
+    def name(self, sql: str) -> str:
+        name = self._exact.get(sql)
+        if name is None:
+            name = next((name for name, pattern in self._patterns if pattern.fullmatch(sql)), UNKNOWN_QUERY)
+        return name
+
+
+class QueryMetrics:
+
+    def __init__(self, templates: Dict[str, str]):
+        self.names = QueryNames(templates)
+        self._by_sql: Dict[str, _QueryStats] = {}
+        self._queries: Dict[str, _QueryStats] = {}
+        self._lock = threading.Lock()
+
+    def name(self, sql: str) -> str:
+        return self.names.name(sql)
+
+    def query(self, sql: str) -> _QueryStats:
+        stats = self._by_sql.get(sql)
+        if stats is None:
+            name = self.names.name(sql)
+            with self._lock:
+                stats = self._queries.setdefault(name, _QueryStats())
+                if len(self._by_sql) < MAX_CACHED_QUERY_NAMES:
+                    self._by_sql[sql] = stats
+        return stats
+
+    def stats(self) -> dict:
+        with self._lock:
+            queries = dict(self._queries)
+        return {name: stats.stats() for name, stats in sorted(queries.items())}
+
+
+class InstrumentedCursor:
+
+    def __init__(self, cursor, metrics: QueryMetrics):
+        self._cursor = cursor
+        self._metrics = metrics
+        self._query: Optional[_QueryStats] = None
+
+    def execute(self, sql: str, *args, **kwargs):
+        self._run(self._cursor.execute, sql, args, kwargs)
+
+    def executemany(self, sql: str, *args, **kwargs):
+        self._run(self._cursor.executemany, sql, args, kwargs)
+
+    def _run(self, execute, sql: str, args: tuple, kwargs: dict):
+        query = self._metrics.query(sql)
+        started = time.perf_counter()
+        try:
+            execute(sql, *args, **kwargs)
+        except Exception:
+            query.add_error()
+            raise
+        finally:
+            query.latency.observe(time.perf_counter() - started)
+        self._query = query
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None and self._query is not None:
+            self._query.add_rows(1)
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        if rows and self._query is not None:
+            self._query.add_rows(len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        if rows and self._query is not None:
+            self._query.add_rows(len(rows))
+        return rows
+
+    def close(self):
+        self._cursor.close()
+
+    def __getattr__(self, name: str):
+        return getattr(self._cursor, name)
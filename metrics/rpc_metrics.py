@@ -0,0 +1,65 @@
+import threading
+from typing import Dict, List
+from .histogram import LatencyHistogram
+
+
+class MethodMetrics:
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self._local = threading.local()
+        self._shards: List[list] = []
+        self._lock = threading.Lock()
+
+    def _shard(self) -> list:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = [0, {}]
+            with self._lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+            return shard
+
+    def start(self):
+        self._shard()[0] += 1
+
+    def finish(self, status_code: str, seconds: float):
+        self.latency.observe(seconds)
+        shard = self._shard()
+        shard[0] -= 1
+        status_codes = shard[1]
+        status_codes[status_code] = status_codes.get(status_code, 0) + 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            shards = [(in_flight, dict(status_codes)) for in_flight, status_codes in self._shards]
+
+        status_codes = {}
+        for _, shard_codes in shards:
+            for code, count in shard_codes.items():
+                status_codes[code] = status_codes.get(code, 0) + count
+        return {
+            'in_flight': sum(in_flight for in_flight, _ in shards),
+            'status_codes': status_codes,
+            'latency': self.latency.snapshot()
+        }
+
+
+class RpcMetrics:
+
+    def __init__(self):
+        self._methods: Dict[str, MethodMetrics] = {}
+        self._lock = threading.Lock()
+
+    def method(self, name: str) -> MethodMetrics:
+        metrics = self._methods.get(name)
+        if metrics is None:
+            with self._lock:
+                metrics = self._methods.setdefault(name, MethodMetrics())
+        return metrics
+
+    def stats(self) -> dict:
+        with self._lock:
+            methods = dict(self._methods)
+        return {name: metrics.stats() for name, metrics in sorted(methods.items())}
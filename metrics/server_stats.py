@@ -0,0 +1,37 @@
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional
+from .query_metrics import QueryMetrics
+from .rpc_metrics import RpcMetrics
+
+
+class ServerStats:
+
+    def __init__(self, rpcs: RpcMetrics = None, queries: QueryMetrics = None):
+        self.rpcs = rpcs
+        self.queries = queries
+        self._components: Dict[str, Callable[[], dict]] = {}
+        self._lock = threading.Lock()
+        self._started_at = time.monotonic()
+
+    def register(self, name: str, stats: Callable[[], dict]):
+        with self._lock:
+            self._components[name] = stats
+
+    def collect(self) -> dict:
+        with self._lock:
+            components = dict(self._components)
+        return {
+            'uptime_seconds': time.monotonic() - self._started_at,
+            'rpcs': self.rpcs.stats() if self.rpcs else {},
+            'queries': self.queries.stats() if self.queries else {},
+            'components': {name: stats() for name, stats in sorted(components.items())}
+        }
+
+
+def create_server_stats(query_templates: Dict[str, str]) -> Optional[ServerStats]:
+    if os.getenv('METRICS', '1').lower() not in ('1', 'true', 'yes'):
+        return None
+
+    return ServerStats(RpcMetrics(), QueryMetrics(query_templates))
@@ -0,0 +1,3 @@
+CREATE FULLTEXT INDEX ft_book_copies_title ON book_copies (title);
+CREATE FULLTEXT INDEX ft_book_copies_author ON book_copies (author);
+CREATE FULLTEXT INDEX ft_book_copies_genre ON book_copies (genre);
\ No newline at end of file
@@ -0,0 +1,15 @@
+CREATE TABLE IF NOT EXISTS inventory_counters (
+    slot TINYINT UNSIGNED PRIMARY KEY,
+    total_books INT NOT NULL DEFAULT 0,
+    available_books INT NOT NULL DEFAULT 0
+);
+
+INSERT IGNORE INTO inventory_counters (slot) VALUES
+(0), (1), (2), (3), (4), (5), (6), (7), (8), (9), (10), (11), (12), (13), (14), (15);
+
+UPDATE inventory_counters SET total_books = 0, available_books = 0;
+
+UPDATE inventory_counters SET
+    total_books = (SELECT COUNT(*) FROM book_copies),
+    available_books = (SELECT COUNT(*) FROM book_copies WHERE is_available = TRUE)
+WHERE slot = 0;
\ No newline at end of file
@@ -1,3 +1,3 @@
-from .book import Book
+from .book import AvailabilityChange, AvailabilityStatus, Book, BookPage, BookRow, BookRowPage, CreateBookResult, SearchCriteria, SearchMode
 
-__all__ = ['Book']
+__all__ = ['AvailabilityChange', 'AvailabilityStatus', 'Book', 'BookPage', 'BookRow', 'BookRowPage', 'CreateBookResult', 'SearchCriteria', 'SearchMode']
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
-from typing import Tuple
+from enum import Enum
+from typing import List, Optional, Tuple
 
 
 @dataclass
@@ -20,3 +21,58 @@ class Book:
             self.is_available,
             self.book_condition
         )
+
+
+class AvailabilityStatus(Enum):
+    UPDATED = 'updated'
+    NOT_FOUND = 'not_found'
+    ALREADY_CHECKED_OUT = 'already_checked_out'
+    ALREADY_AVAILABLE = 'already_available'
+    ABORTED = 'aborted'
+
+
+@dataclass
+class AvailabilityChange:
+    status: AvailabilityStatus
+    book: Optional[Book] = None
+
+
+@dataclass
+class CreateBookResult:
+    uuid: Optional[str]
+    error: Optional[str] = None
+
+
+BookRow = Tuple[str, str, str, str, bool, str]
+
+
+@dataclass
+class BookPage:
+    books: List[Book]
+    next_page_token: str
+
+
+@dataclass
+class BookRowPage:
+    rows: List[BookRow]
+    next_page_token: str
+
+
+class SearchMode(Enum):
+    SUBSTRING = 'substring'
+    FULLTEXT = 'fulltext'
+
+
+@dataclass(frozen=True)
+class SearchCriteria:
+    title: Optional[str] = None
+    author: Optional[str] = None
+    genre: Optional[str] = None
+    match_all: bool = False
+    mode: SearchMode = SearchMode.SUBSTRING
+    after_uuid: Optional[str] = None
+    limit: Optional[int] = None
+    offset: int = 0
+
+    def is_empty(self) -> bool:
+        return not self.title and not self.author and not self.genre
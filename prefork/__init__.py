@@ -0,0 +1,8 @@
+from .supervisor import PreforkSupervisor, WorkerSlot, handle_shutdown, restart_delay
+
+__all__ = [
+    'PreforkSupervisor',
+    'WorkerSlot',
+    'handle_shutdown',
+    'restart_delay'
+]
@@ -0,0 +1,129 @@
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from dataclasses import dataclass
+from multiprocessing import connection
+from typing import Callable, Optional
+
+
+MIN_UPTIME_SECONDS = 5.0
+RESTART_DELAY_SECONDS = 0.5
+MAX_RESTART_DELAY_SECONDS = 30.0
+SHUTDOWN_MARGIN_SECONDS = 5.0
+
+
+@dataclass
+class WorkerSlot:
+    index: int
+    process: Optional[multiprocessing.process.BaseProcess] = None
+    started_at: float = 0.0
+    restart_at: Optional[float] = None
+    failures: int = 0
+
+
+def restart_delay(failures: int) -> float:
+    if failures == 0:
+        return 0.0
+    return min(RESTART_DELAY_SECONDS * 2 ** (failures - 1), MAX_RESTART_DELAY_SECONDS)
+
+
+def _watch_parent(sentinel: int, stop: Callable[[], None]):
+    connection.wait([sentinel])
+    stop()
+
+
+def handle_shutdown(stop: Callable[[], None]):
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, lambda signum, frame: stop())
+
+    parent = multiprocessing.parent_process()
+    if parent is not None:
+        threading.Thread(target=_watch_parent, args=(parent.sentinel, stop), name='parent-watch', daemon=True).start()
+
+
+def _run_worker(target: Callable, index: int, args: tuple):
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    target(index, *args)
+
+
+class PreforkSupervisor:
+
+    def __init__(self, target: Callable, processes: int, args: tuple = (), grace_seconds: float = 10.0):
+        if processes < 1:
+            raise ValueError("processes must be at least 1")
+        self._target = target
+        self._args = args
+        self._grace_seconds = grace_seconds
+        self._context = multiprocessing.get_context('spawn')
+        self._slots = [WorkerSlot(index) for index in range(processes)]
+        self._stopping = False
+        self._wakeup_read, self._wakeup_write = os.pipe()
+
+    def run(self):
+        handlers = {
+            sig: signal.signal(sig, lambda signum, frame: self.stop())
+            for sig in (signal.SIGTERM, signal.SIGINT)
+        }
+        try:
+            for slot in self._slots:
+                self._start(slot)
+            while not self._stopping:
+                self._wait()
+                self._reap()
+        finally:
+            self._shutdown()
+            for sig, handler in handlers.items():
+                signal.signal(sig, handler)
+            os.close(self._wakeup_read)
+            os.close(self._wakeup_write)
+
+    def stop(self):
+        self._stopping = True
+        os.write(self._wakeup_write, b'\0')
+
+    def _start(self, slot: WorkerSlot):
+        slot.process = self._context.Process(
+            target=_run_worker,
+            args=(self._target, slot.index, self._args),
+            name=f'worker-{slot.index}'
+        )
+        slot.process.start()
+        slot.started_at = time.monotonic()
+        slot.restart_at = None
+
+    def _wait(self):
+        waitables = [slot.process.sentinel for slot in self._slots if slot.process is not None]
+        waitables.append(self._wakeup_read)
+        pending = [slot.restart_at for slot in self._slots if slot.restart_at is not None]
+        connection.wait(waitables, max(0.0, min(pending) - time.monotonic()) if pending else None)
+
+    def _reap(self):
+        now = time.monotonic()
+        for slot in self._slots:
+            process = slot.process
+            if process is not None and not process.is_alive():
+                process.join()
+                slot.process = None
+                slot.failures = slot.failures + 1 if now - slot.started_at < MIN_UPTIME_SECONDS else 0
+                slot.restart_at = now + restart_delay(slot.failures)
+                if not self._stopping:
+                    print(f"Worker {slot.index} (pid {process.pid}) exited with code {process.exitcode}, "
+                          f"restarting in {slot.restart_at - now:.1f}s", flush=True)
+
+            if not self._stopping and slot.process is None and slot.restart_at <= now:
+                self._start(slot)
+
+    def _shutdown(self):
+        running = [slot.process for slot in self._slots if slot.process is not None]
+        for process in running:
+            process.terminate()
+
+        deadline = time.monotonic() + self._grace_seconds + SHUTDOWN_MARGIN_SECONDS
+        for process in running:
+            process.join(max(0.0, deadline - time.monotonic()))
+        for process in running:
+            if process.is_alive():
+                process.kill()
+                process.join()
@@ -0,0 +1,15 @@
+from .sampler import SamplingProfiler, ProfilerBusyError, collapsed, create_profiler, MAX_PROFILE_SECONDS
+from .slow_queries import SlowQuery, SlowQueryLog, SlowQueryCursor, parameter_shape, create_slow_query_log
+
+__all__ = [
+    'SamplingProfiler',
+    'ProfilerBusyError',
+    'collapsed',
+    'create_profiler',
+    'MAX_PROFILE_SECONDS',
+    'SlowQuery',
+    'SlowQueryLog',
+    'SlowQueryCursor',
+    'parameter_shape',
+    'create_slow_query_log'
+]
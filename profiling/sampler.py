@@ -0,0 +1,111 @@
+import os
+import sys
+import threading
+import time
+from typing import Dict, Optional
+
+
+MAX_PROFILE_SECONDS = 300.0
+MIN_INTERVAL_SECONDS = 0.001
+
+IDLE_FRAMES = {
+    ('threading.py', 'wait'),
+    ('threading.py', '_wait_for_tstate_lock'),
+    ('queue.py', 'get'),
+    ('selectors.py', 'select'),
+    ('thread.py', '_worker'),
+    ('_server.py', '_serve'),
+    ('_common.py', 'wait')
+}
+
+
+class ProfilerBusyError(RuntimeError):
+    pass
+
+
+def frame_label(code) -> str:
+    return f"{getattr(code, 'co_qualname', code.co_name)} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def is_idle(frame) -> bool:
+    code = frame.f_code
+    return (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES
+
+
+def stack_codes(frame) -> tuple:
+    codes = []
+    while frame is not None:
+        codes.append(frame.f_code)
+        frame = frame.f_back
+    return tuple(codes)
+
+
+def collapse_stacks(stacks: Dict[tuple, int]) -> Dict[str, int]:
+    labels = {}
+    collapsed_stacks: Dict[str, int] = {}
+    for codes, count in stacks.items():
+        for code in codes:
+            if code not in labels:
+                labels[code] = frame_label(code)
+        stack = ';'.join(labels[code] for code in reversed(codes))
+        collapsed_stacks[stack] = collapsed_stacks.get(stack, 0) + count
+    return collapsed_stacks
+
+
+class SamplingProfiler:
+
+    def __init__(self):
+        self._running = threading.Lock()
+
+    def profile(self, duration: float, interval: float = 0.01, include_idle: bool = False) -> dict:
+        if not 0 < duration <= MAX_PROFILE_SECONDS:
+            raise ValueError(f"duration must be between 0 and {MAX_PROFILE_SECONDS:g} seconds")
+        if interval < MIN_INTERVAL_SECONDS:
+            raise ValueError(f"interval must be at least {MIN_INTERVAL_SECONDS * 1000:g} ms")
+        if not self._running.acquire(blocking=False):
+            raise ProfilerBusyError("A profile is already running")
+
+        try:
+            return self._sample(duration, interval, include_idle)
+        finally:
+            self._running.release()
+
+    @staticmethod
+    def _sample(duration: float, interval: float, include_idle: bool) -> dict:
+        stacks: Dict[tuple, int] = {}
+        samples = 0
+        own_thread = threading.get_ident()
+        started = time.perf_counter()
+        deadline = started + duration
+        next_sample = started
+
+        while True:
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            if now < next_sample:
+                time.sleep(next_sample - now)
+            next_sample += interval
+
+            samples += 1
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_thread or (not include_idle and is_idle(frame)):
+                    continue
+                stack = stack_codes(frame)
+                stacks[stack] = stacks.get(stack, 0) + 1
+
+        return {
+            'samples': samples,
+            'duration_seconds': time.perf_counter() - started,
+            'stacks': collapse_stacks(stacks)
+        }
+
+
+def collapsed(stacks: Dict[str, int]) -> str:
+    return ''.join(f"{stack} {count}\n" for stack, count in sorted(stacks.items(), key=lambda item: -item[1]))
+
+
+def create_profiler() -> Optional[SamplingProfiler]:
+    if os.getenv('PROFILER', '0').lower() not in ('1', 'true', 'yes'):
+        return None
+    return SamplingProfiler()
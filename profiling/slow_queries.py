@@ -0,0 +1,144 @@
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+
+@dataclass
+class SlowQuery:
+    query: str
+    sql: str
+    parameter_shape: str
+    duration_seconds: float
+    started_at: float
+    params: Optional[tuple] = None
+    explain: Optional[List[dict]] = None
+    explain_error: Optional[str] = None
+
+
+def _types(values) -> str:
+    runs = []
+    for value in values:
+        name = type(value).__name__
+        if runs and runs[-1][0] == name:
+            runs[-1][1] += 1
+        else:
+            runs.append([name, 1])
+    return '(' + ', '.join(name if count == 1 else f"{name} x {count}" for name, count in runs) + ')'
+
+
+def parameter_shape(params, many: bool = False) -> str:
+    if not many:
+        if isinstance(params, dict):
+            return '{' + ', '.join(f"{key}: {type(value).__name__}" for key, value in params.items()) + '}'
+        return _types(params or ())
+
+    rows = params if isinstance(params, (list, tuple)) else []
+    return f"{len(rows)} x {_types(rows[0]) if rows else '()'}"
+
+
+def is_explainable(sql: str) -> bool:
+    return sql.lstrip()[:6].upper() == 'SELECT'
+
+
+class SlowQueryLog:
+
+    def __init__(self, threshold_seconds: float, capacity: int = 100, explain: bool = False):
+        if threshold_seconds < 0:
+            raise ValueError("threshold_seconds must not be negative")
+        self.threshold_seconds = threshold_seconds
+        self.explain_enabled = explain
+        self._entries = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._recorded = 0
+        self._explainer: Optional[Callable[[str, tuple], List[dict]]] = None
+
+    def set_explainer(self, explainer: Callable[[str, tuple], List[dict]]):
+        self._explainer = explainer
+
+    def record(self, query: str, sql: str, params, many: bool, seconds: float):
+        entry = SlowQuery(
+            query=query,
+            sql=sql,
+            parameter_shape=parameter_shape(params, many),
+            duration_seconds=seconds,
+            started_at=time.time() - seconds,
+            params=tuple(params or ()) if self.explain_enabled and not many and not isinstance(params, dict) else None
+        )
+        with self._lock:
+            self._entries.append(entry)
+            self._recorded += 1
+
+    def entries(self, limit: int = 0, explain: bool = False) -> List[SlowQuery]:
+        with self._lock:
+            entries = list(reversed(self._entries))
+        if limit > 0:
+            entries = entries[:limit]
+
+        if explain:
+            if not self.explain_enabled or self._explainer is None:
+                raise ValueError("EXPLAIN is disabled for the slow query log")
+            for entry in entries:
+                self._explain(entry)
+        return entries
+
+    def _explain(self, entry: SlowQuery):
+        if entry.explain is not None or entry.explain_error is not None:
+            return
+        if entry.params is None or not is_explainable(entry.sql):
+            entry.explain_error = "Only single SELECT statements can be explained"
+            return
+        try:
+            entry.explain = self._explainer(entry.sql, entry.params)
+        except Exception as e:
+            entry.explain_error = str(e)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'threshold_ms': self.threshold_seconds * 1000,
+                'recorded': self._recorded,
+                'retained': len(self._entries)
+            }
+
+
+class SlowQueryCursor:
+
+    def __init__(self, cursor, log: SlowQueryLog, query_name: Callable[[str], str]):
+        self._cursor = cursor
+        self._log = log
+        self._query_name = query_name
+
+    def execute(self, sql: str, params=None, *args, **kwargs):
+        return self._run(self._cursor.execute, sql, params, False, args, kwargs)
+
+    def executemany(self, sql: str, params, *args, **kwargs):
+        return self._run(self._cursor.executemany, sql, params, True, args, kwargs)
+
+    def _run(self, execute, sql: str, params, many: bool, args: tuple, kwargs: dict):
+        started = time.perf_counter()
+        try:
+            if params is None:
+                return execute(sql, *args, **kwargs)
+            return execute(sql, params, *args, **kwargs)
+        finally:
+            seconds = time.perf_counter() - started
+            if seconds >= self._log.threshold_seconds:
+                self._log.record(self._query_name(sql), sql, params, many, seconds)
+
+    def __getattr__(self, name: str):
+        return getattr(self._cursor, name)
+
+
+def create_slow_query_log() -> Optional[SlowQueryLog]:
+    threshold_ms = float(os.getenv('SLOW_QUERY_MS', '0'))
+    if threshold_ms <= 0:
+        return None
+
+    return SlowQueryLog(
+        threshold_ms / 1000,
+        capacity=int(os.getenv('SLOW_QUERY_LOG_SIZE', '100')),
+        explain=os.getenv('SLOW_QUERY_EXPLAIN', '0').lower() in ('1', 'true', 'yes')
+    )
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# NO CHECKED-IN PROTOBUF GENCODE
+# source: proto/admin.proto
+# Protobuf Python Version: 6.31.1
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import runtime_version as _runtime_version
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+_runtime_version.ValidateProtobufRuntimeVersion(
+    _runtime_version.Domain.PUBLIC,
+    6,
+    31,
+    1,
+    '',
+    'proto/admin.proto'
+)
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+from google.protobuf import struct_pb2 as google_dot_protobuf_dot_struct__pb2
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x11proto/admin.proto\x12\x0b\x62ookservice\x1a\x1cgoogle/protobuf/struct.proto\"\x17\n\x15GetServerStatsRequest\"6\n\x0fHistogramBucket\x12\x14\n\x0cupperBoundMs\x18\x01 \x01(\x01\x12\r\n\x05\x63ount\x18\x02 \x01(\x03\"\x9c\x01\n\x10LatencyHistogram\x12\r\n\x05\x63ount\x18\x01 \x01(\x03\x12\x0e\n\x06meanMs\x18\x02 \x01(\x01\x12\r\n\x05p50Ms\x18\x03 \x01(\x01\x12\r\n\x05p95Ms\x18\x04 \x01(\x01\x12\r\n\x05p99Ms\x18\x05 \x01(\x01\x12\r\n\x05maxMs\x18\x06 \x01(\x01\x12-\n\x07\x62uckets\x18\x07 \x03(\x0b\x32\x1c.bookservice.HistogramBucket\"\xd3\x01\n\x0bMethodStats\x12\x0e\n\x06method\x18\x01 \x01(\t\x12\x10\n\x08inFlight\x18\x02 \x01(\x03\x12>\n\x0bstatusCodes\x18\x03 \x03(\x0b\x32).bookservice.MethodStats.StatusCodesEntry\x12.\n\x07latency\x18\x04 \x01(\x0b\x32\x1d.bookservice.LatencyHistogram\x1a\x32\n\x10StatusCodesEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x03:\x02\x38\x01\"i\n\nQueryStats\x12\r\n\x05query\x18\x01 \x01(\t\x12\x0c\n\x04rows\x18\x02 \x01(\x03\x12\x0e\n\x06\x65rrors\x18\x03 \x01(\x03\x12.\n\x07latency\x18\x04 \x01(\x0b\x32\x1d.bookservice.LatencyHistogram\"\xb1\x01\n\x16GetServerStatsResponse\x12\x15\n\ruptimeSeconds\x18\x01 \x01(\x01\x12)\n\x07methods\x18\x02 \x03(\x0b\x32\x18.bookservice.MethodStats\x12(\n\x07queries\x18\x03 \x03(\x0b\x32\x17.bookservice.QueryStats\x12+\n\ncomponents\x18\x04 \x01(\x0b\x32\x17.google.protobuf.Struct\"I\n\x10GetTracesRequest\x12\r\n\x05limit\x18\x01 \x01(\x05\x12\x0f\n\x07traceId\x18\x02 \x01(\t\x12\x15\n\rminDurationMs\x18\x03 \x01(\x01\"\xee\x01\n\tTraceSpan\x12\x0e\n\x06spanId\x18\x01 \x01(\t\x12\x10\n\x08parentId\x18\x02 \x01(\t\x12\x0c\n\x04name\x18\x03 \x01(\t\x12\r\n\x05layer\x18\x04 \x01(\t\x12\x10\n\x08offsetMs\x18\x05 \x01(\x01\x12\x12\n\ndurationMs\x18\x06 \x01(\x01\x12\r\n\x05\x65rror\x18\x07 \x01(\t\x12:\n\nattributes\x18\x08 \x03(\x0b\x32&.bookservice.TraceSpan.AttributesEntry\x1a\x31\n\x0f\x41ttributesEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\xd6\x01\n\x05Trace\x12\x0f\n\x07traceId\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x11\n\tstartedAt\x18\x03 \x01(\x01\x12\x12\n\ndurationMs\x18\x04 \x01(\x01\x12\x30\n\x07layerMs\x18\x05 \x03(\x0b\x32\x1f.bookservice.Trace.LayerMsEntry\x12%\n\x05spans\x18\x06 \x03(\x0b\x32\x16.bookservice.TraceSpan\x1a.\n\x0cLayerMsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x01:\x02\x38\x01\"7\n\x11GetTracesResponse\x12\"\n\x06traces\x18\x01 \x03(\x0b\x32\x12.bookservice.Trace\"R\n\x0eProfileRequest\x12\x17\n\x0f\x64urationSeconds\x18\x01 \x01(\x01\x12\x12\n\nintervalMs\x18\x02 \x01(\x01\x12\x13\n\x0bincludeIdle\x18\x03 \x01(\x08\"T\n\x0fProfileResponse\x12\x0f\n\x07samples\x18\x01 \x01(\x03\x12\x17\n\x0f\x64urationSeconds\x18\x02 \x01(\x01\x12\x17\n\x0f\x63ollapsedStacks\x18\x03 \x01(\t\"7\n\x15GetSlowQueriesRequest\x12\r\n\x05limit\x18\x01 \x01(\x05\x12\x0f\n\x07\x65xplain\x18\x02 \x01(\x08\"\xa6\x01\n\tSlowQuery\x12\r\n\x05query\x18\x01 \x01(\t\x12\x0b\n\x03sql\x18\x02 \x01(\t\x12\x16\n\x0eparameterShape\x18\x03 \x01(\t\x12\x12\n\ndurationMs\x18\x04 \x01(\x01\x12\x11\n\tstartedAt\x18\x05 \x01(\x01\x12(\n\x07\x65xplain\x18\x06 \x03(\x0b\x32\x17.google.protobuf.Struct\x12\x14\n\x0c\x65xplainError\x18\x07 \x01(\t\"h\n\x16GetSlowQueriesResponse\x12\x13\n\x0bthresholdMs\x18\x01 \x01(\x01\x12\x10\n\x08recorded\x18\x02 \x01(\x03\x12\'\n\x07queries\x18\x03 \x03(\x0b\x32\x16.bookservice.SlowQuery2\xcf\x02\n\x05\x41\x64min\x12Y\n\x0eGetServerStats\x12\".bookservice.GetServerStatsRequest\x1a#.bookservice.GetServerStatsResponse\x12J\n\tGetTraces\x12\x1d.bookservice.GetTracesRequest\x1a\x1e.bookservice.GetTracesResponse\x12\x44\n\x07Profile\x12\x1b.bookservice.ProfileRequest\x1a\x1c.bookservice.ProfileResponse\x12Y\n\x0eGetSlowQueries\x12\".bookservice.GetSlowQueriesRequest\x1a#.bookservice.GetSlowQueriesResponseb\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'proto.admin_pb2', _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+  DESCRIPTOR._loaded_options = None
+  _globals['_METHODSTATS_STATUSCODESENTRY']._loaded_options = None
+  _globals['_METHODSTATS_STATUSCODESENTRY']._serialized_options = b'8\001'
+  _globals['_TRACESPAN_ATTRIBUTESENTRY']._loaded_options = None
+  _globals['_TRACESPAN_ATTRIBUTESENTRY']._serialized_options = b'8\001'
+  _globals['_TRACE_LAYERMSENTRY']._loaded_options = None
+  _globals['_TRACE_LAYERMSENTRY']._serialized_options = b'8\001'
+  _globals['_GETSERVERSTATSREQUEST']._serialized_start=64
+  _globals['_GETSERVERSTATSREQUEST']._serialized_end=87
+  _globals['_HISTOGRAMBUCKET']._serialized_start=89
+  _globals['_HISTOGRAMBUCKET']._serialized_end=143
+  _globals['_LATENCYHISTOGRAM']._serialized_start=146
+  _globals['_LATENCYHISTOGRAM']._serialized_end=302
+  _globals['_METHODSTATS']._serialized_start=305
+  _globals['_METHODSTATS']._serialized_end=516
+  _globals['_METHODSTATS_STATUSCODESENTRY']._serialized_start=466
+  _globals['_METHODSTATS_STATUSCODESENTRY']._serialized_end=516
+  _globals['_QUERYSTATS']._serialized_start=518
+  _globals['_QUERYSTATS']._serialized_end=623
+  _globals['_GETSERVERSTATSRESPONSE']._serialized_start=626
+  _globals['_GETSERVERSTATSRESPONSE']._serialized_end=803
+  _globals['_GETTRACESREQUEST']._serialized_start=805
+  _globals['_GETTRACESREQUEST']._serialized_end=878
+  _globals['_TRACESPAN']._serialized_start=881
+  _globals['_TRACESPAN']._serialized_end=1119
+  _globals['_TRACESPAN_ATTRIBUTESENTRY']._serialized_start=1070
+  _globals['_TRACESPAN_ATTRIBUTESENTRY']._serialized_end=1119
+  _globals['_TRACE']._serialized_start=1122
+  _globals['_TRACE']._serialized_end=1336
+  _globals['_TRACE_LAYERMSENTRY']._serialized_start=1290
+  _globals['_TRACE_LAYERMSENTRY']._serialized_end=1336
+  _globals['_GETTRACESRESPONSE']._serialized_start=1338
+  _globals['_GETTRACESRESPONSE']._serialized_end=1393
+  _globals['_PROFILEREQUEST']._serialized_start=1395
+  _globals['_PROFILEREQUEST']._serialized_end=1477
+  _globals['_PROFILERESPONSE']._serialized_start=1479
+  _globals['_PROFILERESPONSE']._serialized_end=1563
+  _globals['_GETSLOWQUERIESREQUEST']._serialized_start=1565
+  _globals['_GETSLOWQUERIESREQUEST']._serialized_end=1620
+  _globals['_SLOWQUERY']._serialized_start=1623
+  _globals['_SLOWQUERY']._serialized_end=1789
+  _globals['_GETSLOWQUERIESRESPONSE']._serialized_start=1791
+  _globals['_GETSLOWQUERIESRESPONSE']._serialized_end=1895
+  _globals['_ADMIN']._serialized_start=1898
+  _globals['_ADMIN']._serialized_end=2233
+# @@protoc_insertion_point(module_scope)
@@ -0,0 +1,226 @@
+# Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
+"""Client and server classes corresponding to protobuf-defined services."""
+import grpc
+import warnings
+
+from proto import admin_pb2 as proto_dot_admin__pb2
+
+GRPC_GENERATED_VERSION = '1.75.0'
+GRPC_VERSION = grpc.__version__
+_version_not_supported = False
+
+try:
+    from grpc._utilities import first_version_is_lower
+    _version_not_supported = first_version_is_lower(GRPC_VERSION, GRPC_GENERATED_VERSION)
+except ImportError:
+    _version_not_supported = True
+
+if _version_not_supported:
+    raise RuntimeError(
+        f'The grpc package installed is at version {GRPC_VERSION},'
+        + f' but the generated code in proto/admin_pb2_grpc.py depends on'
+        + f' grpcio>={GRPC_GENERATED_VERSION}.'
+        + f' Please upgrade your grpc module to grpcio>={GRPC_GENERATED_VERSION}'
+        + f' or downgrade your generated code using grpcio-tools<={GRPC_VERSION}.'
+    )
+
+
+class AdminStub(object):
+    """Missing associated documentation comment in .proto file."""
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.GetServerStats = channel.unary_unary(
+                '/bookservice.Admin/GetServerStats',
+                request_serializer=proto_dot_admin__pb2.GetServerStatsRequest.SerializeToString,
+                response_deserializer=proto_dot_admin__pb2.GetServerStatsResponse.FromString,
+                _registered_method=True)
+        self.GetTraces = channel.unary_unary(
+                '/bookservice.Admin/GetTraces',
+                request_serializer=proto_dot_admin__pb2.GetTracesRequest.SerializeToString,
+                response_deserializer=proto_dot_admin__pb2.GetTracesResponse.FromString,
+                _registered_method=True)
+        self.Profile = channel.unary_unary(
+                '/bookservice.Admin/Profile',
+                request_serializer=proto_dot_admin__pb2.ProfileRequest.SerializeToString,
+                response_deserializer=proto_dot_admin__pb2.ProfileResponse.FromString,
+                _registered_method=True)
+        self.GetSlowQueries = channel.unary_unary(
+                '/bookservice.Admin/GetSlowQueries',
+                request_serializer=proto_dot_admin__pb2.GetSlowQueriesRequest.SerializeToString,
+                response_deserializer=proto_dot_admin__pb2.GetSlowQueriesResponse.FromString,
+                _registered_method=True)
+
+
+class AdminServicer(object):
+    """Missing associated documentation comment in .proto file."""
+
+    def GetServerStats(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetTraces(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Profile(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetSlowQueries(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_AdminServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'GetServerStats': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetServerStats,
+                    request_deserializer=proto_dot_admin__pb2.GetServerStatsRequest.FromString,
+                    response_serializer=proto_dot_admin__pb2.GetServerStatsResponse.SerializeToString,
+            ),
+            'GetTraces': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetTraces,
+                    request_deserializer=proto_dot_admin__pb2.GetTracesRequest.FromString,
+                    response_serializer=proto_dot_admin__pb2.GetTracesResponse.SerializeToString,
+            ),
+            'Profile': grpc.unary_unary_rpc_method_handler(
+                    servicer.Profile,
+                    request_deserializer=proto_dot_admin__pb2.ProfileRequest.FromString,
+                    response_serializer=proto_dot_admin__pb2.ProfileResponse.SerializeToString,
+            ),
+            'GetSlowQueries': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetSlowQueries,
+                    request_deserializer=proto_dot_admin__pb2.GetSlowQueriesRequest.FromString,
+                    response_serializer=proto_dot_admin__pb2.GetSlowQueriesResponse.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'bookservice.Admin', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+    server.add_registered_method_handlers('bookservice.Admin', rpc_method_handlers)
+
+
+ # This class is part of an EXPERIMENTAL API.
+class Admin(object):
+    """Missing associated documentation comment in .proto file."""
+
+    @staticmethod
+    def GetServerStats(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/bookservice.Admin/GetServerStats',
+            proto_dot_admin__pb2.GetServerStatsRequest.SerializeToString,
+            proto_dot_admin__pb2.GetServerStatsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetTraces(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/bookservice.Admin/GetTraces',
+            proto_dot_admin__pb2.GetTracesRequest.SerializeToString,
+            proto_dot_admin__pb2.GetTracesResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def Profile(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/bookservice.Admin/Profile',
+            proto_dot_admin__pb2.ProfileRequest.SerializeToString,
+            proto_dot_admin__pb2.ProfileResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetSlowQueries(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/bookservice.Admin/GetSlowQueries',
+            proto_dot_admin__pb2.GetSlowQueriesRequest.SerializeToString,
+            proto_dot_admin__pb2.GetSlowQueriesResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
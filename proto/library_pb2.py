@@ -24,51 +24,81 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x13proto/library.proto\x12\x0b\x62ookservice\"n\n\x08\x42ookCopy\x12\x0c\n\x04uuid\x18\x01 \x01(\t\x12\x0e\n\x06\x61uthor\x18\x02 \x01(\t\x12\r\n\x05title\x18\x03 \x01(\t\x12\r\n\x05genre\x18\x04 \x01(\t\x12\x13\n\x0bisAvaliable\x18\x05 \x01(\x08\x12\x11\n\tcondition\x18\x06 \x01(\t\"L\n\x11SearchBookRequest\x12\x10\n\x08\x62ookName\x18\x01 \x01(\t\x12\x12\n\nbookAuthor\x18\x02 \x01(\t\x12\x11\n\tbookGenre\x18\x03 \x01(\t\"D\n\x12SearchBookResponse\x12.\n\x0f\x61valiableCopies\x18\x01 \x03(\x0b\x32\x15.bookservice.BookCopy\"I\n\x13\x43heckoutBookRequest\x12\x0e\n\x06userId\x18\x01 \x01(\t\x12\x10\n\x08\x63opyUuid\x18\x02 \x01(\t\x12\x10\n\x08loanTime\x18\x03 \x01(\x05\"^\n\x14\x43heckoutBookResponse\x12\x0e\n\x06loanId\x18\x01 \x01(\t\x12\x0f\n\x07\x64ueDate\x18\x02 \x01(\t\x12\x11\n\tbookTitle\x18\x03 \x01(\t\x12\x12\n\nbookAuthor\x18\x04 \x01(\t\"%\n\x11ReturnBookRequest\x12\x10\n\x08\x63opyUuid\x18\x01 \x01(\t\"%\n\x12ReturnBookResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"T\n\x11\x43reateBookRequest\x12\r\n\x05title\x18\x01 \x01(\t\x12\x0e\n\x06\x61uthor\x18\x02 \x01(\t\x12\r\n\x05genre\x18\x03 \x01(\t\x12\x11\n\tcondition\x18\x04 \x01(\t\"\"\n\x12\x43reateBookResponse\x12\x0c\n\x04uuid\x18\x01 \x01(\t\"\x1e\n\x0eGetBookRequest\x12\x0c\n\x04uuid\x18\x01 \x01(\t\"6\n\x0fGetBookResponse\x12#\n\x04\x62ook\x18\x01 \x01(\x0b\x32\x15.bookservice.BookCopy\"b\n\x11UpdateBookRequest\x12\x0c\n\x04uuid\x18\x01 \x01(\t\x12\r\n\x05title\x18\x02 \x01(\t\x12\x0e\n\x06\x61uthor\x18\x03 \x01(\t\x12\r\n\x05genre\x18\x04 \x01(\t\x12\x11\n\tcondition\x18\x05 \x01(\t\"%\n\x12UpdateBookResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"!\n\x11\x44\x65leteBookRequest\x12\x0c\n\x04uuid\x18\x01 \x01(\t\"%\n\x12\x44\x65leteBookResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"\x14\n\x12GetAllBooksRequest\";\n\x13GetAllBooksResponse\x12$\n\x05\x62ooks\x18\x01 \x03(\x0b\x32\x15.bookservice.BookCopy\"\x1c\n\x1aGetInventorySummaryRequest\"b\n\x1bGetInventorySummaryResponse\x12\x12\n\ntotalBooks\x18\x01 \x01(\x05\x12\x16\n\x0e\x61vailableBooks\x18\x02 \x01(\x05\x12\x17\n\x0f\x63heckedOutBooks\x18\x03 \x01(\x05\x32\xeb\x05\n\x07Library\x12M\n\nSearchBook\x12\x1e.bookservice.SearchBookRequest\x1a\x1f.bookservice.SearchBookResponse\x12S\n\x0c\x43heckoutBook\x12 .bookservice.CheckoutBookRequest\x1a!.bookservice.CheckoutBookResponse\x12M\n\nReturnBook\x12\x1e.bookservice.ReturnBookRequest\x1a\x1f.bookservice.ReturnBookResponse\x12M\n\nCreateBook\x12\x1e.bookservice.CreateBookRequest\x1a\x1f.bookservice.CreateBookResponse\x12\x44\n\x07GetBook\x12\x1b.bookservice.GetBookRequest\x1a\x1c.bookservice.GetBookResponse\x12M\n\nUpdateBook\x12\x1e.bookservice.UpdateBookRequest\x1a\x1f.bookservice.UpdateBookResponse\x12M\n\nDeleteBook\x12\x1e.bookservice.DeleteBookRequest\x1a\x1f.bookservice.DeleteBookResponse\x12P\n\x0bGetAllBooks\x12\x1f.bookservice.GetAllBooksRequest\x1a .bookservice.GetAllBooksResponse\x12h\n\x13GetInventorySummary\x12\'.bookservice.GetInventorySummaryRequest\x1a(.bookservice.GetInventorySummaryResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x13proto/library.proto\x12\x0b\x62ookservice\"n\n\x08\x42ookCopy\x12\x0c\n\x04uuid\x18\x01 \x01(\t\x12\x0e\n\x06\x61uthor\x18\x02 \x01(\t\x12\r\n\x05title\x18\x03 \x01(\t\x12\r\n\x05genre\x18\x04 \x01(\t\x12\x13\n\x0bisAvaliable\x18\x05 \x01(\x08\x12\x11\n\tcondition\x18\x06 \x01(\t\"\xaa\x01\n\x11SearchBookRequest\x12\x10\n\x08\x62ookName\x18\x01 \x01(\t\x12\x12\n\nbookAuthor\x18\x02 \x01(\t\x12\x11\n\tbookGenre\x18\x03 \x01(\t\x12\x10\n\x08pageSize\x18\x04 \x01(\x05\x12\x11\n\tpageToken\x18\x05 \x01(\t\x12\x10\n\x08matchAll\x18\x06 \x01(\x08\x12%\n\x04mode\x18\x07 \x01(\x0e\x32\x17.bookservice.SearchMode\"[\n\x12SearchBookResponse\x12.\n\x0f\x61valiableCopies\x18\x01 \x03(\x0b\x32\x15.bookservice.BookCopy\x12\x15\n\rnextPageToken\x18\x02 \x01(\t\"I\n\x13\x43heckoutBookRequest\x12\x0e\n\x06userId\x18\x01 \x01(\t\x12\x10\n\x08\x63opyUuid\x18\x02 \x01(\t\x12\x10\n\x08loanTime\x18\x03 \x01(\x05\"^\n\x14\x43heckoutBookResponse\x12\x0e\n\x06loanId\x18\x01 \x01(\t\x12\x0f\n\x07\x64ueDate\x18\x02 \x01(\t\x12\x11\n\tbookTitle\x18\x03 \x01(\t\x12\x12\n\nbookAuthor\x18\x04 \x01(\t\"%\n\x11ReturnBookRequest\x12\x10\n\x08\x63opyUuid\x18\x01 \x01(\t\"%\n\x12ReturnBookResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"T\n\x11\x43reateBookRequest\x12\r\n\x05title\x18\x01 \x01(\t\x12\x0e\n\x06\x61uthor\x18\x02 \x01(\t\x12\r\n\x05genre\x18\x03 \x01(\t\x12\x11\n\tcondition\x18\x04 \x01(\t\"\"\n\x12\x43reateBookResponse\x12\x0c\n\x04uuid\x18\x01 \x01(\t\"\x1e\n\x0eGetBookRequest\x12\x0c\n\x04uuid\x18\x01 \x01(\t\"6\n\x0fGetBookResponse\x12#\n\x04\x62ook\x18\x01 \x01(\x0b\x32\x15.bookservice.BookCopy\"b\n\x11UpdateBookRequest\x12\x0c\n\x04uuid\x18\x01 \x01(\t\x12\r\n\x05title\x18\x02 \x01(\t\x12\x0e\n\x06\x61uthor\x18\x03 \x01(\t\x12\r\n\x05genre\x18\x04 \x01(\t\x12\x11\n\tcondition\x18\x05 \x01(\t\"%\n\x12UpdateBookResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"!\n\x11\x44\x65leteBookRequest\x12\x0c\n\x04uuid\x18\x01 \x01(\t\"%\n\x12\x44\x65leteBookResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"9\n\x12GetAllBooksRequest\x12\x10\n\x08pageSize\x18\x01 \x01(\x05\x12\x11\n\tpageToken\x18\x02 \x01(\t\"R\n\x13GetAllBooksResponse\x12$\n\x05\x62ooks\x18\x01 \x03(\x0b\x32\x15.bookservice.BookCopy\x12\x15\n\rnextPageToken\x18\x02 \x01(\t\"\x1c\n\x1aGetInventorySummaryRequest\"b\n\x1bGetInventorySummaryResponse\x12\x12\n\ntotalBooks\x18\x01 \x01(\x05\x12\x16\n\x0e\x61vailableBooks\x18\x02 \x01(\x05\x12\x17\n\x0f\x63heckedOutBooks\x18\x03 \x01(\x05\"5\n\rBookCopyBatch\x12$\n\x05\x62ooks\x18\x01 \x03(\x0b\x32\x15.bookservice.BookCopy\"*\n\x15StreamAllBooksRequest\x12\x11\n\tbatchSize\x18\x01 \x01(\x05\"\x9e\x01\n\x17StreamSearchBookRequest\x12\x10\n\x08\x62ookName\x18\x01 \x01(\t\x12\x12\n\nbookAuthor\x18\x02 \x01(\t\x12\x11\n\tbookGenre\x18\x03 \x01(\t\x12\x11\n\tbatchSize\x18\x04 \x01(\x05\x12\x10\n\x08matchAll\x18\x05 \x01(\x08\x12%\n\x04mode\x18\x06 \x01(\x0e\x32\x17.bookservice.SearchMode\"C\n\x15\x42\x61tchCreateBookResult\x12\r\n\x05index\x18\x01 \x01(\x05\x12\x0c\n\x04uuid\x18\x02 \x01(\t\x12\r\n\x05\x65rror\x18\x03 \x01(\t\"z\n\x18\x42\x61tchCreateBooksResponse\x12\x33\n\x07results\x18\x01 \x03(\x0b\x32\".bookservice.BatchCreateBookResult\x12\x14\n\x0c\x63reatedCount\x18\x02 \x01(\x05\x12\x13\n\x0b\x66\x61iledCount\x18\x03 \x01(\x05\"%\n\x14\x42\x61tchGetBooksRequest\x12\r\n\x05uuids\x18\x01 \x03(\t\"N\n\nBookLookup\x12\x0c\n\x04uuid\x18\x01 \x01(\t\x12\r\n\x05\x66ound\x18\x02 \x01(\x08\x12#\n\x04\x62ook\x18\x03 \x01(\x0b\x32\x15.bookservice.BookCopy\"A\n\x15\x42\x61tchGetBooksResponse\x12(\n\x07results\x18\x01 \x03(\x0b\x32\x17.bookservice.BookLookup\"`\n\x13\x42ulkCheckoutRequest\x12\x0e\n\x06userId\x18\x01 \x01(\t\x12\x11\n\tcopyUuids\x18\x02 \x03(\t\x12\x10\n\x08loanTime\x18\x03 \x01(\x05\x12\x14\n\x0c\x61llOrNothing\x18\x04 \x01(\x08\"\x8e\x01\n\x12\x42ulkCheckoutResult\x12\x10\n\x08\x63opyUuid\x18\x01 \x01(\t\x12\x0f\n\x07success\x18\x02 \x01(\x08\x12\r\n\x05\x65rror\x18\x03 \x01(\t\x12\x0e\n\x06loanId\x18\x04 \x01(\t\x12\x0f\n\x07\x64ueDate\x18\x05 \x01(\t\x12\x11\n\tbookTitle\x18\x06 \x01(\t\x12\x12\n\nbookAuthor\x18\x07 \x01(\t\"Y\n\x14\x42ulkCheckoutResponse\x12\x30\n\x07results\x18\x01 \x03(\x0b\x32\x1f.bookservice.BulkCheckoutResult\x12\x0f\n\x07success\x18\x02 \x01(\x08\"<\n\x11\x42ulkReturnRequest\x12\x11\n\tcopyUuids\x18\x01 \x03(\t\x12\x14\n\x0c\x61llOrNothing\x18\x02 \x01(\x08\"D\n\x10\x42ulkReturnResult\x12\x10\n\x08\x63opyUuid\x18\x01 \x01(\t\x12\x0f\n\x07success\x18\x02 \x01(\x08\x12\r\n\x05\x65rror\x18\x03 \x01(\t\"U\n\x12\x42ulkReturnResponse\x12.\n\x07results\x18\x01 \x03(\x0b\x32\x1d.bookservice.BulkReturnResult\x12\x0f\n\x07success\x18\x02 \x01(\x08*A\n\nSearchMode\x12\x19\n\x15SEARCH_MODE_SUBSTRING\x10\x00\x12\x18\n\x14SEARCH_MODE_FULLTEXT\x10\x01\x32\xf0\t\n\x07Library\x12M\n\nSearchBook\x12\x1e.bookservice.SearchBookRequest\x1a\x1f.bookservice.SearchBookResponse\x12S\n\x0c\x43heckoutBook\x12 .bookservice.CheckoutBookRequest\x1a!.bookservice.CheckoutBookResponse\x12M\n\nReturnBook\x12\x1e.bookservice.ReturnBookRequest\x1a\x1f.bookservice.ReturnBookResponse\x12M\n\nCreateBook\x12\x1e.bookservice.CreateBookRequest\x1a\x1f.bookservice.CreateBookResponse\x12\x44\n\x07GetBook\x12\x1b.bookservice.GetBookRequest\x1a\x1c.bookservice.GetBookResponse\x12M\n\nUpdateBook\x12\x1e.bookservice.UpdateBookRequest\x1a\x1f.bookservice.UpdateBookResponse\x12M\n\nDeleteBook\x12\x1e.bookservice.DeleteBookRequest\x1a\x1f.bookservice.DeleteBookResponse\x12P\n\x0bGetAllBooks\x12\x1f.bookservice.GetAllBooksRequest\x1a .bookservice.GetAllBooksResponse\x12h\n\x13GetInventorySummary\x12\'.bookservice.GetInventorySummaryRequest\x1a(.bookservice.GetInventorySummaryResponse\x12R\n\x0eStreamAllBooks\x12\".bookservice.StreamAllBooksRequest\x1a\x1a.bookservice.BookCopyBatch0\x01\x12V\n\x10StreamSearchBook\x12$.bookservice.StreamSearchBookRequest\x1a\x1a.bookservice.BookCopyBatch0\x01\x12[\n\x10\x42\x61tchCreateBooks\x12\x1e.bookservice.CreateBookRequest\x1a%.bookservice.BatchCreateBooksResponse(\x01\x12V\n\rBatchGetBooks\x12!.bookservice.BatchGetBooksRequest\x1a\".bookservice.BatchGetBooksResponse\x12S\n\x0c\x42ulkCheckout\x12 .bookservice.BulkCheckoutRequest\x1a!.bookservice.BulkCheckoutResponse\x12M\n\nBulkReturn\x12\x1e.bookservice.BulkReturnRequest\x1a\x1f.bookservice.BulkReturnResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'proto.library_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
+  _globals['_SEARCHMODE']._serialized_start=2551
+  _globals['_SEARCHMODE']._serialized_end=2616
   _globals['_BOOKCOPY']._serialized_start=36
   _globals['_BOOKCOPY']._serialized_end=146
-  _globals['_SEARCHBOOKREQUEST']._serialized_start=148
-  _globals['_SEARCHBOOKREQUEST']._serialized_end=224
-  _globals['_SEARCHBOOKRESPONSE']._serialized_start=226
-  _globals['_SEARCHBOOKRESPONSE']._serialized_end=294
-  _globals['_CHECKOUTBOOKREQUEST']._serialized_start=296
-  _globals['_CHECKOUTBOOKREQUEST']._serialized_end=369
-  _globals['_CHECKOUTBOOKRESPONSE']._serialized_start=371
-  _globals['_CHECKOUTBOOKRESPONSE']._serialized_end=465
-  _globals['_RETURNBOOKREQUEST']._serialized_start=467
-  _globals['_RETURNBOOKREQUEST']._serialized_end=504
-  _globals['_RETURNBOOKRESPONSE']._serialized_start=506
-  _globals['_RETURNBOOKRESPONSE']._serialized_end=543
-  _globals['_CREATEBOOKREQUEST']._serialized_start=545
-  _globals['_CREATEBOOKREQUEST']._serialized_end=629
-  _globals['_CREATEBOOKRESPONSE']._serialized_start=631
-  _globals['_CREATEBOOKRESPONSE']._serialized_end=665
-  _globals['_GETBOOKREQUEST']._serialized_start=667
-  _globals['_GETBOOKREQUEST']._serialized_end=697
-  _globals['_GETBOOKRESPONSE']._serialized_start=699
-  _globals['_GETBOOKRESPONSE']._serialized_end=753
-  _globals['_UPDATEBOOKREQUEST']._serialized_start=755
-  _globals['_UPDATEBOOKREQUEST']._serialized_end=853
-  _globals['_UPDATEBOOKRESPONSE']._serialized_start=855
-  _globals['_UPDATEBOOKRESPONSE']._serialized_end=892
-  _globals['_DELETEBOOKREQUEST']._serialized_start=894
-  _globals['_DELETEBOOKREQUEST']._serialized_end=927
-  _globals['_DELETEBOOKRESPONSE']._serialized_start=929
-  _globals['_DELETEBOOKRESPONSE']._serialized_end=966
-  _globals['_GETALLBOOKSREQUEST']._serialized_start=968
-  _globals['_GETALLBOOKSREQUEST']._serialized_end=988
-  _globals['_GETALLBOOKSRESPONSE']._serialized_start=990
-  _globals['_GETALLBOOKSRESPONSE']._serialized_end=1049
-  _globals['_GETINVENTORYSUMMARYREQUEST']._serialized_start=1051
-  _globals['_GETINVENTORYSUMMARYREQUEST']._serialized_end=1079
-  _globals['_GETINVENTORYSUMMARYRESPONSE']._serialized_start=1081
-  _globals['_GETINVENTORYSUMMARYRESPONSE']._serialized_end=1179
-  _globals['_LIBRARY']._serialized_start=1182
-  _globals['_LIBRARY']._serialized_end=1929
+  _globals['_SEARCHBOOKREQUEST']._serialized_start=149
+  _globals['_SEARCHBOOKREQUEST']._serialized_end=319
+  _globals['_SEARCHBOOKRESPONSE']._serialized_start=321
+  _globals['_SEARCHBOOKRESPONSE']._serialized_end=412
+  _globals['_CHECKOUTBOOKREQUEST']._serialized_start=414
+  _globals['_CHECKOUTBOOKREQUEST']._serialized_end=487
+  _globals['_CHECKOUTBOOKRESPONSE']._serialized_start=489
+  _globals['_CHECKOUTBOOKRESPONSE']._serialized_end=583
+  _globals['_RETURNBOOKREQUEST']._serialized_start=585
+  _globals['_RETURNBOOKREQUEST']._serialized_end=622
+  _globals['_RETURNBOOKRESPONSE']._serialized_start=624
+  _globals['_RETURNBOOKRESPONSE']._serialized_end=661
+  _globals['_CREATEBOOKREQUEST']._serialized_start=663
+  _globals['_CREATEBOOKREQUEST']._serialized_end=747
+  _globals['_CREATEBOOKRESPONSE']._serialized_start=749
+  _globals['_CREATEBOOKRESPONSE']._serialized_end=783
+  _globals['_GETBOOKREQUEST']._serialized_start=785
+  _globals['_GETBOOKREQUEST']._serialized_end=815
+  _globals['_GETBOOKRESPONSE']._serialized_start=817
+  _globals['_GETBOOKRESPONSE']._serialized_end=871
+  _globals['_UPDATEBOOKREQUEST']._serialized_start=873
+  _globals['_UPDATEBOOKREQUEST']._serialized_end=971
+  _globals['_UPDATEBOOKRESPONSE']._serialized_start=973
+  _globals['_UPDATEBOOKRESPONSE']._serialized_end=1010
+  _globals['_DELETEBOOKREQUEST']._serialized_start=1012
+  _globals['_DELETEBOOKREQUEST']._serialized_end=1045
+  _globals['_DELETEBOOKRESPONSE']._serialized_start=1047
+  _globals['_DELETEBOOKRESPONSE']._serialized_end=1084
+  _globals['_GETALLBOOKSREQUEST']._serialized_start=1086
+  _globals['_GETALLBOOKSREQUEST']._serialized_end=1143
+  _globals['_GETALLBOOKSRESPONSE']._serialized_start=1145
+  _globals['_GETALLBOOKSRESPONSE']._serialized_end=1227
+  _globals['_GETINVENTORYSUMMARYREQUEST']._serialized_start=1229
+  _globals['_GETINVENTORYSUMMARYREQUEST']._serialized_end=1257
+  _globals['_GETINVENTORYSUMMARYRESPONSE']._serialized_start=1259
+  _globals['_GETINVENTORYSUMMARYRESPONSE']._serialized_end=1357
+  _globals['_BOOKCOPYBATCH']._serialized_start=1359
+  _globals['_BOOKCOPYBATCH']._serialized_end=1412
+  _globals['_STREAMALLBOOKSREQUEST']._serialized_start=1414
+  _globals['_STREAMALLBOOKSREQUEST']._serialized_end=1456
+  _globals['_STREAMSEARCHBOOKREQUEST']._serialized_start=1459
+  _globals['_STREAMSEARCHBOOKREQUEST']._serialized_end=1617
+  _globals['_BATCHCREATEBOOKRESULT']._serialized_start=1619
+  _globals['_BATCHCREATEBOOKRESULT']._serialized_end=1686
+  _globals['_BATCHCREATEBOOKSRESPONSE']._serialized_start=1688
+  _globals['_BATCHCREATEBOOKSRESPONSE']._serialized_end=1810
+  _globals['_BATCHGETBOOKSREQUEST']._serialized_start=1812
+  _globals['_BATCHGETBOOKSREQUEST']._serialized_end=1849
+  _globals['_BOOKLOOKUP']._serialized_start=1851
+  _globals['_BOOKLOOKUP']._serialized_end=1929
+  _globals['_BATCHGETBOOKSRESPONSE']._serialized_start=1931
+  _globals['_BATCHGETBOOKSRESPONSE']._serialized_end=1996
+  _globals['_BULKCHECKOUTREQUEST']._serialized_start=1998
+  _globals['_BULKCHECKOUTREQUEST']._serialized_end=2094
+  _globals['_BULKCHECKOUTRESULT']._serialized_start=2097
+  _globals['_BULKCHECKOUTRESULT']._serialized_end=2239
+  _globals['_BULKCHECKOUTRESPONSE']._serialized_start=2241
+  _globals['_BULKCHECKOUTRESPONSE']._serialized_end=2330
+  _globals['_BULKRETURNREQUEST']._serialized_start=2332
+  _globals['_BULKRETURNREQUEST']._serialized_end=2392
+  _globals['_BULKRETURNRESULT']._serialized_start=2394
+  _globals['_BULKRETURNRESULT']._serialized_end=2462
+  _globals['_BULKRETURNRESPONSE']._serialized_start=2464
+  _globals['_BULKRETURNRESPONSE']._serialized_end=2549
+  _globals['_LIBRARY']._serialized_start=2619
+  _globals['_LIBRARY']._serialized_end=3883
 # @@protoc_insertion_point(module_scope)
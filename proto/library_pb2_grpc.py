@@ -79,6 +79,36 @@ class LibraryStub(object):
                 request_serializer=proto_dot_library__pb2.GetInventorySummaryRequest.SerializeToString,
                 response_deserializer=proto_dot_library__pb2.GetInventorySummaryResponse.FromString,
                 _registered_method=True)
+        self.StreamAllBooks = channel.unary_stream(
+                '/bookservice.Library/StreamAllBooks',
+                request_serializer=proto_dot_library__pb2.StreamAllBooksRequest.SerializeToString,
+                response_deserializer=proto_dot_library__pb2.BookCopyBatch.FromString,
+                _registered_method=True)
+        self.StreamSearchBook = channel.unary_stream(
+                '/bookservice.Library/StreamSearchBook',
+                request_serializer=proto_dot_library__pb2.StreamSearchBookRequest.SerializeToString,
+                response_deserializer=proto_dot_library__pb2.BookCopyBatch.FromString,
+                _registered_method=True)
+        self.BatchCreateBooks = channel.stream_unary(
+                '/bookservice.Library/BatchCreateBooks',
+                request_serializer=proto_dot_library__pb2.CreateBookRequest.SerializeToString,
+                response_deserializer=proto_dot_library__pb2.BatchCreateBooksResponse.FromString,
+                _registered_method=True)
+        self.BatchGetBooks = channel.unary_unary(
+                '/bookservice.Library/BatchGetBooks',
+                request_serializer=proto_dot_library__pb2.BatchGetBooksRequest.SerializeToString,
+                response_deserializer=proto_dot_library__pb2.BatchGetBooksResponse.FromString,
+                _registered_method=True)
+        self.BulkCheckout = channel.unary_unary(
+                '/bookservice.Library/BulkCheckout',
+                request_serializer=proto_dot_library__pb2.BulkCheckoutRequest.SerializeToString,
+                response_deserializer=proto_dot_library__pb2.BulkCheckoutResponse.FromString,
+                _registered_method=True)
+        self.BulkReturn = channel.unary_unary(
+                '/bookservice.Library/BulkReturn',
+                request_serializer=proto_dot_library__pb2.BulkReturnRequest.SerializeToString,
+                response_deserializer=proto_dot_library__pb2.BulkReturnResponse.FromString,
+                _registered_method=True)
 
 
 class LibraryServicer(object):
@@ -138,6 +168,42 @@ class LibraryServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def StreamAllBooks(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def StreamSearchBook(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def BatchCreateBooks(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def BatchGetBooks(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def BulkCheckout(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def BulkReturn(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_LibraryServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -186,6 +252,36 @@ def add_LibraryServicer_to_server(servicer, server):
                     request_deserializer=proto_dot_library__pb2.GetInventorySummaryRequest.FromString,
                     response_serializer=proto_dot_library__pb2.GetInventorySummaryResponse.SerializeToString,
             ),
+            'StreamAllBooks': grpc.unary_stream_rpc_method_handler(
+                    servicer.StreamAllBooks,
+                    request_deserializer=proto_dot_library__pb2.StreamAllBooksRequest.FromString,
+                    response_serializer=proto_dot_library__pb2.BookCopyBatch.SerializeToString,
+            ),
+            'StreamSearchBook': grpc.unary_stream_rpc_method_handler(
+                    servicer.StreamSearchBook,
+                    request_deserializer=proto_dot_library__pb2.StreamSearchBookRequest.FromString,
+                    response_serializer=proto_dot_library__pb2.BookCopyBatch.SerializeToString,
+            ),
+            'BatchCreateBooks': grpc.stream_unary_rpc_method_handler(
+                    servicer.BatchCreateBooks,
+                    request_deserializer=proto_dot_library__pb2.CreateBookRequest.FromString,
+                    response_serializer=proto_dot_library__pb2.BatchCreateBooksResponse.SerializeToString,
+            ),
+            'BatchGetBooks': grpc.unary_unary_rpc_method_handler(
+                    servicer.BatchGetBooks,
+                    request_deserializer=proto_dot_library__pb2.BatchGetBooksRequest.FromString,
+                    response_serializer=proto_dot_library__pb2.BatchGetBooksResponse.SerializeToString,
+            ),
+            'BulkCheckout': grpc.unary_unary_rpc_method_handler(
+                    servicer.BulkCheckout,
+                    request_deserializer=proto_dot_library__pb2.BulkCheckoutRequest.FromString,
+                    response_serializer=proto_dot_library__pb2.BulkCheckoutResponse.SerializeToString,
+            ),
+            'BulkReturn': grpc.unary_unary_rpc_method_handler(
+                    servicer.BulkReturn,
+                    request_deserializer=proto_dot_library__pb2.BulkReturnRequest.FromString,
+                    response_serializer=proto_dot_library__pb2.BulkReturnResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'bookservice.Library', rpc_method_handlers)
@@ -439,3 +535,165 @@ class Library(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def StreamAllBooks(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/bookservice.Library/StreamAllBooks',
+            proto_dot_library__pb2.StreamAllBooksRequest.SerializeToString,
+            proto_dot_library__pb2.BookCopyBatch.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def StreamSearchBook(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/bookservice.Library/StreamSearchBook',
+            proto_dot_library__pb2.StreamSearchBookRequest.SerializeToString,
+            proto_dot_library__pb2.BookCopyBatch.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def BatchCreateBooks(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            '/bookservice.Library/BatchCreateBooks',
+            proto_dot_library__pb2.CreateBookRequest.SerializeToString,
+            proto_dot_library__pb2.BatchCreateBooksResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def BatchGetBooks(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/bookservice.Library/BatchGetBooks',
+            proto_dot_library__pb2.BatchGetBooksRequest.SerializeToString,
+            proto_dot_library__pb2.BatchGetBooksResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def BulkCheckout(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/bookservice.Library/BulkCheckout',
+            proto_dot_library__pb2.BulkCheckoutRequest.SerializeToString,
+            proto_dot_library__pb2.BulkCheckoutResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def BulkReturn(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/bookservice.Library/BulkReturn',
+            proto_dot_library__pb2.BulkReturnRequest.SerializeToString,
+            proto_dot_library__pb2.BulkReturnResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -1,4 +1,41 @@
-from .book_repository import IBookRepository, BookRepository
-from .database import connect_db
-
-__all__ = ['IBookRepository', 'BookRepository', 'connect_db']
+from .book_repository import IBookRepository, BookRepository, QUERY_TEMPLATES
+from .async_book_repository import IAsyncBookRepository, ExecutorBookRepository
+from .memory_book_repository import InMemoryBookRepository, parse_sql_rows, read_sql_dump
+from .sqlite_book_repository import SqliteBookRepository
+from .delegating_book_repository import DelegatingBookRepository
+from .caching_book_repository import CachingBookRepository
+from .search_caching_book_repository import SearchCachingBookRepository, estimate_book_rows_size
+from .catalog_version import CatalogVersion, SharedCatalogVersion
+from .cache import LRUCache
+from .database import connect_db, create_pool, ConnectionPool, PoolTimeoutError, PoolClosedError
+from .group_commit import GroupCommitWriter, GroupCommitClosedError, create_group_commit_writer
+from .statement_cache import StatementCache, create_statement_cache
+
+__all__ = [
+    'IBookRepository',
+    'BookRepository',
+    'QUERY_TEMPLATES',
+    'IAsyncBookRepository',
+    'ExecutorBookRepository',
+    'InMemoryBookRepository',
+    'parse_sql_rows',
+    'read_sql_dump',
+    'SqliteBookRepository',
+    'DelegatingBookRepository',
+    'CachingBookRepository',
+    'SearchCachingBookRepository',
+    'estimate_book_rows_size',
+    'CatalogVersion',
+    'SharedCatalogVersion',
+    'LRUCache',
+    'connect_db',
+    'create_pool',
+    'ConnectionPool',
+    'PoolTimeoutError',
+    'PoolClosedError',
+    'GroupCommitWriter',
+    'GroupCommitClosedError',
+    'create_group_commit_writer',
+    'StatementCache',
+    'create_statement_cache'
+]
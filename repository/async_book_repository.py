@@ -0,0 +1,173 @@
+import asyncio
+import contextvars
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor
+from typing import AsyncIterator, Iterator, List, Optional
+from models.book import AvailabilityChange, Book, BookRow, CreateBookResult, SearchCriteria
+from .book_repository import IBookRepository
+
+
+class IAsyncBookRepository(ABC):
+
+    @abstractmethod
+    async def search_books(self, criteria: SearchCriteria) -> List[Book]:
+        pass
+
+    @abstractmethod
+    async def search_book_rows(self, criteria: SearchCriteria) -> List[BookRow]:
+        pass
+
+    @abstractmethod
+    async def get_book_by_uuid(self, uuid: str) -> Book:
+        pass
+
+    @abstractmethod
+    async def get_books_by_uuids(self, uuids: List[str]) -> List[Optional[Book]]:
+        pass
+
+    @abstractmethod
+    async def create_book(self, book: Book) -> str:
+        pass
+
+    @abstractmethod
+    async def create_books(self, books: List[Book]) -> List[CreateBookResult]:
+        pass
+
+    @abstractmethod
+    async def update_book(self, book: Book) -> bool:
+        pass
+
+    @abstractmethod
+    async def checkout_book(self, uuid: str) -> AvailabilityChange:
+        pass
+
+    @abstractmethod
+    async def return_book(self, uuid: str) -> AvailabilityChange:
+        pass
+
+    @abstractmethod
+    async def checkout_books(self, uuids: List[str], all_or_nothing: bool = False) -> List[AvailabilityChange]:
+        pass
+
+    @abstractmethod
+    async def return_books(self, uuids: List[str], all_or_nothing: bool = False) -> List[AvailabilityChange]:
+        pass
+
+    @abstractmethod
+    async def delete_book(self, uuid: str) -> bool:
+        pass
+
+    @abstractmethod
+    async def get_all_books(self) -> List[Book]:
+        pass
+
+    @abstractmethod
+    async def get_all_book_rows(self) -> List[BookRow]:
+        pass
+
+    @abstractmethod
+    async def get_books_page(self, after_uuid: str, limit: int) -> List[Book]:
+        pass
+
+    @abstractmethod
+    async def get_book_rows_page(self, after_uuid: str, limit: int) -> List[BookRow]:
+        pass
+
+    @abstractmethod
+    async def get_inventory_summary(self) -> dict:
+        pass
+
+    @abstractmethod
+    def iter_all_books(self, batch_size: int) -> AsyncIterator[List[Book]]:
+        pass
+
+    @abstractmethod
+    def iter_search_books(self, criteria: SearchCriteria, batch_size: int) -> AsyncIterator[List[Book]]:
+        pass
+
+
+class ExecutorBookRepository(IAsyncBookRepository):
+
+    def __init__(self, repository: IBookRepository, executor: Executor):
+        self._repository = repository
+        self._executor = executor
+
+    async def _run(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, contextvars.copy_context().run, fn, *args)
+
+    async def search_books(self, criteria: SearchCriteria) -> List[Book]:
+        return await self._run(self._repository.search_books, criteria)
+
+    async def search_book_rows(self, criteria: SearchCriteria) -> List[BookRow]:
+        return await self._run(self._repository.search_book_rows, criteria)
+
+    async def get_book_by_uuid(self, uuid: str) -> Book:
+        return await self._run(self._repository.get_book_by_uuid, uuid)
+
+    async def get_books_by_uuids(self, uuids: List[str]) -> List[Optional[Book]]:
+        return await self._run(self._repository.get_books_by_uuids, uuids)
+
+    async def create_book(self, book: Book) -> str:
+        return await self._run(self._repository.create_book, book)
+
+    async def create_books(self, books: List[Book]) -> List[CreateBookResult]:
+        return await self._run(self._repository.create_books, books)
+
+    async def update_book(self, book: Book) -> bool:
+        return await self._run(self._repository.update_book, book)
+
+    async def checkout_book(self, uuid: str) -> AvailabilityChange:
+        return await self._run(self._repository.checkout_book, uuid)
+
+    async def return_book(self, uuid: str) -> AvailabilityChange:
+        return await self._run(self._repository.return_book, uuid)
+
+    async def checkout_books(self, uuids: List[str], all_or_nothing: bool = False) -> List[AvailabilityChange]:
+        return await self._run(self._repository.checkout_books, uuids, all_or_nothing)
+
+    async def return_books(self, uuids: List[str], all_or_nothing: bool = False) -> List[AvailabilityChange]:
+        return await self._run(self._repository.return_books, uuids, all_or_nothing)
+
+    async def delete_book(self, uuid: str) -> bool:
+        return await self._run(self._repository.delete_book, uuid)
+
+    async def get_all_books(self) -> List[Book]:
+        return await self._run(self._repository.get_all_books)
+
+    async def get_all_book_rows(self) -> List[BookRow]:
+        return await self._run(self._repository.get_all_book_rows)
+
+    async def get_books_page(self, after_uuid: str, limit: int) -> List[Book]:
+        return await self._run(self._repository.get_books_page, after_uuid, limit)
+
+    async def get_book_rows_page(self, after_uuid: str, limit: int) -> List[BookRow]:
+        return await self._run(self._repository.get_book_rows_page, after_uuid, limit)
+
+    async def get_inventory_summary(self) -> dict:
+        return await self._run(self._repository.get_inventory_summary)
+
+    def iter_all_books(self, batch_size: int) -> AsyncIterator[List[Book]]:
+        return self._iterate(self._repository.iter_all_books(batch_size))
+
+    def iter_search_books(self, criteria: SearchCriteria, batch_size: int) -> AsyncIterator[List[Book]]:
+        return self._iterate(self._repository.iter_search_books(criteria, batch_size))
+
+    async def _iterate(self, batches: Iterator[List[Book]]) -> AsyncIterator[List[Book]]:
+        pending = None
+        try:
+            while True:
+                pending = asyncio.ensure_future(self._run(next, batches, None))
+                batch = await asyncio.shield(pending)
+                pending = None
+                if batch is None:
+                    break
+                yield batch
+        finally:
+            if pending is not None:
+                await asyncio.wait([pending])
+                if not pending.cancelled():
+                    pending.exception()
+            close = getattr(batches, 'close', None)
+            if close:
+                await self._run(close)
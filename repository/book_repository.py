@@ -1,60 +1,169 @@
+import random
 from abc import ABC, abstractmethod
-from typing import List
-from models.book import Book
-from .database import connect_db
+from typing import Callable, Iterator, List, Optional, Tuple
+import mysql.connector
+from metrics import InstrumentedCursor, QueryMetrics, QueryNames
+from models.book import AvailabilityChange, AvailabilityStatus, Book, BookRow, CreateBookResult, SearchCriteria, SearchMode
+from profiling import SlowQueryCursor, SlowQueryLog
+from tracing import TracedCursor
+from .catalog_version import CatalogVersion
+from .database import ConnectionPool
+from .group_commit import GroupCommitWriter
+from .statement_cache import StatementCache
 
 
-SEARCH_BY_TITLE_QUERY = "SELECT uuid, title, author, genre, is_available, book_condition FROM book_copies WHERE title LIKE %s"
-SEARCH_BY_AUTHOR_QUERY = "SELECT uuid, title, author, genre, is_available, book_condition FROM book_copies WHERE author LIKE %s"
-SEARCH_BY_GENRE_QUERY = "SELECT uuid, title, author, genre, is_available, book_condition FROM book_copies WHERE genre LIKE %s"
+SELECT_BOOKS_QUERY = "SELECT uuid, title, author, genre, is_available, book_condition FROM book_copies"
 GET_BY_UUID_QUERY = "SELECT uuid, title, author, genre, is_available, book_condition FROM book_copies WHERE uuid = %s"
+GET_BY_UUIDS_QUERY = "SELECT uuid, title, author, genre, is_available, book_condition FROM book_copies WHERE uuid IN ({placeholders})"
 INSERT_BOOK_QUERY = "INSERT INTO book_copies (uuid, title, author, genre, is_available, book_condition) VALUES (%s, %s, %s, %s, %s, %s)"
-UPDATE_BOOK_QUERY = "UPDATE book_copies SET title = %s, author = %s, genre = %s, is_available = %s, book_condition = %s WHERE uuid = %s"
+CREATE_BOOKS_SAVEPOINT_QUERY = "SAVEPOINT create_books"
+ROLLBACK_TO_CREATE_BOOKS_SAVEPOINT_QUERY = "ROLLBACK TO SAVEPOINT create_books"
+UPDATE_BOOK_QUERY = "UPDATE book_copies SET title = %s, author = %s, genre = %s, book_condition = %s WHERE uuid = %s"
 CHECKOUT_BOOK_QUERY = "UPDATE book_copies SET is_available = FALSE WHERE uuid = %s AND is_available = TRUE"
 RETURN_BOOK_QUERY = "UPDATE book_copies SET is_available = TRUE WHERE uuid = %s AND is_available = FALSE"
 DELETE_BOOK_QUERY = "DELETE FROM book_copies WHERE uuid = %s"
+LOCK_AVAILABILITY_QUERY = "SELECT is_available FROM book_copies WHERE uuid = %s FOR UPDATE"
+LOCK_BOOK_QUERY = GET_BY_UUID_QUERY + " FOR UPDATE"
+LOCK_BOOKS_QUERY = GET_BY_UUIDS_QUERY + " FOR UPDATE"
+CHECKOUT_BOOKS_QUERY = "UPDATE book_copies SET is_available = FALSE WHERE uuid IN ({placeholders}) AND is_available = TRUE"
+RETURN_BOOKS_QUERY = "UPDATE book_copies SET is_available = TRUE WHERE uuid IN ({placeholders}) AND is_available = FALSE"
 GET_ALL_BOOKS_QUERY = "SELECT uuid, title, author, genre, is_available, book_condition FROM book_copies"
-INVENTORY_SUMMARY_QUERY = """
+GET_FIRST_BOOKS_PAGE_QUERY = "SELECT uuid, title, author, genre, is_available, book_condition FROM book_copies ORDER BY uuid LIMIT %s"
+GET_BOOKS_PAGE_QUERY = "SELECT uuid, title, author, genre, is_available, book_condition FROM book_copies WHERE uuid > %s ORDER BY uuid LIMIT %s"
+SEARCH_BOOKS_QUERY = SELECT_BOOKS_QUERY + " WHERE {conditions} ORDER BY uuid"
+FULLTEXT_SEARCH_BOOKS_QUERY = SELECT_BOOKS_QUERY + " WHERE {conditions} ORDER BY ({relevance}) DESC, uuid"
+FULLTEXT_MATCH = "MATCH({column}) AGAINST (%s IN NATURAL LANGUAGE MODE)"
+CREATE_INVENTORY_COUNTERS_QUERY = """
+    CREATE TABLE IF NOT EXISTS inventory_counters (
+        slot TINYINT UNSIGNED PRIMARY KEY,
+        total_books INT NOT NULL DEFAULT 0,
+        available_books INT NOT NULL DEFAULT 0
+    )
+"""
+INSERT_INVENTORY_SLOTS_QUERY = "INSERT IGNORE INTO inventory_counters (slot) VALUES {slots}"
+INVENTORY_SUMMARY_QUERY = "SELECT COALESCE(SUM(total_books), 0), COALESCE(SUM(available_books), 0) FROM inventory_counters"
+ADJUST_INVENTORY_QUERY = "UPDATE inventory_counters SET total_books = total_books + %s, available_books = available_books + %s WHERE slot = %s"
+LOCK_INVENTORY_COUNTERS_QUERY = "SELECT slot FROM inventory_counters FOR UPDATE"
+RECOUNT_INVENTORY_QUERY = """
     SELECT
         COUNT(*) as total_books,
-        SUM(CASE WHEN is_available = TRUE THEN 1 ELSE 0 END) as available_books,
-        SUM(CASE WHEN is_available = FALSE THEN 1 ELSE 0 END) as checked_out_books
+        SUM(CASE WHEN is_available = TRUE THEN 1 ELSE 0 END) as available_books
     FROM book_copies
 """
+RESET_INVENTORY_COUNTERS_QUERY = "UPDATE inventory_counters SET total_books = 0, available_books = 0"
+SET_INVENTORY_COUNTER_QUERY = "UPDATE inventory_counters SET total_books = %s, available_books = %s WHERE slot = %s"
+
+INVENTORY_COUNTER_SLOTS = 16
+MAX_UUIDS_PER_QUERY = 500
+
+QUERY_TEMPLATES = {
+    name: query
+    for name, query in globals().items()
+    if name.endswith('_QUERY') and isinstance(query, str) and name != 'SELECT_BOOKS_QUERY'
+}
+
+
+def escape_like(term: str) -> str:
+    return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def build_search_query(criteria: SearchCriteria) -> Tuple[str, tuple]:
+    fields = [
+        (column, term)
+        for column, term in (('title', criteria.title), ('author', criteria.author), ('genre', criteria.genre))
+        if term
+    ]
+
+    if criteria.mode == SearchMode.FULLTEXT:
+        terms = [FULLTEXT_MATCH.format(column=column) for column, _ in fields]
+        params = [term for _, term in fields]
+    else:
+        terms = [f"{column} LIKE %s" for column, _ in fields]
+        params = [f"%{escape_like(term)}%" for _, term in fields]
+
+    conditions = f"({(' AND ' if criteria.match_all else ' OR ').join(terms)})"
+    if criteria.after_uuid is not None:
+        conditions += " AND uuid > %s"
+        params.append(criteria.after_uuid)
+
+    if criteria.mode == SearchMode.FULLTEXT:
+        query = FULLTEXT_SEARCH_BOOKS_QUERY.format(conditions=conditions, relevance=' + '.join(terms))
+        params.extend(term for _, term in fields)
+    else:
+        query = SEARCH_BOOKS_QUERY.format(conditions=conditions)
+
+    if criteria.limit is not None:
+        query += " LIMIT %s"
+        params.append(criteria.limit)
+        if criteria.offset:
+            query += " OFFSET %s"
+            params.append(criteria.offset)
+
+    return query, tuple(params)
+
+
+def availability_change(row: Optional[tuple], is_available: bool) -> AvailabilityChange:
+    if row is None:
+        return AvailabilityChange(status=AvailabilityStatus.NOT_FOUND)
+
+    book = Book(*row)
+    if bool(book.is_available) == is_available:
+        status = AvailabilityStatus.ALREADY_AVAILABLE if is_available else AvailabilityStatus.ALREADY_CHECKED_OUT
+        return AvailabilityChange(status=status, book=book)
+
+    book.is_available = is_available
+    return AvailabilityChange(status=AvailabilityStatus.UPDATED, book=book)
 
 
 class IBookRepository(ABC):
 
+    @property
     @abstractmethod
-    def search_books_by_title(self, title: str) -> List[Book]:
+    def catalog_version(self) -> CatalogVersion:
         pass
 
     @abstractmethod
-    def search_books_by_author(self, author: str) -> List[Book]:
+    def search_books(self, criteria: SearchCriteria) -> List[Book]:
         pass
 
     @abstractmethod
-    def search_books_by_genre(self, genre: str) -> List[Book]:
+    def search_book_rows(self, criteria: SearchCriteria) -> List[BookRow]:
         pass
 
     @abstractmethod
     def get_book_by_uuid(self, uuid: str) -> Book:
         pass
 
+    @abstractmethod
+    def get_books_by_uuids(self, uuids: List[str]) -> List[Optional[Book]]:
+        pass
+
     @abstractmethod
     def create_book(self, book: Book) -> str:
         pass
 
+    @abstractmethod
+    def create_books(self, books: List[Book]) -> List[CreateBookResult]:
+        pass
+
     @abstractmethod
     def update_book(self, book: Book) -> bool:
         pass
 
     @abstractmethod
-    def checkout_book(self, uuid: str) -> bool:
+    def checkout_book(self, uuid: str) -> AvailabilityChange:
+        pass
+
+    @abstractmethod
+    def return_book(self, uuid: str) -> AvailabilityChange:
+        pass
+
+    @abstractmethod
+    def checkout_books(self, uuids: List[str], all_or_nothing: bool = False) -> List[AvailabilityChange]:
         pass
 
     @abstractmethod
-    def return_book(self, uuid: str) -> bool:
+    def return_books(self, uuids: List[str], all_or_nothing: bool = False) -> List[AvailabilityChange]:
         pass
 
     @abstractmethod
@@ -65,104 +174,364 @@ class IBookRepository(ABC):
     def get_all_books(self) -> List[Book]:
         pass
 
+    @abstractmethod
+    def get_all_book_rows(self) -> List[BookRow]:
+        pass
+
+    @abstractmethod
+    def get_books_page(self, after_uuid: str, limit: int) -> List[Book]:
+        pass
+
+    @abstractmethod
+    def get_book_rows_page(self, after_uuid: str, limit: int) -> List[BookRow]:
+        pass
+
     @abstractmethod
     def get_inventory_summary(self) -> dict:
         pass
 
+    @abstractmethod
+    def iter_all_books(self, batch_size: int) -> Iterator[List[Book]]:
+        pass
+
+    @abstractmethod
+    def iter_search_books(self, criteria: SearchCriteria, batch_size: int) -> Iterator[List[Book]]:
+        pass
+
 
 class BookRepository(IBookRepository):
 
-    def __init__(self, db):
-        self._db = db
+    def __init__(self, pool: ConnectionPool, catalog_version: CatalogVersion = None,
+                 writer: GroupCommitWriter = None, statements: StatementCache = None,
+                 queries: QueryMetrics = None, trace_queries: bool = False, slow_queries: SlowQueryLog = None):
+        self._pool = pool
+        self._catalog_version = catalog_version or CatalogVersion()
+        self._writer = writer
+        self._statements = statements
+        self._queries = queries
+        self._trace_queries = trace_queries
+        self._slow_queries = slow_queries
+        self._query_names = QueryNames(QUERY_TEMPLATES) if trace_queries or slow_queries else None
+        if slow_queries is not None:
+            slow_queries.set_explainer(self.explain)
 
-    def search_books_by_title(self, title: str) -> List[Book]:
-        cursor = self._db.cursor()
-        cursor.execute(SEARCH_BY_TITLE_QUERY, (f"%{title}%",))
-        rows = cursor.fetchall()
-        cursor.close()
-        return [Book(*row) for row in rows]
+    @property
+    def catalog_version(self) -> CatalogVersion:
+        return self._catalog_version
 
-    def search_books_by_author(self, author: str) -> List[Book]:
-        cursor = self._db.cursor()
-        cursor.execute(SEARCH_BY_AUTHOR_QUERY, (f"%{author}%",))
-        rows = cursor.fetchall()
-        cursor.close()
-        return [Book(*row) for row in rows]
+    def search_books(self, criteria: SearchCriteria) -> List[Book]:
+        return [Book(*row) for row in self.search_book_rows(criteria)]
 
-    def search_books_by_genre(self, genre: str) -> List[Book]:
-        cursor = self._db.cursor()
-        cursor.execute(SEARCH_BY_GENRE_QUERY, (f"%{genre}%",))
-        rows = cursor.fetchall()
-        cursor.close()
-        return [Book(*row) for row in rows]
+    def search_book_rows(self, criteria: SearchCriteria) -> List[BookRow]:
+        if criteria.is_empty():
+            return []
+
+        query, params = build_search_query(criteria)
+        with self._pool.connection() as db:
+            cursor = self._instrument(db.cursor())
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+            cursor.close()
+        return rows
 
     def get_book_by_uuid(self, uuid: str) -> Book:
-        cursor = self._db.cursor()
-        cursor.execute(GET_BY_UUID_QUERY, (uuid,))
-        row = cursor.fetchone()
-        cursor.close()
+        with self._pool.connection() as db:
+            cursor = self._cursor(db)
+            cursor.execute(GET_BY_UUID_QUERY, (uuid,))
+            row = cursor.fetchone()
+            cursor.close()
         return Book(*row) if row else None
 
+    def get_books_by_uuids(self, uuids: List[str]) -> List[Optional[Book]]:
+        unique_uuids = list(dict.fromkeys(uuids))
+        if not unique_uuids:
+            return []
+
+        books = {}
+        with self._pool.connection() as db:
+            cursor = self._instrument(db.cursor())
+            for start in range(0, len(unique_uuids), MAX_UUIDS_PER_QUERY):
+                chunk = unique_uuids[start:start + MAX_UUIDS_PER_QUERY]
+                cursor.execute(GET_BY_UUIDS_QUERY.format(placeholders=', '.join(['%s'] * len(chunk))), tuple(chunk))
+                for row in cursor.fetchall():
+                    books[row[0]] = Book(*row)
+            cursor.close()
+        return [books.get(uuid) for uuid in uuids]
+
     def create_book(self, book: Book) -> str:
-        cursor = self._db.cursor()
-        cursor.execute(INSERT_BOOK_QUERY, book.get_tuple())
-        self._db.commit()
-        cursor.close()
+        self._write(self._insert_and_count, book)
+        self._catalog_version.bump()
         return book.uuid
 
+    def _insert_and_count(self, cursor, book: Book):
+        cursor.execute(INSERT_BOOK_QUERY, book.get_tuple())
+        self._adjust_inventory(cursor, 1, 1 if book.is_available else 0)
+
+    def create_books(self, books: List[Book]) -> List[CreateBookResult]:
+        if not books:
+            return []
+
+        results = self._write(self._insert_books, books, prepared=False)
+        if any(result.error is None for result in results):
+            self._catalog_version.bump()
+        return results
+
+    def _insert_books(self, cursor, books: List[Book]) -> List[CreateBookResult]:
+        cursor.execute(CREATE_BOOKS_SAVEPOINT_QUERY)
+        try:
+            cursor.executemany(INSERT_BOOK_QUERY, [book.get_tuple() for book in books])
+            results = [CreateBookResult(uuid=book.uuid) for book in books]
+        except mysql.connector.IntegrityError:
+            cursor.execute(ROLLBACK_TO_CREATE_BOOKS_SAVEPOINT_QUERY)
+            results = [self._insert_book(cursor, book) for book in books]
+
+        created = [book for book, result in zip(books, results) if result.error is None]
+        if created:
+            self._adjust_inventory(cursor, len(created), sum(1 for book in created if book.is_available))
+        return results
+
+    @staticmethod
+    def _insert_book(cursor, book: Book) -> CreateBookResult:
+        try:
+            cursor.execute(INSERT_BOOK_QUERY, book.get_tuple())
+        except mysql.connector.IntegrityError as e:
+            return CreateBookResult(uuid=None, error=e.msg)
+        return CreateBookResult(uuid=book.uuid)
+
     def update_book(self, book: Book) -> bool:
-        cursor = self._db.cursor()
+        rows_affected = self._write(self._update, book)
+        if rows_affected > 0:
+            self._catalog_version.bump()
+        return rows_affected > 0
+
+    @staticmethod
+    def _update(cursor, book: Book) -> int:
         cursor.execute(UPDATE_BOOK_QUERY, (
             book.title,
             book.author,
             book.genre,
-            book.is_available,
             book.book_condition,
             book.uuid
         ))
-        self._db.commit()
-        rows_affected = cursor.rowcount
-        cursor.close()
-        return rows_affected > 0
+        return cursor.rowcount
 
-    def checkout_book(self, uuid: str) -> bool:
-        cursor = self._db.cursor()
-        cursor.execute(CHECKOUT_BOOK_QUERY, (uuid,))
-        self._db.commit()
-        rows_affected = cursor.rowcount
-        cursor.close()
-        return rows_affected > 0
+    def checkout_book(self, uuid: str) -> AvailabilityChange:
+        return self._change_availability(uuid, False)
 
-    def return_book(self, uuid: str) -> bool:
-        cursor = self._db.cursor()
-        cursor.execute(RETURN_BOOK_QUERY, (uuid,))
-        self._db.commit()
-        rows_affected = cursor.rowcount
-        cursor.close()
-        return rows_affected > 0
+    def return_book(self, uuid: str) -> AvailabilityChange:
+        return self._change_availability(uuid, True)
+
+    def _change_availability(self, uuid: str, is_available: bool) -> AvailabilityChange:
+        change = self._write(self._apply_availability, uuid, is_available)
+        if change.status == AvailabilityStatus.UPDATED:
+            self._catalog_version.bump()
+        return change
+
+    def _apply_availability(self, cursor, uuid: str, is_available: bool) -> AvailabilityChange:
+        cursor.execute(LOCK_BOOK_QUERY, (uuid,))
+        change = availability_change(cursor.fetchone(), is_available)
+
+        if change.status == AvailabilityStatus.UPDATED:
+            cursor.execute(RETURN_BOOK_QUERY if is_available else CHECKOUT_BOOK_QUERY, (uuid,))
+            self._adjust_inventory(cursor, 0, 1 if is_available else -1)
+        return change
+
+    def checkout_books(self, uuids: List[str], all_or_nothing: bool = False) -> List[AvailabilityChange]:
+        return self._change_availabilities(uuids, False, all_or_nothing)
+
+    def return_books(self, uuids: List[str], all_or_nothing: bool = False) -> List[AvailabilityChange]:
+        return self._change_availabilities(uuids, True, all_or_nothing)
+
+    def _change_availabilities(self, uuids: List[str], is_available: bool, all_or_nothing: bool) -> List[AvailabilityChange]:
+        unique_uuids = list(dict.fromkeys(uuids))
+        if not unique_uuids:
+            return []
+
+        changes = self._write(self._apply_availabilities, unique_uuids, is_available, all_or_nothing)
+        if any(change.status == AvailabilityStatus.UPDATED for change in changes.values()):
+            self._catalog_version.bump()
+        return [changes[uuid] for uuid in uuids]
+
+    def _apply_availabilities(self, cursor, uuids: List[str], is_available: bool, all_or_nothing: bool) -> dict:
+        cursor.execute(LOCK_BOOKS_QUERY.format(placeholders=', '.join(['%s'] * len(uuids))), tuple(uuids))
+        rows = {row[0]: row for row in cursor.fetchall()}
+
+        changes = {uuid: availability_change(rows.get(uuid), is_available) for uuid in uuids}
+        eligible = [uuid for uuid in uuids if changes[uuid].status == AvailabilityStatus.UPDATED]
+        if all_or_nothing and len(eligible) < len(uuids):
+            for uuid in eligible:
+                changes[uuid] = AvailabilityChange(status=AvailabilityStatus.ABORTED, book=Book(*rows[uuid]))
+            eligible = []
+
+        if eligible:
+            query = RETURN_BOOKS_QUERY if is_available else CHECKOUT_BOOKS_QUERY
+            cursor.execute(query.format(placeholders=', '.join(['%s'] * len(eligible))), tuple(eligible))
+            self._adjust_inventory(cursor, 0, len(eligible) if is_available else -len(eligible))
+        return changes
 
     def delete_book(self, uuid: str) -> bool:
-        cursor = self._db.cursor()
+        rows_affected = self._write(self._delete, uuid)
+        if rows_affected > 0:
+            self._catalog_version.bump()
+        return rows_affected > 0
+
+    def _delete(self, cursor, uuid: str) -> int:
+        cursor.execute(LOCK_AVAILABILITY_QUERY, (uuid,))
+        row = cursor.fetchone()
+        if not row:
+            return 0
+
         cursor.execute(DELETE_BOOK_QUERY, (uuid,))
-        self._db.commit()
         rows_affected = cursor.rowcount
-        cursor.close()
-        return rows_affected > 0
+        self._adjust_inventory(cursor, -1, -1 if row[0] else 0)
+        return rows_affected
 
     def get_all_books(self) -> List[Book]:
-        cursor = self._db.cursor()
-        cursor.execute(GET_ALL_BOOKS_QUERY)
-        rows = cursor.fetchall()
-        cursor.close()
-        return [Book(*row) for row in rows]
+        return [Book(*row) for row in self.get_all_book_rows()]
+
+    def get_all_book_rows(self) -> List[BookRow]:
+        with self._pool.connection() as db:
+            cursor = self._instrument(db.cursor())
+            cursor.execute(GET_ALL_BOOKS_QUERY)
+            rows = cursor.fetchall()
+            cursor.close()
+        return rows
+
+    def get_books_page(self, after_uuid: str, limit: int) -> List[Book]:
+        return [Book(*row) for row in self.get_book_rows_page(after_uuid, limit)]
+
+    def get_book_rows_page(self, after_uuid: str, limit: int) -> List[BookRow]:
+        with self._pool.connection() as db:
+            cursor = self._cursor(db)
+            if after_uuid is None:
+                cursor.execute(GET_FIRST_BOOKS_PAGE_QUERY, (limit,))
+            else:
+                cursor.execute(GET_BOOKS_PAGE_QUERY, (after_uuid, limit))
+            rows = cursor.fetchall()
+            cursor.close()
+        return rows
 
     def get_inventory_summary(self) -> dict:
-        cursor = self._db.cursor()
-        cursor.execute(INVENTORY_SUMMARY_QUERY)
-        row = cursor.fetchone()
-        cursor.close()
+        with self._pool.connection() as db:
+            cursor = self._cursor(db)
+            cursor.execute(INVENTORY_SUMMARY_QUERY)
+            row = cursor.fetchone()
+            cursor.close()
+        total_books, available_books = int(row[0]), int(row[1])
         return {
-            'total_books': row[0],
-            'available_books': row[1],
-            'checked_out_books': row[2]
+            'total_books': total_books,
+            'available_books': available_books,
+            'checked_out_books': total_books - available_books
         }
+
+    def prepare_inventory(self) -> bool:
+        slots = ", ".join(f"({slot})" for slot in range(INVENTORY_COUNTER_SLOTS))
+        with self._pool.connection() as db:
+            cursor = self._instrument(db.cursor(buffered=True))
+            cursor.execute(CREATE_INVENTORY_COUNTERS_QUERY)
+            cursor.execute(INSERT_INVENTORY_SLOTS_QUERY.format(slots=slots))
+            created = cursor.rowcount > 0
+            db.commit()
+            cursor.close()
+        if created:
+            self.reconcile_inventory()
+        return created
+
+    def reconcile_inventory(self) -> dict:
+        with self._pool.connection() as db:
+            cursor = self._instrument(db.cursor(buffered=True))
+            cursor.execute(LOCK_INVENTORY_COUNTERS_QUERY)
+            cursor.execute(RECOUNT_INVENTORY_QUERY)
+            total_books, available_books = cursor.fetchone()
+            total_books, available_books = int(total_books), int(available_books or 0)
+            cursor.execute(RESET_INVENTORY_COUNTERS_QUERY)
+            cursor.execute(SET_INVENTORY_COUNTER_QUERY, (total_books, available_books, 0))
+            db.commit()
+            cursor.close()
+        return {
+            'total_books': total_books,
+            'available_books': available_books,
+            'checked_out_books': total_books - available_books
+        }
+
+    def explain(self, sql: str, params: tuple) -> List[dict]:
+        with self._pool.connection() as db:
+            cursor = db.cursor(buffered=True)
+            cursor.execute("EXPLAIN " + sql, params)
+            columns = cursor.column_names
+            rows = cursor.fetchall()
+            cursor.close()
+        return [dict(zip(columns, row)) for row in rows]
+
+    def iter_all_books(self, batch_size: int) -> Iterator[List[Book]]:
+        return self._iter_query(GET_ALL_BOOKS_QUERY, (), batch_size)
+
+    def iter_search_books(self, criteria: SearchCriteria, batch_size: int) -> Iterator[List[Book]]:
+        if criteria.is_empty():
+            return iter(())
+
+        query, params = build_search_query(criteria)
+        return self._iter_query(query, params, batch_size)
+
+    def _write(self, operation: Callable, *args, prepared: bool = True):
+        run = self._run_operation if prepared else self._run_unprepared
+        if self._writer is not None:
+            return self._writer.submit(run, operation, *args).result()
+
+        with self._pool.connection() as db:
+            result = run(db, operation, *args)
+            db.commit()
+        return result
+
+    def _run_operation(self, db, operation: Callable, *args):
+        cursor = self._cursor(db)
+        result = operation(cursor, *args)
+        cursor.close()
+        return result
+
+    def _run_unprepared(self, db, operation: Callable, *args):
+        cursor = self._instrument(db.cursor())
+        result = operation(cursor, *args)
+        cursor.close()
+        return result
+
+    def _cursor(self, db):
+        if self._statements is not None:
+            return self._instrument(self._statements.cursor(db))
+        return self._instrument(db.cursor(buffered=True))
+
+    def _instrument(self, cursor):
+        if self._slow_queries is not None:
+            cursor = SlowQueryCursor(cursor, self._slow_queries, self._query_names.name)
+        if self._trace_queries:
+            cursor = TracedCursor(cursor, self._query_names.name)
+        if self._queries is not None:
+            cursor = InstrumentedCursor(cursor, self._queries)
+        return cursor
+
+    @staticmethod
+    def _adjust_inventory(cursor, total_delta: int, available_delta: int):
+        slot = random.randrange(INVENTORY_COUNTER_SLOTS)
+        cursor.execute(ADJUST_INVENTORY_QUERY, (total_delta, available_delta, slot))
+
+    def _iter_query(self, query: str, params: tuple, batch_size: int) -> Iterator[List[Book]]:
+        with self._pool.connection() as db:
+            cursor = self._instrument(db.cursor(buffered=False))
+            try:
+                cursor.execute(query, params)
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield [Book(*row) for row in rows]
+            finally:
+                self._close_unbuffered(db, cursor)
+
+    @staticmethod
+    def _close_unbuffered(db, cursor):
+        try:
+            if db.unread_result:
+                db.consume_results()
+            cursor.close()
+        except mysql.connector.Error:
+            pass
@@ -0,0 +1,105 @@
+from typing import List, Optional
+from models.book import AvailabilityChange, Book, CreateBookResult
+from .book_repository import IBookRepository
+from .cache import LRUCache
+from .delegating_book_repository import DelegatingBookRepository
+
+
+class CachingBookRepository(DelegatingBookRepository):
+
+    def __init__(self, repository: IBookRepository, cache: LRUCache, versioned: bool = False):
+        super().__init__(repository)
+        self._cache = cache
+        self._versioned = versioned
+
+    def get_book_by_uuid(self, uuid: str) -> Book:
+        key = self._key(uuid)
+        book = self._cache.get(key)
+        if book is not None:
+            return book
+
+        token = self._cache.load_token()
+        book = self._repository.get_book_by_uuid(uuid)
+        if book is not None:
+            self._cache.put(key, book, token)
+        return book
+
+    def get_books_by_uuids(self, uuids: List[str]) -> List[Optional[Book]]:
+        keys = {uuid: self._key(uuid) for uuid in dict.fromkeys(uuids)}
+        books = {}
+        for uuid, key in keys.items():
+            book = self._cache.get(key)
+            if book is not None:
+                books[uuid] = book
+
+        missing = [uuid for uuid in keys if uuid not in books]
+        if missing:
+            token = self._cache.load_token()
+            for uuid, book in zip(missing, self._repository.get_books_by_uuids(missing)):
+                if book is not None:
+                    books[uuid] = book
+                    self._cache.put(keys[uuid], book, token)
+
+        return [books.get(uuid) for uuid in uuids]
+
+    def create_book(self, book: Book) -> str:
+        try:
+            return self._repository.create_book(book)
+        finally:
+            self._invalidate(book.uuid)
+
+    def create_books(self, books: List[Book]) -> List[CreateBookResult]:
+        try:
+            return self._repository.create_books(books)
+        finally:
+            for book in books:
+                self._invalidate(book.uuid)
+
+    def update_book(self, book: Book) -> bool:
+        try:
+            return self._repository.update_book(book)
+        finally:
+            self._invalidate(book.uuid)
+
+    def checkout_book(self, uuid: str) -> AvailabilityChange:
+        try:
+            return self._repository.checkout_book(uuid)
+        finally:
+            self._invalidate(uuid)
+
+    def return_book(self, uuid: str) -> AvailabilityChange:
+        try:
+            return self._repository.return_book(uuid)
+        finally:
+            self._invalidate(uuid)
+
+    def checkout_books(self, uuids: List[str], all_or_nothing: bool = False) -> List[AvailabilityChange]:
+        try:
+            return self._repository.checkout_books(uuids, all_or_nothing)
+        finally:
+            for uuid in uuids:
+                self._invalidate(uuid)
+
+    def return_books(self, uuids: List[str], all_or_nothing: bool = False) -> List[AvailabilityChange]:
+        try:
+            return self._repository.return_books(uuids, all_or_nothing)
+        finally:
+            for uuid in uuids:
+                self._invalidate(uuid)
+
+    def delete_book(self, uuid: str) -> bool:
+        try:
+            return self._repository.delete_book(uuid)
+        finally:
+            self._invalidate(uuid)
+
+    def cache_stats(self) -> dict:
+        return self._cache.stats()
+
+    def _key(self, uuid: str):
+        if self._versioned:
+            return self.catalog_version.value, uuid
+        return uuid
+
+    def _invalidate(self, uuid: str):
+        self._cache.invalidate(self._key(uuid))
@@ -0,0 +1,35 @@
+import multiprocessing
+import threading
+
+
+class CatalogVersion:
+
+    def __init__(self):
+        self._value = 0
+        self._lock = threading.Lock()
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+    def bump(self) -> int:
+        with self._lock:
+            self._value += 1
+            return self._value
+
+
+class SharedCatalogVersion(CatalogVersion):
+
+    def __init__(self, context=None):
+        context = context or multiprocessing.get_context('spawn')
+        self._shared = context.RawValue('Q', 0)
+        self._lock = context.Lock()
+
+    @property
+    def value(self) -> int:
+        return self._shared.value
+
+    def bump(self) -> int:
+        with self._lock:
+            self._shared.value += 1
+            return self._shared.value
@@ -0,0 +1,193 @@
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable
+
+import mysql.connector
+
+
+def connect_db():
+    return mysql.connector.connect(
+        host=os.getenv('MYSQL_HOST', 'localhost'),
+        port=int(os.getenv('MYSQL_PORT', '3306')),
+        user=os.getenv('MYSQL_USER', 'root'),
+        password=os.getenv('MYSQL_PASSWORD', ''),
+        database=os.getenv('MYSQL_DATABASE', 'library')
+    )
+
+
+class PoolTimeoutError(Exception):
+    pass
+
+
+class PoolClosedError(Exception):
+    pass
+
+
+class ConnectionPool:
+
+    def __init__(self, connect: Callable = connect_db, min_size: int = 2, max_size: int = 10,
+                 checkout_timeout: float = 30.0, liveness_check_after: float = 5.0):
+        if max_size < 1:
+            raise ValueError("max_size must be positive")
+        if min_size < 0 or min_size > max_size:
+            raise ValueError("min_size must be between 0 and max_size")
+
+        self._connect = connect
+        self._min_size = min_size
+        self._max_size = max_size
+        self._checkout_timeout = checkout_timeout
+        self._liveness_check_after = liveness_check_after
+
+        self._condition = threading.Condition()
+        self._idle = deque()
+        self._size = 0
+        self._closed = False
+
+        self._checkouts = 0
+        self._waited_checkouts = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+        self._timeouts = 0
+        self._replaced = 0
+
+        for _ in range(min_size):
+            self._idle.append((self._connect(), time.monotonic()))
+            self._size += 1
+
+    @property
+    def max_size(self) -> int:
+        return self._max_size
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        try:
+            yield conn
+        except BaseException:
+            self.release(conn, rollback=True)
+            raise
+        self.release(conn)
+
+    def acquire(self):
+        started = time.monotonic()
+        deadline = started + self._checkout_timeout
+        waited = False
+
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise PoolClosedError("connection pool is closed")
+                if self._idle:
+                    conn, returned_at = self._idle.pop()
+                    break
+                if self._size < self._max_size:
+                    self._size += 1
+                    conn, returned_at = None, None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeoutError(
+                        f"timed out after {self._checkout_timeout}s waiting for a database connection"
+                    )
+                waited = True
+                self._condition.wait(remaining)
+
+        try:
+            if conn is None:
+                conn = self._connect()
+            elif started - returned_at >= self._liveness_check_after and not self._is_alive(conn):
+                self._close_quietly(conn)
+                conn = self._connect()
+                with self._condition:
+                    self._replaced += 1
+        except Exception:
+            self._discard_slot()
+            raise
+
+        wait_time = time.monotonic() - started
+        with self._condition:
+            self._checkouts += 1
+            if waited:
+                self._waited_checkouts += 1
+            self._wait_time_total += wait_time
+            self._wait_time_max = max(self._wait_time_max, wait_time)
+
+        return conn
+
+    def release(self, conn, rollback: bool = False):
+        try:
+            if rollback or conn.in_transaction:
+                conn.rollback()
+        except Exception:
+            self._close_quietly(conn)
+            self._discard_slot()
+            return
+
+        with self._condition:
+            if self._closed:
+                self._size -= 1
+                self._close_quietly(conn)
+                return
+            self._idle.append((conn, time.monotonic()))
+            self._condition.notify()
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._condition.notify_all()
+
+        for conn, _ in idle:
+            self._close_quietly(conn)
+
+    def stats(self) -> dict:
+        with self._condition:
+            return {
+                'min_size': self._min_size,
+                'max_size': self._max_size,
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': self._size - len(self._idle),
+                'checkouts': self._checkouts,
+                'waited_checkouts': self._waited_checkouts,
+                'wait_time_total_ms': self._wait_time_total * 1000,
+                'wait_time_avg_ms': (self._wait_time_total / self._checkouts * 1000) if self._checkouts else 0.0,
+                'wait_time_max_ms': self._wait_time_max * 1000,
+                'timeouts': self._timeouts,
+                'replaced_connections': self._replaced
+            }
+
+    def _discard_slot(self):
+        with self._condition:
+            self._size -= 1
+            self._condition.notify()
+
+    @staticmethod
+    def _is_alive(conn) -> bool:
+        try:
+            return conn.is_connected()
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+def create_pool(connect: Callable = connect_db, min_size: int = None, max_size: int = None) -> ConnectionPool:
+    return ConnectionPool(
+        connect=connect,
+        min_size=min_size if min_size is not None else int(os.getenv('DB_POOL_MIN_SIZE', '2')),
+        max_size=max_size if max_size is not None else int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+        checkout_timeout=float(os.getenv('DB_POOL_CHECKOUT_TIMEOUT', '30')),
+        liveness_check_after=float(os.getenv('DB_POOL_LIVENESS_CHECK_AFTER', '5'))
+    )
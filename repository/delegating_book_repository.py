@@ -0,0 +1,71 @@
+from typing import Iterator, List, Optional
+from models.book import AvailabilityChange, Book, BookRow, CreateBookResult, SearchCriteria
+from .book_repository import IBookRepository
+from .catalog_version import CatalogVersion
+
+
+class DelegatingBookRepository(IBookRepository):
+
+    def __init__(self, repository: IBookRepository):
+        self._repository = repository
+
+    @property
+    def catalog_version(self) -> CatalogVersion:
+        return self._repository.catalog_version
+
+    def search_books(self, criteria: SearchCriteria) -> List[Book]:
+        return self._repository.search_books(criteria)
+
+    def search_book_rows(self, criteria: SearchCriteria) -> List[BookRow]:
+        return self._repository.search_book_rows(criteria)
+
+    def get_book_by_uuid(self, uuid: str) -> Book:
+        return self._repository.get_book_by_uuid(uuid)
+
+    def get_books_by_uuids(self, uuids: List[str]) -> List[Optional[Book]]:
+        return self._repository.get_books_by_uuids(uuids)
+
+    def create_book(self, book: Book) -> str:
+        return self._repository.create_book(book)
+
+    def create_books(self, books: List[Book]) -> List[CreateBookResult]:
+        return self._repository.create_books(books)
+
+    def update_book(self, book: Book) -> bool:
+        return self._repository.update_book(book)
+
+    def checkout_book(self, uuid: str) -> AvailabilityChange:
+        return self._repository.checkout_book(uuid)
+
+    def return_book(self, uuid: str) -> AvailabilityChange:
+        return self._repository.return_book(uuid)
+
+    def checkout_books(self, uuids: List[str], all_or_nothing: bool = False) -> List[AvailabilityChange]:
+        return self._repository.checkout_books(uuids, all_or_nothing)
+
+    def return_books(self, uuids: List[str], all_or_nothing: bool = False) -> List[AvailabilityChange]:
+        return self._repository.return_books(uuids, all_or_nothing)
+
+    def delete_book(self, uuid: str) -> bool:
+        return self._repository.delete_book(uuid)
+
+    def get_all_books(self) -> List[Book]:
+        return self._repository.get_all_books()
+
+    def get_all_book_rows(self) -> List[BookRow]:
+        return self._repository.get_all_book_rows()
+
+    def get_books_page(self, after_uuid: str, limit: int) -> List[Book]:
+        return self._repository.get_books_page(after_uuid, limit)
+
+    def get_book_rows_page(self, after_uuid: str, limit: int) -> List[BookRow]:
+        return self._repository.get_book_rows_page(after_uuid, limit)
+
+    def get_inventory_summary(self) -> dict:
+        return self._repository.get_inventory_summary()
+
+    def iter_all_books(self, batch_size: int) -> Iterator[List[Book]]:
+        return self._repository.iter_all_books(batch_size)
+
+    def iter_search_books(self, criteria: SearchCriteria, batch_size: int) -> Iterator[List[Book]]:
+        return self._repository.iter_search_books(criteria, batch_size)
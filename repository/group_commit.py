@@ -0,0 +1,157 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Optional
+
+from .database import ConnectionPool
+
+
+SAVEPOINT_QUERY = "SAVEPOINT group_commit_op"
+ROLLBACK_TO_SAVEPOINT_QUERY = "ROLLBACK TO SAVEPOINT group_commit_op"
+RELEASE_SAVEPOINT_QUERY = "RELEASE SAVEPOINT group_commit_op"
+
+
+class GroupCommitClosedError(Exception):
+    pass
+
+
+class _PendingWrite:
+
+    def __init__(self, operation: Callable, args: tuple):
+        self.operation = operation
+        self.args = args
+        self.future = Future()
+        self.submitted_at = time.monotonic()
+
+
+class GroupCommitWriter:
+
+    def __init__(self, pool: ConnectionPool, max_ops: int = 64, linger: float = 0.002):
+        if max_ops < 1:
+            raise ValueError("max_ops must be positive")
+        if linger < 0:
+            raise ValueError("linger must not be negative")
+
+        self._pool = pool
+        self._max_ops = max_ops
+        self._linger = linger
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self._batches = 0
+        self._operations = 0
+        self._failed_operations = 0
+        self._queue_wait_total = 0.0
+        self._queue_wait_max = 0.0
+        self._commit_time_total = 0.0
+
+        self._thread = threading.Thread(target=self._run, name='group-commit-writer', daemon=True)
+        self._thread.start()
+
+    def submit(self, operation: Callable, *args) -> Future:
+        pending = _PendingWrite(operation, args)
+        with self._lock:
+            if self._closed:
+                raise GroupCommitClosedError("group commit writer is closed")
+            self._queue.put(pending)
+        return pending.future
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._thread.join()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'max_ops': self._max_ops,
+                'linger_ms': self._linger * 1000,
+                'batches': self._batches,
+                'operations': self._operations,
+                'failed_operations': self._failed_operations,
+                'mean_batch_size': self._operations / self._batches if self._batches else 0.0,
+                'mean_queue_wait_ms': self._queue_wait_total / self._operations * 1000 if self._operations else 0.0,
+                'max_queue_wait_ms': self._queue_wait_max * 1000,
+                'mean_commit_ms': self._commit_time_total / self._batches * 1000 if self._batches else 0.0
+            }
+
+    def _run(self):
+        closing = False
+        while not closing:
+            pending = self._queue.get()
+            if pending is None:
+                break
+
+            batch = [pending]
+            deadline = time.monotonic() + self._linger
+            while len(batch) < self._max_ops:
+                timeout = deadline - time.monotonic()
+                try:
+                    pending = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if pending is None:
+                    closing = True
+                    break
+                batch.append(pending)
+
+            self._apply(batch)
+
+    def _apply(self, batch: list):
+        started = time.monotonic()
+        completed = []
+        failed = 0
+        try:
+            with self._pool.connection() as db:
+                cursor = db.cursor(buffered=True)
+                for pending in batch:
+                    cursor.execute(SAVEPOINT_QUERY)
+                    try:
+                        result = pending.operation(db, *pending.args)
+                    except Exception as e:
+                        cursor.execute(ROLLBACK_TO_SAVEPOINT_QUERY)
+                        pending.future.set_exception(e)
+                        failed += 1
+                        continue
+                    cursor.execute(RELEASE_SAVEPOINT_QUERY)
+                    completed.append((pending, result))
+                db.commit()
+                cursor.close()
+        except Exception as e:
+            for pending in batch:
+                if not pending.future.done():
+                    pending.future.set_exception(e)
+                    failed += 1
+            completed = []
+
+        self._record(batch, started, time.monotonic() - started, failed)
+        for pending, result in completed:
+            pending.future.set_result(result)
+
+    def _record(self, batch: list, started: float, commit_time: float, failed: int):
+        with self._lock:
+            self._batches += 1
+            self._operations += len(batch)
+            self._failed_operations += failed
+            self._commit_time_total += commit_time
+            for pending in batch:
+                wait = started - pending.submitted_at
+                self._queue_wait_total += wait
+                self._queue_wait_max = max(self._queue_wait_max, wait)
+
+
+def create_group_commit_writer(pool: ConnectionPool) -> Optional[GroupCommitWriter]:
+    if os.getenv('GROUP_COMMIT', '0').lower() not in ('1', 'true', 'yes'):
+        return None
+
+    return GroupCommitWriter(
+        pool,
+        max_ops=int(os.getenv('GROUP_COMMIT_MAX_OPS', '64')),
+        linger=float(os.getenv('GROUP_COMMIT_LINGER_MS', '2')) / 1000
+    )
@@ -0,0 +1,369 @@
+import bisect
+import re
+import threading
+from contextlib import ExitStack
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+from models.book import AvailabilityChange, AvailabilityStatus, Book, BookRow, CreateBookResult, SearchCriteria, SearchMode
+from .book_repository import IBookRepository, availability_change
+from .catalog_version import CatalogVersion
+
+
+BOOK_COLUMNS = ('uuid', 'title', 'author', 'genre', 'is_available', 'book_condition')
+LOCK_STRIPES = 64
+
+INSERT_PATTERN = re.compile(r"INSERT\s+INTO\s+`?book_copies`?\s*(?:\(([^)]*)\))?\s*VALUES\s*", re.IGNORECASE)
+SQL_VALUE_PATTERN = re.compile(r"\s*(?:'((?:[^'\\]|\\.|'')*)'|(NULL|TRUE|FALSE)|(-?\d+))\s*", re.IGNORECASE | re.DOTALL)
+SQL_ESCAPE_PATTERN = re.compile(r"\\(.)|''", re.DOTALL)
+SQL_ESCAPES = {'0': '\0', 'b': '\b', 'n': '\n', 'r': '\r', 't': '\t', 'Z': '\x1a'}
+SEPARATOR_PATTERN = re.compile(r"\s*,\s*")
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def _unescape(value: str) -> str:
+    return SQL_ESCAPE_PATTERN.sub(
+        lambda match: "'" if match.group(1) is None else SQL_ESCAPES.get(match.group(1), match.group(1)),
+        value
+    )
+
+
+def _sql_value(match: re.Match):
+    text, keyword, number = match.groups()
+    if text is not None:
+        return _unescape(text)
+    if keyword is not None:
+        return {'NULL': None, 'TRUE': True, 'FALSE': False}[keyword.upper()]
+    return int(number)
+
+
+def _book_row(record: dict) -> BookRow:
+    return (
+        record['uuid'],
+        record['title'],
+        record['author'],
+        record.get('genre'),
+        bool(record.get('is_available', True)),
+        record.get('book_condition')
+    )
+
+
+def parse_sql_rows(sql: str) -> Iterator[BookRow]:
+    for insert in INSERT_PATTERN.finditer(sql):
+        if insert.group(1):
+            columns = [column.strip().strip('`') for column in insert.group(1).split(',')]
+        else:
+            columns = list(BOOK_COLUMNS)
+
+        position = insert.end()
+        while sql.startswith('(', position):
+            values = []
+            position += 1
+            while True:
+                match = SQL_VALUE_PATTERN.match(sql, position)
+                if not match:
+                    raise ValueError(f"Unparseable value at offset {position}")
+                values.append(_sql_value(match))
+                position = match.end()
+                if sql.startswith(',', position):
+                    position += 1
+                elif sql.startswith(')', position):
+                    position += 1
+                    break
+                else:
+                    raise ValueError(f"Expected ',' or ')' at offset {position}")
+
+            if len(values) != len(columns):
+                raise ValueError(f"Expected {len(columns)} values, got {len(values)} at offset {position}")
+            yield _book_row(dict(zip(columns, values)))
+
+            separator = SEPARATOR_PATTERN.match(sql, position)
+            if not separator:
+                break
+            position = separator.end()
+
+
+def read_sql_dump(path: str) -> List[BookRow]:
+    with open(path, encoding='utf-8') as f:
+        return list(parse_sql_rows(f.read()))
+
+
+def _index_key(value: Optional[str]) -> str:
+    return (value or '').lower()
+
+
+def _add_to_index(index: Dict[str, Set[str]], key: str, uuid: str):
+    uuids = index.get(key)
+    if uuids is None:
+        index[key] = {uuid}
+    else:
+        uuids.add(uuid)
+
+
+def _remove_from_index(index: Dict[str, Set[str]], key: str, uuid: str):
+    uuids = index.get(key)
+    if uuids is not None:
+        uuids.discard(uuid)
+        if not uuids:
+            del index[key]
+
+
+class InMemoryBookRepository(IBookRepository):
+
+    def __init__(self, books: Iterable[Book] = (), catalog_version: CatalogVersion = None):
+        self._catalog_version = catalog_version or CatalogVersion()
+        self._rows: Dict[str, BookRow] = {}
+        self._sorted_uuids: List[str] = []
+        self._titles: Dict[str, Set[str]] = {}
+        self._authors: Dict[str, Set[str]] = {}
+        self._genres: Dict[str, Set[str]] = {}
+        self._available: Set[str] = set()
+        self._lock = threading.Lock()
+        self._stripes = [threading.Lock() for _ in range(LOCK_STRIPES)]
+        self.bulk_load(book.get_tuple() for book in books)
+
+    @property
+    def catalog_version(self) -> CatalogVersion:
+        return self._catalog_version
+
+    def bulk_load(self, rows: Iterable[BookRow]) -> int:
+        loaded = 0
+        with ExitStack() as stack:
+            for stripe in self._stripes:
+                stack.enter_context(stripe)
+            stack.enter_context(self._lock)
+
+            for row in rows:
+                row = tuple(row[:4]) + (bool(row[4]), row[5])
+                existing = self._rows.get(row[0])
+                if existing is not None:
+                    self._unindex(existing)
+                self._rows[row[0]] = row
+                self._index(row)
+                loaded += 1
+            self._sorted_uuids = sorted(self._rows)
+
+        if loaded:
+            self._catalog_version.bump()
+        return loaded
+
+    def load_sql_dump(self, path: str) -> int:
+        return self.bulk_load(read_sql_dump(path))
+
+    def search_books(self, criteria: SearchCriteria) -> List[Book]:
+        return [Book(*row) for row in self.search_book_rows(criteria)]
+
+    def search_book_rows(self, criteria: SearchCriteria) -> List[BookRow]:
+        if criteria.is_empty():
+            return []
+
+        fields = [
+            (index, term.lower())
+            for index, term in ((self._titles, criteria.title), (self._authors, criteria.author), (self._genres, criteria.genre))
+            if term
+        ]
+        with self._lock:
+            if criteria.mode == SearchMode.FULLTEXT:
+                field_scores = [self._fulltext_scores(index, term) for index, term in fields]
+            else:
+                field_scores = [self._substring_matches(index, term) for index, term in fields]
+
+            if criteria.match_all:
+                matched = set(field_scores[0]).intersection(*field_scores[1:])
+            else:
+                matched = set().union(*field_scores)
+            if criteria.after_uuid is not None:
+                matched = {uuid for uuid in matched if uuid > criteria.after_uuid}
+
+            if criteria.mode == SearchMode.FULLTEXT:
+                ordered = sorted(matched, key=lambda uuid: (-sum(scores.get(uuid, 0) for scores in field_scores), uuid))
+            else:
+                ordered = sorted(matched)
+
+            if criteria.limit is not None:
+                ordered = ordered[criteria.offset:criteria.offset + criteria.limit]
+            return [self._rows[uuid] for uuid in ordered]
+
+    @staticmethod
+    def _substring_matches(index: Dict[str, Set[str]], term: str) -> Set[str]:
+        matched = set()
+        for value, uuids in index.items():
+            if term in value:
+                matched |= uuids
+        return matched
+
+    @staticmethod
+    def _fulltext_scores(index: Dict[str, Set[str]], term: str) -> Dict[str, int]:
+        words = set(WORD_PATTERN.findall(term))
+        scores = {}
+        for value, uuids in index.items():
+            score = len(words.intersection(WORD_PATTERN.findall(value)))
+            if score:
+                for uuid in uuids:
+                    scores[uuid] = score
+        return scores
+
+    def get_book_by_uuid(self, uuid: str) -> Book:
+        row = self._rows.get(uuid)
+        return Book(*row) if row else None
+
+    def get_books_by_uuids(self, uuids: List[str]) -> List[Optional[Book]]:
+        rows = self._rows
+        return [Book(*row) if row else None for row in (rows.get(uuid) for uuid in uuids)]
+
+    def create_book(self, book: Book) -> str:
+        row = book.get_tuple()
+        with self._stripe(book.uuid), self._lock:
+            if row[0] in self._rows:
+                raise ValueError(f"Duplicate entry '{row[0]}'")
+            self._insert(row)
+        self._catalog_version.bump()
+        return book.uuid
+
+    def create_books(self, books: List[Book]) -> List[CreateBookResult]:
+        results = []
+        with ExitStack() as stack:
+            self._enter_stripes(stack, [book.uuid for book in books])
+            stack.enter_context(self._lock)
+
+            for book in books:
+                if book.uuid in self._rows:
+                    results.append(CreateBookResult(uuid=None, error=f"Duplicate entry '{book.uuid}'"))
+                    continue
+                self._insert(book.get_tuple())
+                results.append(CreateBookResult(uuid=book.uuid))
+
+        if any(result.error is None for result in results):
+            self._catalog_version.bump()
+        return results
+
+    def update_book(self, book: Book) -> bool:
+        with self._stripe(book.uuid), self._lock:
+            existing = self._rows.get(book.uuid)
+            if existing is None:
+                return False
+
+            row = (book.uuid, book.title, book.author, book.genre, existing[4], book.book_condition)
+            self._unindex(existing)
+            self._rows[book.uuid] = row
+            self._index(row)
+        self._catalog_version.bump()
+        return True
+
+    def checkout_book(self, uuid: str) -> AvailabilityChange:
+        return self._change_availabilities([uuid], False, False)[0]
+
+    def return_book(self, uuid: str) -> AvailabilityChange:
+        return self._change_availabilities([uuid], True, False)[0]
+
+    def checkout_books(self, uuids: List[str], all_or_nothing: bool = False) -> List[AvailabilityChange]:
+        return self._change_availabilities(uuids, False, all_or_nothing)
+
+    def return_books(self, uuids: List[str], all_or_nothing: bool = False) -> List[AvailabilityChange]:
+        return self._change_availabilities(uuids, True, all_or_nothing)
+
+    def _change_availabilities(self, uuids: List[str], is_available: bool, all_or_nothing: bool) -> List[AvailabilityChange]:
+        unique_uuids = list(dict.fromkeys(uuids))
+        if not unique_uuids:
+            return []
+
+        with ExitStack() as stack:
+            self._enter_stripes(stack, unique_uuids)
+            stack.enter_context(self._lock)
+
+            changes = {uuid: availability_change(self._rows.get(uuid), is_available) for uuid in unique_uuids}
+            eligible = [uuid for uuid in unique_uuids if changes[uuid].status == AvailabilityStatus.UPDATED]
+            if all_or_nothing and len(eligible) < len(unique_uuids):
+                for uuid in eligible:
+                    changes[uuid] = AvailabilityChange(status=AvailabilityStatus.ABORTED, book=Book(*self._rows[uuid]))
+                eligible = []
+
+            for uuid in eligible:
+                row = self._rows[uuid]
+                self._rows[uuid] = row[:4] + (is_available,) + row[5:]
+                if is_available:
+                    self._available.add(uuid)
+                else:
+                    self._available.discard(uuid)
+
+        if eligible:
+            self._catalog_version.bump()
+        return [changes[uuid] for uuid in uuids]
+
+    def delete_book(self, uuid: str) -> bool:
+        with self._stripe(uuid), self._lock:
+            row = self._rows.pop(uuid, None)
+            if row is None:
+                return False
+
+            self._unindex(row)
+            position = bisect.bisect_left(self._sorted_uuids, uuid)
+            del self._sorted_uuids[position]
+        self._catalog_version.bump()
+        return True
+
+    def get_all_books(self) -> List[Book]:
+        return [Book(*row) for row in self.get_all_book_rows()]
+
+    def get_all_book_rows(self) -> List[BookRow]:
+        with self._lock:
+            return [self._rows[uuid] for uuid in self._sorted_uuids]
+
+    def get_books_page(self, after_uuid: str, limit: int) -> List[Book]:
+        return [Book(*row) for row in self.get_book_rows_page(after_uuid, limit)]
+
+    def get_book_rows_page(self, after_uuid: str, limit: int) -> List[BookRow]:
+        with self._lock:
+            start = 0 if after_uuid is None else bisect.bisect_right(self._sorted_uuids, after_uuid)
+            return [self._rows[uuid] for uuid in self._sorted_uuids[start:start + limit]]
+
+    def get_inventory_summary(self) -> dict:
+        with self._lock:
+            total_books = len(self._rows)
+            available_books = len(self._available)
+        return {
+            'total_books': total_books,
+            'available_books': available_books,
+            'checked_out_books': total_books - available_books
+        }
+
+    def iter_all_books(self, batch_size: int) -> Iterator[List[Book]]:
+        return self._batches(self.get_all_book_rows(), batch_size)
+
+    def iter_search_books(self, criteria: SearchCriteria, batch_size: int) -> Iterator[List[Book]]:
+        return self._batches(self.search_book_rows(criteria), batch_size)
+
+    @staticmethod
+    def _batches(rows: List[BookRow], batch_size: int) -> Iterator[List[Book]]:
+        for start in range(0, len(rows), batch_size):
+            yield [Book(*row) for row in rows[start:start + batch_size]]
+
+    def _insert(self, row: BookRow):
+        self._rows[row[0]] = row
+        self._index(row)
+        bisect.insort(self._sorted_uuids, row[0])
+
+    def _index(self, row: BookRow):
+        uuid = row[0]
+        _add_to_index(self._titles, _index_key(row[1]), uuid)
+        _add_to_index(self._authors, _index_key(row[2]), uuid)
+        _add_to_index(self._genres, _index_key(row[3]), uuid)
+        if row[4]:
+            self._available.add(uuid)
+        else:
+            self._available.discard(uuid)
+
+    def _unindex(self, row: BookRow):
+        uuid = row[0]
+        _remove_from_index(self._titles, _index_key(row[1]), uuid)
+        _remove_from_index(self._authors, _index_key(row[2]), uuid)
+        _remove_from_index(self._genres, _index_key(row[3]), uuid)
+        self._available.discard(uuid)
+
+    def _stripe_index(self, uuid: str) -> int:
+        return hash(uuid) % LOCK_STRIPES
+
+    def _stripe(self, uuid: str) -> threading.Lock:
+        return self._stripes[self._stripe_index(uuid)]
+
+    def _enter_stripes(self, stack: ExitStack, uuids: List[str]):
+        for index in sorted({self._stripe_index(uuid) for uuid in uuids}):
+            stack.enter_context(self._stripes[index])
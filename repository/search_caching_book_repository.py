@@ -0,0 +1,56 @@
+from dataclasses import replace
+from typing import List
+from models.book import Book, BookRow, SearchCriteria, SearchMode
+from .book_repository import IBookRepository
+from .cache import LRUCache
+from .delegating_book_repository import DelegatingBookRepository
+
+
+BOOK_OVERHEAD_BYTES = 400
+
+
+def normalize_criteria(criteria: SearchCriteria) -> SearchCriteria:
+    def normalize(term):
+        if not term:
+            return None
+        term = term.lower()
+        if criteria.mode == SearchMode.FULLTEXT:
+            term = ' '.join(term.split())
+        return term
+
+    return replace(
+        criteria,
+        title=normalize(criteria.title),
+        author=normalize(criteria.author),
+        genre=normalize(criteria.genre)
+    )
+
+
+def estimate_book_rows_size(rows: List[BookRow]) -> int:
+    return sum(
+        BOOK_OVERHEAD_BYTES + len(uuid) + len(title) + len(author) + len(genre or '') + len(condition or '')
+        for uuid, title, author, genre, _, condition in rows
+    )
+
+
+class SearchCachingBookRepository(DelegatingBookRepository):
+
+    def __init__(self, repository: IBookRepository, cache: LRUCache):
+        super().__init__(repository)
+        self._cache = cache
+
+    def search_books(self, criteria: SearchCriteria) -> List[Book]:
+        return [Book(*row) for row in self.search_book_rows(criteria)]
+
+    def search_book_rows(self, criteria: SearchCriteria) -> List[BookRow]:
+        key = (self.catalog_version.value, normalize_criteria(criteria))
+        rows = self._cache.get(key)
+        if rows is not None:
+            return rows
+
+        rows = self._repository.search_book_rows(criteria)
+        self._cache.put(key, rows)
+        return rows
+
+    def search_cache_stats(self) -> dict:
+        return self._cache.stats()
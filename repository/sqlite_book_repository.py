@@ -0,0 +1,364 @@
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+from models.book import AvailabilityChange, AvailabilityStatus, Book, BookRow, CreateBookResult, SearchCriteria, SearchMode
+from .book_repository import IBookRepository, MAX_UUIDS_PER_QUERY, availability_change, escape_like
+from .catalog_version import CatalogVersion
+from .memory_book_repository import read_sql_dump
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS book_copies (
+    id INTEGER PRIMARY KEY,
+    uuid TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    author TEXT NOT NULL,
+    genre TEXT,
+    is_available INTEGER NOT NULL DEFAULT 1,
+    book_condition TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_book_copies_author ON book_copies (author COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_book_copies_genre ON book_copies (genre COLLATE NOCASE);
+
+CREATE TABLE IF NOT EXISTS inventory_counters (
+    slot INTEGER PRIMARY KEY,
+    total_books INTEGER NOT NULL DEFAULT 0,
+    available_books INTEGER NOT NULL DEFAULT 0
+);
+
+INSERT OR IGNORE INTO inventory_counters (slot) VALUES (0);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS book_copies_fts USING fts5(
+    title, author, genre, content='book_copies', content_rowid='id'
+);
+
+CREATE TRIGGER IF NOT EXISTS book_copies_after_insert AFTER INSERT ON book_copies BEGIN
+    INSERT INTO book_copies_fts (rowid, title, author, genre) VALUES (new.id, new.title, new.author, new.genre);
+    UPDATE inventory_counters SET total_books = total_books + 1, available_books = available_books + new.is_available WHERE slot = 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS book_copies_after_delete AFTER DELETE ON book_copies BEGIN
+    INSERT INTO book_copies_fts (book_copies_fts, rowid, title, author, genre) VALUES ('delete', old.id, old.title, old.author, old.genre);
+    UPDATE inventory_counters SET total_books = total_books - 1, available_books = available_books - old.is_available WHERE slot = 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS book_copies_after_update_text AFTER UPDATE OF title, author, genre ON book_copies BEGIN
+    INSERT INTO book_copies_fts (book_copies_fts, rowid, title, author, genre) VALUES ('delete', old.id, old.title, old.author, old.genre);
+    INSERT INTO book_copies_fts (rowid, title, author, genre) VALUES (new.id, new.title, new.author, new.genre);
+END;
+
+CREATE TRIGGER IF NOT EXISTS book_copies_after_update_availability AFTER UPDATE OF is_available ON book_copies BEGIN
+    UPDATE inventory_counters SET available_books = available_books + new.is_available - old.is_available WHERE slot = 0;
+END;
+"""
+
+BOOK_COLUMNS = "uuid, title, author, genre, is_available, book_condition"
+SELECT_BOOKS_QUERY = f"SELECT {BOOK_COLUMNS} FROM book_copies"
+GET_BY_UUID_QUERY = SELECT_BOOKS_QUERY + " WHERE uuid = ?"
+GET_BY_UUIDS_QUERY = SELECT_BOOKS_QUERY + " WHERE uuid IN ({placeholders})"
+INSERT_BOOK_QUERY = f"INSERT INTO book_copies ({BOOK_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)"
+UPSERT_BOOK_QUERY = INSERT_BOOK_QUERY + """
+    ON CONFLICT (uuid) DO UPDATE SET
+        title = excluded.title,
+        author = excluded.author,
+        genre = excluded.genre,
+        is_available = excluded.is_available,
+        book_condition = excluded.book_condition
+"""
+UPDATE_BOOK_QUERY = "UPDATE book_copies SET title = ?, author = ?, genre = ?, book_condition = ? WHERE uuid = ?"
+SET_AVAILABILITY_QUERY = "UPDATE book_copies SET is_available = ? WHERE uuid IN ({placeholders})"
+DELETE_BOOK_QUERY = "DELETE FROM book_copies WHERE uuid = ?"
+GET_ALL_BOOKS_QUERY = SELECT_BOOKS_QUERY + " ORDER BY uuid"
+GET_FIRST_BOOKS_PAGE_QUERY = SELECT_BOOKS_QUERY + " ORDER BY uuid LIMIT ?"
+GET_BOOKS_PAGE_QUERY = SELECT_BOOKS_QUERY + " WHERE uuid > ? ORDER BY uuid LIMIT ?"
+SEARCH_BOOKS_QUERY = SELECT_BOOKS_QUERY + " WHERE {conditions} ORDER BY uuid"
+FULLTEXT_SEARCH_BOOKS_QUERY = (
+    "SELECT b.uuid, b.title, b.author, b.genre, b.is_available, b.book_condition"
+    " FROM book_copies_fts JOIN book_copies b ON b.id = book_copies_fts.rowid"
+    " WHERE book_copies_fts MATCH ?{after} ORDER BY book_copies_fts.rank, b.uuid"
+)
+INVENTORY_SUMMARY_QUERY = "SELECT total_books, available_books FROM inventory_counters WHERE slot = 0"
+
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def build_fulltext_expression(criteria: SearchCriteria) -> Optional[str]:
+    expressions = []
+    for column, term in (('title', criteria.title), ('author', criteria.author), ('genre', criteria.genre)):
+        if not term:
+            continue
+        words = WORD_PATTERN.findall(term)
+        if not words:
+            if criteria.match_all:
+                return None
+            continue
+        phrases = ' OR '.join(f'"{word}"' for word in words)
+        expressions.append(f"{column} : ({phrases})")
+
+    if not expressions:
+        return None
+    return (' AND ' if criteria.match_all else ' OR ').join(expressions)
+
+
+def build_sqlite_search_query(criteria: SearchCriteria) -> Optional[Tuple[str, tuple]]:
+    if criteria.mode == SearchMode.FULLTEXT:
+        expression = build_fulltext_expression(criteria)
+        if expression is None:
+            return None
+        params = [expression]
+        after = ""
+        if criteria.after_uuid is not None:
+            after = " AND b.uuid > ?"
+            params.append(criteria.after_uuid)
+        query = FULLTEXT_SEARCH_BOOKS_QUERY.format(after=after)
+    else:
+        fields = [
+            (column, term)
+            for column, term in (('title', criteria.title), ('author', criteria.author), ('genre', criteria.genre))
+            if term
+        ]
+        terms = [f"{column} LIKE ? ESCAPE '\\'" for column, _ in fields]
+        params = [f"%{escape_like(term)}%" for _, term in fields]
+        conditions = f"({(' AND ' if criteria.match_all else ' OR ').join(terms)})"
+        if criteria.after_uuid is not None:
+            conditions += " AND uuid > ?"
+            params.append(criteria.after_uuid)
+        query = SEARCH_BOOKS_QUERY.format(conditions=conditions)
+
+    if criteria.limit is not None:
+        query += " LIMIT ?"
+        params.append(criteria.limit)
+        if criteria.offset:
+            query += " OFFSET ?"
+            params.append(criteria.offset)
+
+    return query, tuple(params)
+
+
+class SqliteBookRepository(IBookRepository):
+
+    def __init__(self, path: str, catalog_version: CatalogVersion = None, busy_timeout: float = 5.0):
+        self._path = path
+        self._catalog_version = catalog_version or CatalogVersion()
+        self._busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+        db = self._connection()
+        db.execute("PRAGMA journal_mode = WAL")
+        db.executescript(SCHEMA)
+
+    @property
+    def catalog_version(self) -> CatalogVersion:
+        return self._catalog_version
+
+    def close(self):
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for db in connections:
+            db.close()
+
+    def load_sql_dump(self, path: str) -> int:
+        rows = read_sql_dump(path)
+        with self._transaction() as db:
+            db.executemany(UPSERT_BOOK_QUERY, rows)
+        if rows:
+            self._catalog_version.bump()
+        return len(rows)
+
+    def search_books(self, criteria: SearchCriteria) -> List[Book]:
+        return [Book(*row) for row in self.search_book_rows(criteria)]
+
+    def search_book_rows(self, criteria: SearchCriteria) -> List[BookRow]:
+        if criteria.is_empty():
+            return []
+
+        search = build_sqlite_search_query(criteria)
+        if search is None:
+            return []
+        return self._connection().execute(*search).fetchall()
+
+    def get_book_by_uuid(self, uuid: str) -> Book:
+        row = self._connection().execute(GET_BY_UUID_QUERY, (uuid,)).fetchone()
+        return Book(*row) if row else None
+
+    def get_books_by_uuids(self, uuids: List[str]) -> List[Optional[Book]]:
+        unique_uuids = list(dict.fromkeys(uuids))
+        if not unique_uuids:
+            return []
+
+        rows = self._select_rows(self._connection(), unique_uuids)
+        return [Book(*rows[uuid]) if uuid in rows else None for uuid in uuids]
+
+    def create_book(self, book: Book) -> str:
+        with self._transaction() as db:
+            db.execute(INSERT_BOOK_QUERY, book.get_tuple())
+        self._catalog_version.bump()
+        return book.uuid
+
+    def create_books(self, books: List[Book]) -> List[CreateBookResult]:
+        if not books:
+            return []
+
+        try:
+            with self._transaction() as db:
+                db.executemany(INSERT_BOOK_QUERY, [book.get_tuple() for book in books])
+            results = [CreateBookResult(uuid=book.uuid) for book in books]
+        except sqlite3.IntegrityError:
+            with self._transaction() as db:
+                results = [self._insert_book(db, book) for book in books]
+
+        if any(result.error is None for result in results):
+            self._catalog_version.bump()
+        return results
+
+    @staticmethod
+    def _insert_book(db: sqlite3.Connection, book: Book) -> CreateBookResult:
+        try:
+            db.execute(INSERT_BOOK_QUERY, book.get_tuple())
+        except sqlite3.IntegrityError as e:
+            return CreateBookResult(uuid=None, error=str(e))
+        return CreateBookResult(uuid=book.uuid)
+
+    def update_book(self, book: Book) -> bool:
+        with self._transaction() as db:
+            rows_affected = db.execute(UPDATE_BOOK_QUERY, (
+                book.title,
+                book.author,
+                book.genre,
+                book.book_condition,
+                book.uuid
+            )).rowcount
+        if rows_affected > 0:
+            self._catalog_version.bump()
+        return rows_affected > 0
+
+    def checkout_book(self, uuid: str) -> AvailabilityChange:
+        return self._change_availabilities([uuid], False, False)[0]
+
+    def return_book(self, uuid: str) -> AvailabilityChange:
+        return self._change_availabilities([uuid], True, False)[0]
+
+    def checkout_books(self, uuids: List[str], all_or_nothing: bool = False) -> List[AvailabilityChange]:
+        return self._change_availabilities(uuids, False, all_or_nothing)
+
+    def return_books(self, uuids: List[str], all_or_nothing: bool = False) -> List[AvailabilityChange]:
+        return self._change_availabilities(uuids, True, all_or_nothing)
+
+    def _change_availabilities(self, uuids: List[str], is_available: bool, all_or_nothing: bool) -> List[AvailabilityChange]:
+        unique_uuids = list(dict.fromkeys(uuids))
+        if not unique_uuids:
+            return []
+
+        with self._transaction() as db:
+            rows = self._select_rows(db, unique_uuids)
+            changes = {uuid: availability_change(rows.get(uuid), is_available) for uuid in unique_uuids}
+            eligible = [uuid for uuid in unique_uuids if changes[uuid].status == AvailabilityStatus.UPDATED]
+            if all_or_nothing and len(eligible) < len(unique_uuids):
+                for uuid in eligible:
+                    changes[uuid] = AvailabilityChange(status=AvailabilityStatus.ABORTED, book=Book(*rows[uuid]))
+                eligible = []
+
+            for start in range(0, len(eligible), MAX_UUIDS_PER_QUERY):
+                chunk = eligible[start:start + MAX_UUIDS_PER_QUERY]
+                db.execute(
+                    SET_AVAILABILITY_QUERY.format(placeholders=', '.join(['?'] * len(chunk))),
+                    (is_available,) + tuple(chunk)
+                )
+
+        if eligible:
+            self._catalog_version.bump()
+        return [changes[uuid] for uuid in uuids]
+
+    def delete_book(self, uuid: str) -> bool:
+        with self._transaction() as db:
+            rows_affected = db.execute(DELETE_BOOK_QUERY, (uuid,)).rowcount
+        if rows_affected > 0:
+            self._catalog_version.bump()
+        return rows_affected > 0
+
+    def get_all_books(self) -> List[Book]:
+        return [Book(*row) for row in self.get_all_book_rows()]
+
+    def get_all_book_rows(self) -> List[BookRow]:
+        return self._connection().execute(GET_ALL_BOOKS_QUERY).fetchall()
+
+    def get_books_page(self, after_uuid: str, limit: int) -> List[Book]:
+        return [Book(*row) for row in self.get_book_rows_page(after_uuid, limit)]
+
+    def get_book_rows_page(self, after_uuid: str, limit: int) -> List[BookRow]:
+        db = self._connection()
+        if after_uuid is None:
+            return db.execute(GET_FIRST_BOOKS_PAGE_QUERY, (limit,)).fetchall()
+        return db.execute(GET_BOOKS_PAGE_QUERY, (after_uuid, limit)).fetchall()
+
+    def get_inventory_summary(self) -> dict:
+        total_books, available_books = self._connection().execute(INVENTORY_SUMMARY_QUERY).fetchone()
+        return {
+            'total_books': total_books,
+            'available_books': available_books,
+            'checked_out_books': total_books - available_books
+        }
+
+    def iter_all_books(self, batch_size: int) -> Iterator[List[Book]]:
+        return self._iter_query(GET_ALL_BOOKS_QUERY, (), batch_size)
+
+    def iter_search_books(self, criteria: SearchCriteria, batch_size: int) -> Iterator[List[Book]]:
+        if criteria.is_empty():
+            return iter(())
+
+        search = build_sqlite_search_query(criteria)
+        if search is None:
+            return iter(())
+        return self._iter_query(*search, batch_size)
+
+    @staticmethod
+    def _select_rows(db: sqlite3.Connection, uuids: List[str]) -> dict:
+        rows = {}
+        for start in range(0, len(uuids), MAX_UUIDS_PER_QUERY):
+            chunk = uuids[start:start + MAX_UUIDS_PER_QUERY]
+            query = GET_BY_UUIDS_QUERY.format(placeholders=', '.join(['?'] * len(chunk)))
+            for row in db.execute(query, tuple(chunk)):
+                rows[row[0]] = row
+        return rows
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self._path, timeout=self._busy_timeout, isolation_level=None, check_same_thread=False)
+        db.execute("PRAGMA synchronous = NORMAL")
+        return db
+
+    def _connection(self) -> sqlite3.Connection:
+        db = getattr(self._local, 'connection', None)
+        if db is None:
+            db = self._connect()
+            self._local.connection = db
+            with self._lock:
+                self._connections.append(db)
+        return db
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        db = self._connection()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            yield db
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        db.execute("COMMIT")
+
+    def _iter_query(self, query: str, params: tuple, batch_size: int) -> Iterator[List[Book]]:
+        db = self._connect()
+        try:
+            cursor = db.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield [Book(*row) for row in rows]
+        finally:
+            db.close()
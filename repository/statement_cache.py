@@ -0,0 +1,132 @@
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Optional
+
+import mysql.connector
+
+
+UNKNOWN_STATEMENT_HANDLER = 1243
+
+
+class _ConnectionStatements:
+
+    def __init__(self, connection_id: int):
+        self.connection_id = connection_id
+        self.cursors = OrderedDict()
+
+
+class StatementCursor:
+
+    def __init__(self, cache: 'StatementCache', connection, statements: _ConnectionStatements):
+        self._cache = cache
+        self._connection = connection
+        self._statements = statements
+        self._rows = []
+        self._position = 0
+        self.rowcount = -1
+        self.lastrowid = None
+
+    def execute(self, sql: str, params: tuple = ()):
+        sql, cursor = self._cache._prepared(self._connection, self._statements, sql)
+        try:
+            cursor.execute(sql, params)
+        except mysql.connector.Error as e:
+            if e.errno != UNKNOWN_STATEMENT_HANDLER:
+                raise
+            sql, cursor = self._cache._reprepare(self._connection, self._statements, sql)
+            cursor.execute(sql, params)
+
+        self._rows = cursor.fetchall() if cursor.with_rows else []
+        self._position = 0
+        self.rowcount = cursor.rowcount
+        self.lastrowid = cursor.lastrowid
+
+    def fetchone(self) -> Optional[tuple]:
+        if self._position >= len(self._rows):
+            return None
+        row = self._rows[self._position]
+        self._position += 1
+        return row
+
+    def fetchall(self) -> list:
+        rows = self._rows[self._position:]
+        self._position = len(self._rows)
+        return rows
+
+    def close(self):
+        self._rows = []
+        self._position = 0
+
+
+class StatementCache:
+
+    def __init__(self, max_size: int = 64):
+        if max_size < 1:
+            raise ValueError("max_size must be positive")
+
+        self._max_size = max_size
+        self._connections = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+        self._hits = 0
+        self._prepares = 0
+        self._reprepares = 0
+        self._evictions = 0
+
+    def cursor(self, connection) -> StatementCursor:
+        connection_id = connection.connection_id
+        with self._lock:
+            statements = self._connections.get(connection)
+            if statements is None or statements.connection_id != connection_id:
+                statements = _ConnectionStatements(connection_id)
+                self._connections[connection] = statements
+        return StatementCursor(self, connection, statements)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._prepares
+            return {
+                'connections': len(self._connections),
+                'max_size': self._max_size,
+                'hits': self._hits,
+                'prepares': self._prepares,
+                'reprepares': self._reprepares,
+                'evictions': self._evictions,
+                'hit_ratio': self._hits / lookups if lookups else 0.0
+            }
+
+    def _prepared(self, connection, statements: _ConnectionStatements, sql: str):
+        entry = statements.cursors.get(sql)
+        if entry is not None:
+            statements.cursors.move_to_end(sql)
+            with self._lock:
+                self._hits += 1
+            return entry
+
+        entry = (sql, connection.cursor(prepared=True))
+        statements.cursors[sql] = entry
+        evicted = 0
+        while len(statements.cursors) > self._max_size:
+            _, (_, evicted_cursor) = statements.cursors.popitem(last=False)
+            evicted_cursor.close()
+            evicted += 1
+
+        with self._lock:
+            self._prepares += 1
+            self._evictions += evicted
+        return entry
+
+    def _reprepare(self, connection, statements: _ConnectionStatements, sql: str):
+        statements.cursors.pop(sql, None)
+        with self._lock:
+            self._reprepares += 1
+        return self._prepared(connection, statements, sql)
+
+
+def create_statement_cache() -> Optional[StatementCache]:
+    if os.getenv('PREPARED_STATEMENTS', '0').lower() not in ('1', 'true', 'yes'):
+        return None
+
+    return StatementCache(max_size=int(os.getenv('PREPARED_STATEMENT_CACHE_SIZE', '64')))
@@ -0,0 +1,23 @@
+import grpc
+import pytest
+
+
+class FakeContext:
+
+    def __init__(self):
+        self.code = grpc.StatusCode.OK
+        self.details = ''
+
+    def set_code(self, code):
+        self.code = code
+
+    def set_details(self, details):
+        self.details = details
+
+    def set_trailing_metadata(self, metadata):
+        pass
+
+
+@pytest.fixture
+def context():
+    return FakeContext()
@@ -0,0 +1,68 @@
+import asyncio
+import grpc
+import pytest
+from handler import AdminHandler, AsyncAdminHandler
+from profiling import SamplingProfiler, SlowQueryLog
+from proto import admin_pb2
+from tracing import TraceBuffer, Tracer
+
+
+def call_handler(handler, method: str, request, context):
+    response = getattr(handler, method)(request, context)
+    if asyncio.iscoroutine(response):
+        response = asyncio.run(response)
+    return response
+
+
+@pytest.fixture(params=[AdminHandler, AsyncAdminHandler])
+def handler_class(request):
+    return request.param
+
+
+@pytest.mark.parametrize('method, request_message, details', [
+    ('GetServerStats', admin_pb2.GetServerStatsRequest(), "Metrics are disabled"),
+    ('GetTraces', admin_pb2.GetTracesRequest(), "Trace buffer is disabled"),
+    ('Profile', admin_pb2.ProfileRequest(durationSeconds=1), "Profiler is disabled"),
+    ('GetSlowQueries', admin_pb2.GetSlowQueriesRequest(), "Slow query log is disabled")
+])
+def test_disabled_components(handler_class, context, method, request_message, details):
+    call_handler(handler_class(tracer=Tracer()), method, request_message, context)
+
+    assert context.code == grpc.StatusCode.FAILED_PRECONDITION
+    assert context.details == details
+
+
+def test_get_traces(handler_class, context):
+    handler = handler_class(tracer=Tracer(buffer=TraceBuffer(10)))
+
+    response = call_handler(handler, 'GetTraces', admin_pb2.GetTracesRequest(), context)
+    assert context.code == grpc.StatusCode.OK and list(response.traces) == []
+
+    call_handler(handler, 'GetTraces', admin_pb2.GetTracesRequest(limit=-1), context)
+    assert context.code == grpc.StatusCode.INVALID_ARGUMENT
+
+
+def test_profile_errors(handler_class, context):
+    profiler = SamplingProfiler()
+    handler = handler_class(profiler=profiler)
+
+    call_handler(handler, 'Profile', admin_pb2.ProfileRequest(durationSeconds=0), context)
+    assert context.code == grpc.StatusCode.INVALID_ARGUMENT
+
+    profiler._running.acquire()
+    try:
+        call_handler(handler, 'Profile', admin_pb2.ProfileRequest(durationSeconds=0.05), context)
+    finally:
+        profiler._running.release()
+    assert context.code == grpc.StatusCode.FAILED_PRECONDITION
+    assert context.details == "A profile is already running"
+
+
+def test_get_slow_queries(handler_class, context):
+    handler = handler_class(slow_queries=SlowQueryLog(0.1))
+
+    response = call_handler(handler, 'GetSlowQueries', admin_pb2.GetSlowQueriesRequest(), context)
+    assert context.code == grpc.StatusCode.OK and response.thresholdMs == 100
+
+    call_handler(handler, 'GetSlowQueries', admin_pb2.GetSlowQueriesRequest(limit=-1), context)
+    assert context.code == grpc.StatusCode.INVALID_ARGUMENT
@@ -0,0 +1,394 @@
+import os
+import sys
+import threading
+import pytest
+from controller import LibraryController
+from models.book import AvailabilityStatus, Book, SearchCriteria, SearchMode
+from repository import BookRepository, InMemoryBookRepository, SqliteBookRepository, create_pool
+
+
+MIGRATIONS = os.path.join(os.path.dirname(__file__), '..', 'migrations')
+
+CATALOG = [
+    Book('book-001', 'Dune', 'Frank Herbert', 'Science Fiction', True, 'Good'),
+    Book('book-002', 'Dune Messiah', 'Frank Herbert', 'Science Fiction', False, 'Worn'),
+    Book('book-003', 'The Hobbit', 'J.R.R. Tolkien', 'Fantasy', True, 'Excellent'),
+    Book('book-004', 'The Lord of the Rings', 'J.R.R. Tolkien', 'Fantasy', True, 'Good'),
+    Book('book-005', 'Neuromancer', 'William Gibson', 'Science Fiction', True, 'Fair'),
+    Book('book-006', '50% Off', 'Anne Writer', 'Humor', True, 'Good'),
+    Book('book-007', '500 Recipes', 'Anne Writer', 'Cooking', False, 'Good'),
+    Book('book-008', 'Untitled', 'Unknown', None, True, None)
+]
+
+
+def run_script(db, path: str, skip_inserts: bool = False):
+    with open(path) as f:
+        statements = [statement.strip() for statement in f.read().split(';') if statement.strip()]
+    cursor = db.cursor()
+    for statement in statements:
+        if skip_inserts and statement.upper().startswith('INSERT INTO BOOK_COPIES'):
+            continue
+        try:
+            cursor.execute(statement)
+        except Exception:
+            if not statement.upper().startswith('ALTER'):
+                raise
+    db.commit()
+    cursor.close()
+
+
+def mysql_repository():
+    if os.getenv('MYSQL_TESTS', '0').lower() not in ('1', 'true', 'yes'):
+        pytest.skip("set MYSQL_TESTS=1 and MYSQL_* to run the contract suite against MySQL")
+
+    pool = create_pool(min_size=1, max_size=4)
+    with pool.connection() as db:
+        run_script(db, os.path.join(MIGRATIONS, 'create_table.sql'), skip_inserts=True)
+        cursor = db.cursor()
+        cursor.execute("DELETE FROM book_copies")
+        db.commit()
+        cursor.close()
+        run_script(db, os.path.join(MIGRATIONS, 'add_fulltext_indexes.sql'))
+        run_script(db, os.path.join(MIGRATIONS, 'create_inventory_counters.sql'))
+    return BookRepository(pool), pool.close
+
+
+@pytest.fixture(params=['memory', 'sqlite', 'mysql'])
+def store(request, tmp_path):
+    if request.param == 'memory':
+        repository, close = InMemoryBookRepository(), None
+    elif request.param == 'sqlite':
+        repository = SqliteBookRepository(str(tmp_path / 'library.db'))
+        close = repository.close
+    else:
+        repository, close = mysql_repository()
+    yield repository
+    if close:
+        close()
+
+
+@pytest.fixture
+def repository(store):
+    results = store.create_books(CATALOG)
+    assert all(result.error is None for result in results)
+    return store
+
+
+def uuids(rows) -> list:
+    return [row[0] for row in rows]
+
+
+def summary(total: int, available: int) -> dict:
+    return {'total_books': total, 'available_books': available, 'checked_out_books': total - available}
+
+
+def recount(repository) -> dict:
+    books = repository.get_all_books()
+    return summary(len(books), sum(1 for book in books if book.is_available))
+
+
+def test_get_book_by_uuid(repository):
+    book = repository.get_book_by_uuid('book-001')
+
+    assert book.get_tuple()[:4] == CATALOG[0].get_tuple()[:4]
+    assert bool(book.is_available) is True
+    assert book.book_condition == 'Good'
+    assert repository.get_book_by_uuid('missing') is None
+
+
+def test_null_columns_round_trip(repository):
+    book = repository.get_book_by_uuid('book-008')
+
+    assert book.genre is None
+    assert book.book_condition is None
+
+
+def test_get_books_by_uuids_keeps_request_order(repository):
+    books = repository.get_books_by_uuids(['book-003', 'missing', 'book-001', 'book-003'])
+
+    assert [book.uuid if book else None for book in books] == ['book-003', None, 'book-001', 'book-003']
+    assert repository.get_books_by_uuids([]) == []
+
+
+def test_create_book(store):
+    book = Book('book-100', 'Emma', 'Jane Austen', 'Romance', True, 'Good')
+
+    assert store.create_book(book) == 'book-100'
+    assert store.get_book_by_uuid('book-100').title == 'Emma'
+    assert store.get_inventory_summary() == summary(1, 1)
+
+
+def test_create_duplicate_book_fails(repository):
+    with pytest.raises(Exception):
+        repository.create_book(Book('book-001', 'Other', 'Other', 'Other', True, 'Good'))
+
+    assert repository.get_book_by_uuid('book-001').title == 'Dune'
+    assert repository.get_inventory_summary() == summary(8, 6)
+
+
+def test_update_book_keeps_availability(repository):
+    updated = repository.update_book(Book('book-002', 'Dune Messiah', 'F. Herbert', 'SF', True, 'Good'))
+
+    book = repository.get_book_by_uuid('book-002')
+    assert updated is True
+    assert (book.author, book.genre, book.book_condition) == ('F. Herbert', 'SF', 'Good')
+    assert bool(book.is_available) is False
+    assert repository.update_book(Book('missing', 'T', 'A', 'G', True, 'Good')) is False
+
+
+def test_update_book_reindexes_search(repository):
+    repository.update_book(Book('book-001', 'Children of Dune', 'Frank Herbert', 'Epic', True, 'Good'))
+
+    assert uuids(repository.search_book_rows(SearchCriteria(genre='Epic'))) == ['book-001']
+    assert 'book-001' not in uuids(repository.search_book_rows(SearchCriteria(genre='Science')))
+
+
+def test_delete_book(repository):
+    assert repository.delete_book('book-002') is True
+    assert repository.get_book_by_uuid('book-002') is None
+    assert repository.delete_book('book-002') is False
+    assert 'book-002' not in uuids(repository.get_all_book_rows())
+    assert repository.get_inventory_summary() == summary(7, 6)
+
+
+def test_get_all_books(repository):
+    assert sorted(uuids(repository.get_all_book_rows())) == [book.uuid for book in CATALOG]
+    assert sorted(book.uuid for book in repository.get_all_books()) == [book.uuid for book in CATALOG]
+
+
+def test_get_all_books_in_page_order(store):
+    for book in reversed(CATALOG):
+        store.create_book(book)
+
+    paged = uuids(store.get_book_rows_page(None, len(CATALOG)))
+    assert uuids(store.get_all_book_rows()) == paged
+    assert [book.uuid for batch in store.iter_all_books(3) for book in batch] == paged
+
+
+@pytest.mark.parametrize('criteria, expected', [
+    (SearchCriteria(title='dune'), ['book-001', 'book-002']),
+    (SearchCriteria(author='TOLKIEN'), ['book-003', 'book-004']),
+    (SearchCriteria(title='Dune', genre='Fantasy'), ['book-001', 'book-002', 'book-003', 'book-004']),
+    (SearchCriteria(title='Dune', genre='Fantasy', match_all=True), []),
+    (SearchCriteria(title='Dune', author='Herbert', match_all=True), ['book-001', 'book-002']),
+    (SearchCriteria(title='the', author='Tolkien', match_all=True), ['book-003', 'book-004']),
+    (SearchCriteria(title='50%'), ['book-006']),
+    (SearchCriteria(title='missing'), []),
+    (SearchCriteria(), [])
+])
+def test_substring_search(repository, criteria, expected):
+    assert uuids(repository.search_book_rows(criteria)) == expected
+    assert [book.uuid for book in repository.search_books(criteria)] == expected
+
+
+def test_substring_search_after_uuid_and_limit(repository):
+    criteria = SearchCriteria(genre='fiction', after_uuid='book-001', limit=1)
+
+    assert uuids(repository.search_book_rows(criteria)) == ['book-002']
+
+
+@pytest.mark.parametrize('criteria, expected', [
+    (SearchCriteria(title='Dune', mode=SearchMode.FULLTEXT), {'book-001', 'book-002'}),
+    (SearchCriteria(title='Hobbit', author='Gibson', mode=SearchMode.FULLTEXT), {'book-003', 'book-005'}),
+    (SearchCriteria(title='Dune', author='Tolkien', match_all=True, mode=SearchMode.FULLTEXT), set())
+])
+def test_fulltext_search(repository, criteria, expected):
+    assert set(uuids(repository.search_book_rows(criteria))) == expected
+
+
+def test_get_book_rows_page(repository):
+    assert uuids(repository.get_book_rows_page(None, 3)) == ['book-001', 'book-002', 'book-003']
+    assert uuids(repository.get_book_rows_page('book-003', 2)) == ['book-004', 'book-005']
+    assert [book.uuid for book in repository.get_books_page('book-007', 5)] == ['book-008']
+    assert repository.get_book_rows_page('book-008', 5) == []
+
+
+def test_list_pages_cover_catalog_once(repository):
+    controller = LibraryController(repository)
+    seen = []
+    token = None
+    while True:
+        page = controller.list_book_rows(page_size=3, page_token=token)
+        seen += uuids(page.rows)
+        token = page.next_page_token
+        if not token:
+            break
+
+    assert seen == [book.uuid for book in CATALOG]
+
+
+def test_search_pages_cover_matches_once(repository):
+    controller = LibraryController(repository)
+    seen = []
+    token = None
+    while True:
+        page = controller.search_book_rows_page(genre='Fiction', page_size=2, page_token=token)
+        seen += uuids(page.rows)
+        token = page.next_page_token
+        if not token:
+            break
+
+    assert seen == ['book-001', 'book-002', 'book-005']
+
+
+def test_invalid_page_token_is_rejected(repository):
+    with pytest.raises(ValueError):
+        LibraryController(repository).list_book_rows(page_size=2, page_token='not-a-token')
+
+
+def test_checkout_and_return(repository):
+    change = repository.checkout_book('book-001')
+    assert change.status == AvailabilityStatus.UPDATED
+    assert change.book.title == 'Dune'
+    assert bool(repository.get_book_by_uuid('book-001').is_available) is False
+
+    assert repository.checkout_book('book-001').status == AvailabilityStatus.ALREADY_CHECKED_OUT
+    assert repository.checkout_book('missing').status == AvailabilityStatus.NOT_FOUND
+    assert repository.return_book('book-001').status == AvailabilityStatus.UPDATED
+    assert repository.return_book('book-001').status == AvailabilityStatus.ALREADY_AVAILABLE
+    assert repository.return_book('missing').status == AvailabilityStatus.NOT_FOUND
+    assert bool(repository.get_book_by_uuid('book-001').is_available) is True
+
+
+def test_checkout_books_partial(repository):
+    changes = repository.checkout_books(['book-001', 'book-002', 'missing'])
+
+    assert [change.status for change in changes] == [
+        AvailabilityStatus.UPDATED, AvailabilityStatus.ALREADY_CHECKED_OUT, AvailabilityStatus.NOT_FOUND
+    ]
+    assert bool(repository.get_book_by_uuid('book-001').is_available) is False
+    assert repository.get_inventory_summary() == summary(8, 5)
+
+
+def test_checkout_books_all_or_nothing(repository):
+    changes = repository.checkout_books(['book-001', 'book-002', 'book-003'], all_or_nothing=True)
+
+    assert [change.status for change in changes] == [
+        AvailabilityStatus.ABORTED, AvailabilityStatus.ALREADY_CHECKED_OUT, AvailabilityStatus.ABORTED
+    ]
+    assert bool(repository.get_book_by_uuid('book-001').is_available) is True
+    assert bool(repository.get_book_by_uuid('book-003').is_available) is True
+    assert repository.get_inventory_summary() == summary(8, 6)
+
+
+def test_return_books_all_or_nothing(repository):
+    changes = repository.return_books(['book-002', 'book-007'], all_or_nothing=True)
+    assert [change.status for change in changes] == [AvailabilityStatus.UPDATED, AvailabilityStatus.UPDATED]
+
+    changes = repository.return_books(['book-001', 'missing'], all_or_nothing=True)
+    assert [change.status for change in changes] == [
+        AvailabilityStatus.ALREADY_AVAILABLE, AvailabilityStatus.NOT_FOUND
+    ]
+    assert repository.get_inventory_summary() == summary(8, 8)
+
+
+def test_create_books_reports_only_failed_rows(repository):
+    results = repository.create_books([
+        Book('book-101', 'Emma', 'Jane Austen', 'Romance', True, 'Good'),
+        Book('book-001', 'Duplicate', 'Someone', 'Other', True, 'Good'),
+        Book('book-102', 'Persuasion', 'Jane Austen', 'Romance', False, 'Good'),
+        Book('book-101', 'Emma again', 'Jane Austen', 'Romance', True, 'Good')
+    ])
+
+    assert [result.uuid for result in results] == ['book-101', None, 'book-102', None]
+    assert results[0].error is None and results[2].error is None
+    assert results[1].error and results[3].error
+    assert repository.get_book_by_uuid('book-001').title == 'Dune'
+    assert repository.get_book_by_uuid('book-101').title == 'Emma'
+    assert repository.get_inventory_summary() == summary(10, 7)
+
+
+def test_create_books_empty(store):
+    assert store.create_books([]) == []
+    assert store.get_inventory_summary() == summary(0, 0)
+
+
+def test_inventory_counters_follow_writes(repository):
+    assert repository.get_inventory_summary() == summary(8, 6)
+
+    repository.create_book(Book('book-100', 'Emma', 'Jane Austen', 'Romance', False, 'Good'))
+    repository.checkout_book('book-001')
+    repository.return_books(['book-002', 'book-007'])
+    repository.delete_book('book-003')
+
+    assert repository.get_inventory_summary() == summary(8, 6)
+    assert repository.get_inventory_summary() == recount(repository)
+
+
+def test_iter_all_books(repository):
+    batches = list(repository.iter_all_books(3))
+
+    assert [len(batch) for batch in batches] == [3, 3, 2]
+    assert sorted(book.uuid for batch in batches for book in batch) == [book.uuid for book in CATALOG]
+
+
+def test_iter_search_books(repository):
+    batches = list(repository.iter_search_books(SearchCriteria(genre='Science'), 2))
+
+    assert [[book.uuid for book in batch] for batch in batches] == [['book-001', 'book-002'], ['book-005']]
+
+
+def test_catalog_version_moves_on_writes(repository):
+    version = repository.catalog_version.value
+
+    repository.checkout_book('book-001')
+    assert repository.catalog_version.value != version
+
+    version = repository.catalog_version.value
+    repository.checkout_book('book-001')
+    assert repository.catalog_version.value == version
+
+
+def test_concurrent_creates_and_checkouts_keep_counters(repository):
+    def create(start: int):
+        for number in range(start, start + 50):
+            repository.create_book(Book(f'new-{number:04d}', 'New', 'Author', 'Genre', True, 'Good'))
+
+    def toggle():
+        for _ in range(50):
+            repository.checkout_books(['book-001', 'book-003', 'book-004'])
+            repository.return_books(['book-001', 'book-003', 'book-004'])
+
+    threads = [threading.Thread(target=create, args=(start,)) for start in (0, 50)]
+    threads += [threading.Thread(target=toggle) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert repository.get_inventory_summary() == summary(108, 106)
+    assert repository.get_inventory_summary() == recount(repository)
+
+
+def test_readers_never_see_half_of_a_bulk_change(repository):
+    copies = ['book-001', 'book-003', 'book-004']
+    stop = threading.Event()
+    torn = []
+
+    def toggle():
+        for _ in range(1000):
+            repository.checkout_books(copies, all_or_nothing=True)
+            repository.return_books(copies, all_or_nothing=True)
+        stop.set()
+
+    def read():
+        while not stop.is_set():
+            rows = {row[0]: row[4] for row in repository.get_all_book_rows()}
+            if len({rows[uuid] for uuid in copies}) > 1:
+                torn.append(rows)
+            counts = repository.get_inventory_summary()
+            if counts['available_books'] not in (3, 6):
+                torn.append(counts)
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=toggle), threading.Thread(target=read)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert torn == []
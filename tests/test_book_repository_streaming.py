@@ -0,0 +1,79 @@
+import mysql.connector
+from repository import BookRepository, ConnectionPool
+
+
+ROWS = [(f'book-{number:03d}', 'Title', 'Author', 'Genre', True, 'Good') for number in range(10)]
+
+
+class FakeCursor:
+
+    def __init__(self, connection):
+        self._connection = connection
+
+    def execute(self, query, params=None):
+        self._connection.pending = list(ROWS)
+
+    def fetchmany(self, size):
+        rows = self._connection.pending[:size]
+        del self._connection.pending[:size]
+        return rows
+
+    def close(self):
+        if self._connection.unread_result:
+            raise mysql.connector.InternalError("Unread result found")
+
+
+class FakeConnection:
+
+    def __init__(self):
+        self.pending = []
+        self.in_transaction = False
+        self.closed = False
+
+    @property
+    def unread_result(self) -> bool:
+        return bool(self.pending)
+
+    def consume_results(self):
+        self.pending = []
+
+    def cursor(self, buffered=None):
+        return FakeCursor(self)
+
+    def rollback(self):
+        if self.unread_result:
+            raise mysql.connector.InternalError("Unread result found")
+
+    def is_connected(self) -> bool:
+        return not self.closed
+
+    def close(self):
+        self.closed = True
+
+
+def test_closing_a_stream_early_returns_the_connection_to_the_pool():
+    connections = []
+
+    def connect():
+        connections.append(FakeConnection())
+        return connections[-1]
+
+    pool = ConnectionPool(connect, min_size=1, max_size=1)
+    repository = BookRepository(pool)
+
+    batches = repository.iter_all_books(3)
+    assert len(next(batches)) == 3
+    batches.close()
+
+    assert len(connections) == 1
+    assert not connections[0].closed
+    assert pool.stats()['idle'] == 1
+
+
+def test_finished_stream_returns_the_connection_to_the_pool():
+    pool = ConnectionPool(FakeConnection, min_size=1, max_size=1)
+    repository = BookRepository(pool)
+
+    assert sum(len(batch) for batch in repository.iter_all_books(3)) == len(ROWS)
+    assert pool.stats()['idle'] == 1
+    assert pool.stats()['size'] == 1
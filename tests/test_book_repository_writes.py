@@ -0,0 +1,274 @@
+import copy
+import re
+
+import mysql.connector
+import pytest
+
+from models.book import AvailabilityStatus, Book
+from repository import BookRepository, ConnectionPool, GroupCommitWriter
+from repository import book_repository as queries
+from repository.group_commit import SAVEPOINT_QUERY as GROUP_COMMIT_SAVEPOINT
+
+
+def placeholders(template, params):
+    return template.format(placeholders=', '.join(['%s'] * len(params)))
+
+
+class FakeDatabase:
+
+    def __init__(self, books=(), counters=None):
+        self.state = {'books': {book.uuid: book.get_tuple() for book in books}, 'counters': counters}
+        self.adjusted_slots = []
+        self.statements = []
+        self.batch_error = None
+
+    def recount(self):
+        rows = self.state['books'].values()
+        return len(rows), sum(1 for row in rows if row[4])
+
+    def counted(self):
+        counters = self.state['counters'].values()
+        return sum(total for total, _ in counters), sum(available for _, available in counters)
+
+
+class FakeCursor:
+
+    def __init__(self, connection):
+        self._connection = connection
+        self._rows = []
+        self.rowcount = -1
+
+    @property
+    def _state(self):
+        return self._connection.working
+
+    def execute(self, query, params=()):
+        self._connection.database.statements.append(query)
+        self._rows = []
+        self.rowcount = 0
+        books = self._state['books']
+        counters = self._state['counters']
+
+        if query.startswith("SAVEPOINT "):
+            self._connection.savepoints[query.split()[-1]] = copy.deepcopy(self._state)
+        elif query.startswith("ROLLBACK TO SAVEPOINT "):
+            self._connection.working = copy.deepcopy(self._connection.savepoints[query.split()[-1]])
+        elif query.startswith("RELEASE SAVEPOINT "):
+            del self._connection.savepoints[query.split()[-1]]
+        elif query == queries.CREATE_INVENTORY_COUNTERS_QUERY:
+            if counters is None:
+                self._state['counters'] = {}
+        elif query.startswith("INSERT IGNORE INTO inventory_counters"):
+            for slot in map(int, re.findall(r"\((\d+)\)", query)):
+                if slot not in counters:
+                    counters[slot] = (0, 0)
+                    self.rowcount += 1
+        elif query == queries.INSERT_BOOK_QUERY:
+            if params[0] in books:
+                raise mysql.connector.IntegrityError(msg=f"Duplicate entry '{params[0]}'", errno=1062)
+            books[params[0]] = tuple(params)
+            self.rowcount = 1
+        elif query == queries.ADJUST_INVENTORY_QUERY:
+            total_delta, available_delta, slot = params
+            total, available = counters[slot]
+            counters[slot] = (total + total_delta, available + available_delta)
+            self._connection.database.adjusted_slots.append(slot)
+        elif query in (queries.LOCK_BOOK_QUERY, queries.GET_BY_UUID_QUERY):
+            self._rows = [books[params[0]]] if params[0] in books else []
+        elif query == queries.LOCK_AVAILABILITY_QUERY:
+            self._rows = [(books[params[0]][4],)] if params[0] in books else []
+        elif query in (queries.CHECKOUT_BOOK_QUERY, queries.RETURN_BOOK_QUERY):
+            self._set_available(params, query == queries.RETURN_BOOK_QUERY)
+        elif query == placeholders(queries.LOCK_BOOKS_QUERY, params):
+            self._rows = [books[uuid] for uuid in params if uuid in books]
+        elif query in (placeholders(queries.CHECKOUT_BOOKS_QUERY, params), placeholders(queries.RETURN_BOOKS_QUERY, params)):
+            self._set_available(params, query == placeholders(queries.RETURN_BOOKS_QUERY, params))
+        elif query == queries.DELETE_BOOK_QUERY:
+            self.rowcount = 1 if books.pop(params[0], None) else 0
+        elif query == queries.LOCK_INVENTORY_COUNTERS_QUERY:
+            self._rows = [(slot,) for slot in counters]
+        elif query == queries.RECOUNT_INVENTORY_QUERY:
+            self._rows = [self._connection.database.recount()]
+        elif query == queries.RESET_INVENTORY_COUNTERS_QUERY:
+            for slot in counters:
+                counters[slot] = (0, 0)
+        elif query == queries.SET_INVENTORY_COUNTER_QUERY:
+            counters[params[2]] = (params[0], params[1])
+        elif query == queries.INVENTORY_SUMMARY_QUERY:
+            self._rows = [(sum(total for total, _ in counters.values()), sum(available for _, available in counters.values()))]
+        else:
+            raise AssertionError(f"unexpected query: {query}")
+
+    def _set_available(self, uuids, is_available):
+        books = self._state['books']
+        for uuid in uuids:
+            if uuid in books and books[uuid][4] != is_available:
+                row = books[uuid]
+                books[uuid] = row[:4] + (is_available,) + row[5:]
+                self.rowcount += 1
+
+    def executemany(self, query, rows):
+        if self._connection.database.batch_error is not None:
+            raise self._connection.database.batch_error
+        for params in rows:
+            self.execute(query, params)
+
+    def fetchone(self):
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+
+    def __init__(self, database):
+        self.database = database
+        self.working = copy.deepcopy(database.state)
+        self.savepoints = {}
+        self.in_transaction = False
+
+    def cursor(self, buffered=None):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.database.state = copy.deepcopy(self.working)
+        self.savepoints = {}
+
+    def rollback(self):
+        self.working = copy.deepcopy(self.database.state)
+        self.savepoints = {}
+
+    def is_connected(self):
+        return True
+
+    def close(self):
+        pass
+
+
+def book(uuid, is_available=True):
+    return Book(uuid, 'Title', 'Author', 'Genre', is_available, 'Good')
+
+
+def repository_for(database, group_commit=False):
+    pool = ConnectionPool(lambda: FakeConnection(database), min_size=1, max_size=1)
+    return BookRepository(pool, writer=GroupCommitWriter(pool, linger=0) if group_commit else None)
+
+
+def test_prepare_inventory_creates_and_seeds_missing_counters():
+    database = FakeDatabase([book('a'), book('b', is_available=False), book('c')])
+    repository = repository_for(database)
+
+    assert repository.prepare_inventory()
+
+    assert sorted(database.state['counters']) == list(range(queries.INVENTORY_COUNTER_SLOTS))
+    assert database.counted() == (3, 2)
+    assert repository.get_inventory_summary() == {'total_books': 3, 'available_books': 2, 'checked_out_books': 1}
+
+
+def test_prepare_inventory_skips_the_recount_when_counters_exist():
+    counters = {slot: (0, 0) for slot in range(queries.INVENTORY_COUNTER_SLOTS)}
+    counters[3] = (1, 1)
+    database = FakeDatabase([book('a')], counters=counters)
+    repository = repository_for(database)
+
+    assert not repository.prepare_inventory()
+
+    assert queries.RECOUNT_INVENTORY_QUERY not in database.statements
+    assert database.state['counters'][3] == (1, 1)
+
+
+@pytest.mark.parametrize('write', [
+    lambda repository: repository.create_book(book('new')),
+    lambda repository: repository.create_book(book('new', is_available=False)),
+    lambda repository: repository.create_books([book('new'), book('other', is_available=False)]),
+    lambda repository: repository.checkout_book('a'),
+    lambda repository: repository.return_book('b'),
+    lambda repository: repository.checkout_books(['a', 'c', 'missing']),
+    lambda repository: repository.return_books(['b']),
+    lambda repository: repository.delete_book('a'),
+    lambda repository: repository.delete_book('b'),
+])
+def test_writes_adjust_one_counter_slot(write):
+    database = FakeDatabase([book('a'), book('b', is_available=False), book('c')])
+    repository = repository_for(database)
+    repository.prepare_inventory()
+
+    write(repository)
+
+    assert len(database.adjusted_slots) == 1
+    assert 0 <= database.adjusted_slots[0] < queries.INVENTORY_COUNTER_SLOTS
+    assert database.counted() == database.recount()
+
+
+def test_writes_that_change_nothing_leave_the_counters_alone():
+    database = FakeDatabase([book('a', is_available=False), book('b')])
+    repository = repository_for(database)
+    repository.prepare_inventory()
+
+    assert repository.checkout_book('a').status == AvailabilityStatus.ALREADY_CHECKED_OUT
+    assert repository.checkout_books(['b', 'missing'], all_or_nothing=True)[0].status == AvailabilityStatus.ABORTED
+    assert not repository.delete_book('missing')
+
+    assert database.adjusted_slots == []
+    assert database.counted() == (2, 1)
+
+
+def test_writes_spread_over_the_counter_slots():
+    database = FakeDatabase()
+    repository = repository_for(database)
+    repository.prepare_inventory()
+
+    for number in range(200):
+        repository.create_book(book(f'book-{number:03d}'))
+
+    assert len(set(database.adjusted_slots)) > 1
+    assert database.counted() == (200, 200)
+
+
+@pytest.mark.parametrize('group_commit', [False, True])
+def test_create_books_retries_row_by_row_after_a_duplicate(group_commit):
+    database = FakeDatabase([book('a')])
+    repository = repository_for(database, group_commit)
+    repository.prepare_inventory()
+
+    results = repository.create_books([book('new'), book('a'), book('other', is_available=False)])
+
+    assert [result.uuid for result in results] == ['new', None, 'other']
+    assert "Duplicate entry 'a'" in results[1].error
+    assert sorted(database.state['books']) == ['a', 'new', 'other']
+    assert database.counted() == (3, 2)
+    assert repository.catalog_version.value == 1
+
+
+@pytest.mark.parametrize('group_commit', [False, True])
+def test_create_books_raises_errors_other_than_constraint_violations(group_commit):
+    database = FakeDatabase([book('a')])
+    repository = repository_for(database, group_commit)
+    repository.prepare_inventory()
+    database.batch_error = mysql.connector.OperationalError(msg="Lost connection to MySQL server", errno=2013)
+
+    with pytest.raises(mysql.connector.OperationalError):
+        repository.create_books([book('new'), book('other')])
+
+    assert queries.INSERT_BOOK_QUERY not in database.statements
+    assert sorted(database.state['books']) == ['a']
+    assert database.counted() == (1, 1)
+    assert repository.catalog_version.value == 0
+
+
+def test_create_books_goes_through_the_group_commit_writer():
+    database = FakeDatabase([book('a')])
+    repository = repository_for(database, group_commit=True)
+    repository.prepare_inventory()
+
+    repository.create_books([book('new'), book('a')])
+    repository.checkout_book('new')
+
+    assert database.statements.count(GROUP_COMMIT_SAVEPOINT) == 2
+    assert sorted(database.state['books']) == ['a', 'new']
+    assert database.counted() == (2, 1)
@@ -0,0 +1,67 @@
+import multiprocessing
+import pytest
+from models.book import Book
+from repository import CachingBookRepository, CatalogVersion, LRUCache, SharedCatalogVersion, SqliteBookRepository
+
+
+DUNE = Book('book-001', 'Dune', 'Frank Herbert', 'Science Fiction', True, 'Good')
+
+
+def bump(catalog_version: SharedCatalogVersion, times: int):
+    for _ in range(times):
+        catalog_version.bump()
+
+
+@pytest.fixture
+def stores(tmp_path):
+    path = str(tmp_path / 'library.db')
+    catalog_version = SharedCatalogVersion()
+    repositories = [SqliteBookRepository(path, catalog_version=catalog_version) for _ in range(2)]
+    yield [CachingBookRepository(repository, LRUCache(16, ttl=600), versioned=True) for repository in repositories]
+    for repository in repositories:
+        repository.close()
+
+
+def test_unversioned_cache_keeps_entries_written_by_other_stores(tmp_path):
+    path = str(tmp_path / 'library.db')
+    writer = SqliteBookRepository(path)
+    reader = CachingBookRepository(SqliteBookRepository(path), LRUCache(16, ttl=600))
+    writer.create_book(DUNE)
+    assert reader.get_book_by_uuid('book-001').is_available
+
+    writer.checkout_book('book-001')
+    assert reader.get_book_by_uuid('book-001').is_available
+
+
+def test_versioned_cache_sees_writes_from_other_stores(stores):
+    writer, reader = stores
+    writer.create_book(DUNE)
+    assert reader.get_book_by_uuid('book-001').is_available
+    assert reader.get_books_by_uuids(['book-001'])[0].is_available
+
+    writer.checkout_book('book-001')
+    assert not reader.get_book_by_uuid('book-001').is_available
+    assert not reader.get_books_by_uuids(['book-001'])[0].is_available
+
+
+def test_versioned_cache_hits_until_the_next_write(stores):
+    writer, reader = stores
+    writer.create_book(DUNE)
+    reader.get_book_by_uuid('book-001')
+    reader.get_book_by_uuid('book-001')
+    assert reader.cache_stats()['hits'] == 1
+
+
+def test_shared_catalog_version_is_bumped_across_processes():
+    catalog_version = SharedCatalogVersion()
+    catalog_version.bump()
+    process = multiprocessing.get_context('spawn').Process(target=bump, args=(catalog_version, 3))
+    process.start()
+    process.join(30)
+    assert process.exitcode == 0
+    assert catalog_version.value == 4
+    assert catalog_version.bump() == 5
+
+
+def test_shared_catalog_version_is_a_catalog_version():
+    assert isinstance(SharedCatalogVersion(), CatalogVersion)
@@ -0,0 +1,153 @@
+import threading
+import time
+import mysql.connector
+import pytest
+from repository import ConnectionPool, PoolClosedError, PoolTimeoutError, connect_db
+
+
+class FakeConnection:
+
+    def __init__(self):
+        self.connected = True
+        self.closed = False
+        self.in_transaction = False
+        self.rollbacks = 0
+        self.fail_rollback = False
+
+    def is_connected(self) -> bool:
+        return self.connected
+
+    def rollback(self):
+        self.rollbacks += 1
+        if self.fail_rollback:
+            raise mysql.connector.OperationalError("Lost connection to MySQL server")
+        self.in_transaction = False
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def connections(monkeypatch):
+    connections = []
+
+    def connect(**kwargs):
+        connections.append(FakeConnection())
+        return connections[-1]
+
+    monkeypatch.setattr(mysql.connector, 'connect', connect)
+    return connections
+
+
+def test_min_size_connections_are_opened_up_front(connections):
+    pool = ConnectionPool(connect_db, min_size=2, max_size=4)
+
+    assert len(connections) == 2
+    assert pool.stats()['idle'] == 2
+
+
+def test_pool_grows_up_to_max_size_then_times_out(connections):
+    pool = ConnectionPool(connect_db, min_size=0, max_size=2, checkout_timeout=0.05)
+    first, second = pool.acquire(), pool.acquire()
+
+    assert first is not second and len(connections) == 2
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire()
+    stats = pool.stats()
+    assert (stats['size'], stats['in_use'], stats['timeouts']) == (2, 2, 1)
+
+
+def test_waiter_gets_a_released_connection(connections):
+    pool = ConnectionPool(connect_db, min_size=1, max_size=1, checkout_timeout=5)
+    conn = pool.acquire()
+    acquired = []
+
+    waiter = threading.Thread(target=lambda: acquired.append(pool.acquire()))
+    waiter.start()
+    time.sleep(0.05)
+    pool.release(conn)
+    waiter.join(5)
+
+    assert acquired == [conn]
+    stats = pool.stats()
+    assert (stats['checkouts'], stats['waited_checkouts']) == (2, 1)
+    assert stats['wait_time_max_ms'] >= 40
+
+
+def test_dead_idle_connection_is_replaced(connections):
+    pool = ConnectionPool(connect_db, min_size=1, max_size=1, liveness_check_after=0)
+    connections[0].connected = False
+
+    conn = pool.acquire()
+
+    assert conn is connections[1]
+    assert connections[0].closed
+    assert pool.stats()['replaced_connections'] == 1
+
+
+def test_recently_used_connection_skips_the_liveness_check(connections):
+    pool = ConnectionPool(connect_db, min_size=1, max_size=1, liveness_check_after=60)
+    connections[0].connected = False
+
+    assert pool.acquire() is connections[0]
+
+
+def test_exception_rolls_back_and_returns_the_connection(connections):
+    pool = ConnectionPool(connect_db, min_size=1, max_size=1)
+
+    with pytest.raises(RuntimeError):
+        with pool.connection():
+            raise RuntimeError("query failed")
+
+    assert connections[0].rollbacks == 1
+    assert pool.stats()['idle'] == 1
+    with pool.connection() as conn:
+        assert conn is connections[0]
+
+
+def test_open_transaction_is_rolled_back_on_release(connections):
+    pool = ConnectionPool(connect_db, min_size=1, max_size=1)
+
+    with pool.connection() as conn:
+        conn.in_transaction = True
+
+    assert connections[0].rollbacks == 1
+
+
+def test_broken_connection_is_dropped_on_release(connections):
+    pool = ConnectionPool(connect_db, min_size=1, max_size=1)
+
+    with pytest.raises(RuntimeError):
+        with pool.connection() as conn:
+            conn.fail_rollback = True
+            raise RuntimeError("query failed")
+
+    assert connections[0].closed
+    assert pool.stats()['size'] == 0
+    assert pool.acquire() is connections[1]
+
+
+def test_failed_connect_frees_its_slot(monkeypatch):
+    def refuse(**kwargs):
+        raise mysql.connector.InterfaceError("Can't connect to MySQL server")
+
+    monkeypatch.setattr(mysql.connector, 'connect', refuse)
+    pool = ConnectionPool(connect_db, min_size=0, max_size=1, checkout_timeout=0.05)
+
+    for _ in range(2):
+        with pytest.raises(mysql.connector.InterfaceError):
+            pool.acquire()
+    assert pool.stats()['size'] == 0
+
+
+def test_close_closes_idle_and_returned_connections(connections):
+    pool = ConnectionPool(connect_db, min_size=2, max_size=2)
+    conn = pool.acquire()
+
+    pool.close()
+    assert [c.closed for c in connections] == [True, False]
+    pool.release(conn)
+    assert conn.closed
+    assert pool.stats()['size'] == 0
+    with pytest.raises(PoolClosedError):
+        pool.acquire()
@@ -0,0 +1,65 @@
+import asyncio
+import threading
+import time
+from concurrent import futures
+import pytest
+from models.book import Book
+from repository import ExecutorBookRepository, InMemoryBookRepository
+
+
+class SlowStreamRepository(InMemoryBookRepository):
+
+    def __init__(self):
+        super().__init__()
+        self.started_slow_batch = threading.Event()
+        self.closed = threading.Event()
+
+    def iter_all_books(self, batch_size: int):
+        try:
+            yield [Book('book-001', 'Dune', 'Frank Herbert', 'Science Fiction', True, 'Good')]
+            self.started_slow_batch.set()
+            time.sleep(0.3)
+            yield [Book('book-002', 'Dune Messiah', 'Frank Herbert', 'Science Fiction', True, 'Good')]
+        finally:
+            self.closed.set()
+
+
+@pytest.fixture
+def executor():
+    executor = futures.ThreadPoolExecutor(max_workers=4)
+    yield executor
+    executor.shutdown()
+
+
+def test_cancel_during_slow_batch_closes_stream(executor):
+    repository = SlowStreamRepository()
+    store = ExecutorBookRepository(repository, executor)
+
+    async def consume(batches: list):
+        async for batch in store.iter_all_books(1):
+            batches.append(batch)
+
+    async def cancel_during_slow_batch():
+        batches = []
+        task = asyncio.create_task(consume(batches))
+        await asyncio.get_running_loop().run_in_executor(None, repository.started_slow_batch.wait, 5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return batches
+
+    batches = asyncio.run(cancel_during_slow_batch())
+
+    assert [[book.uuid for book in batch] for batch in batches] == [['book-001']]
+    assert repository.closed.is_set()
+
+
+def test_stream_reads_every_batch(executor):
+    repository = InMemoryBookRepository(
+        [Book(f'book-{number:03d}', 'Title', 'Author', 'Genre', True, 'Good') for number in range(5)])
+    store = ExecutorBookRepository(repository, executor)
+
+    async def consume():
+        return [[book.uuid for book in batch] async for batch in store.iter_all_books(2)]
+
+    assert asyncio.run(consume()) == [['book-000', 'book-001'], ['book-002', 'book-003'], ['book-004']]
@@ -0,0 +1,152 @@
+import threading
+import time
+import pytest
+from repository import ConnectionPool, GroupCommitClosedError, GroupCommitWriter
+
+
+class FakeCursor:
+
+    def __init__(self, connection):
+        self._connection = connection
+
+    def execute(self, query, params=None):
+        connection = self._connection
+        if query.startswith('SAVEPOINT'):
+            connection.savepoint = len(connection.working)
+        elif query.startswith('ROLLBACK TO'):
+            del connection.working[connection.savepoint:]
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+
+    def __init__(self):
+        self.working = []
+        self.committed = []
+        self.commits = 0
+        self.savepoint = 0
+        self.fail_commit = False
+        self.in_transaction = False
+
+    def cursor(self, buffered=None):
+        return FakeCursor(self)
+
+    def commit(self):
+        if self.fail_commit:
+            raise ConnectionError("Lost connection to MySQL server")
+        self.commits += 1
+        self.committed += self.working
+        self.working = []
+
+    def rollback(self):
+        self.working = []
+
+    def is_connected(self) -> bool:
+        return True
+
+    def close(self):
+        pass
+
+
+def insert(db, value):
+    db.working.append(value)
+    return 1
+
+
+def failing_insert(db, value):
+    db.working.append(value)
+    raise ValueError(f"Duplicate entry '{value}'")
+
+
+@pytest.fixture
+def connection():
+    return FakeConnection()
+
+
+@pytest.fixture
+def pool(connection):
+    pool = ConnectionPool(lambda: connection, min_size=1, max_size=1)
+    yield pool
+    pool.close()
+
+
+def test_failed_operation_rolls_back_only_itself(pool, connection):
+    writer = GroupCommitWriter(pool, max_ops=3, linger=5)
+    futures = [writer.submit(insert, 'a'), writer.submit(failing_insert, 'b'), writer.submit(insert, 'c')]
+
+    assert futures[0].result(5) == 1
+    assert futures[2].result(5) == 1
+    with pytest.raises(ValueError, match="Duplicate entry 'b'"):
+        futures[1].result(5)
+    writer.close()
+
+    assert connection.committed == ['a', 'c']
+    assert connection.commits == 1
+    stats = writer.stats()
+    assert (stats['batches'], stats['operations'], stats['failed_operations']) == (1, 3, 1)
+
+
+def test_max_ops_flushes_before_linger(pool, connection):
+    writer = GroupCommitWriter(pool, max_ops=2, linger=30)
+    started = time.monotonic()
+    futures = [writer.submit(insert, value) for value in 'ab']
+
+    assert [future.result(5) for future in futures] == [1, 1]
+    assert time.monotonic() - started < 5
+    assert connection.committed == ['a', 'b']
+
+    pending = writer.submit(insert, 'c')
+    time.sleep(0.05)
+    assert not pending.done()
+    writer.close()
+
+    assert pending.result(0) == 1
+    assert connection.committed == ['a', 'b', 'c']
+    assert writer.stats()['batches'] == 2
+
+
+def test_close_drains_queued_operations(pool, connection):
+    writer = GroupCommitWriter(pool, max_ops=64, linger=30)
+    futures = [writer.submit(insert, value) for value in 'abc']
+
+    writer.close()
+
+    assert all(future.done() for future in futures)
+    assert connection.committed == ['a', 'b', 'c']
+    with pytest.raises(GroupCommitClosedError):
+        writer.submit(insert, 'd')
+    writer.close()
+
+
+def test_failed_commit_fails_the_whole_batch(pool, connection):
+    connection.fail_commit = True
+    writer = GroupCommitWriter(pool, max_ops=2, linger=5)
+    futures = [writer.submit(insert, value) for value in 'ab']
+
+    for future in futures:
+        with pytest.raises(ConnectionError):
+            future.result(5)
+    writer.close()
+
+    assert connection.committed == []
+    assert writer.stats()['failed_operations'] == 2
+
+
+def test_concurrent_callers_get_their_own_results(pool, connection):
+    writer = GroupCommitWriter(pool, max_ops=8, linger=0.01)
+    results = {}
+
+    def submit(value: str):
+        results[value] = writer.submit(lambda db, v: insert(db, v) + len(v), value).result(5)
+
+    threads = [threading.Thread(target=submit, args=('x' * length,)) for length in range(1, 9)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    writer.close()
+
+    assert results == {'x' * length: 1 + length for length in range(1, 9)}
+    assert sorted(connection.committed) == sorted('x' * length for length in range(1, 9))
@@ -0,0 +1,118 @@
+import asyncio
+from concurrent import futures
+import pytest
+from controller import AsyncLibraryController, LibraryController, pagination
+from models.book import Book, SearchMode
+from repository import ExecutorBookRepository, InMemoryBookRepository
+
+
+CATALOG = [
+    Book('book-001', 'Dune', 'Frank Herbert', 'Science Fiction', True, 'Good'),
+    Book('book-002', 'Dune Messiah', 'Frank Herbert', 'Science Fiction', False, 'Worn'),
+    Book('book-003', 'The Hobbit', 'J.R.R. Tolkien', 'Fantasy', True, 'Excellent')
+]
+
+
+async def entries_of(entries):
+    for entry in entries:
+        yield entry
+
+
+@pytest.fixture(params=['sync', 'async'])
+def call(request):
+    repository = InMemoryBookRepository(CATALOG)
+    if request.param == 'sync':
+        controller = LibraryController(repository, create_batch_size=2)
+        yield lambda method, *args: getattr(controller, method)(*args)
+        return
+
+    executor = futures.ThreadPoolExecutor(max_workers=2)
+    controller = AsyncLibraryController(ExecutorBookRepository(repository, executor), create_batch_size=2)
+
+    def run(method, *args):
+        if method == 'add_books':
+            args = (entries_of(args[0]),)
+        return asyncio.run(getattr(controller, method)(*args))
+
+    yield run
+    executor.shutdown()
+
+
+def test_search_without_terms_is_empty(call):
+    assert call('search_books') == []
+    assert call('search_book_rows_page').rows == []
+
+
+def test_search_pages(call):
+    first = call('search_book_rows_page', None, 'Frank Herbert', None, False, SearchMode.SUBSTRING, 1)
+    assert len(first.rows) == 1 and first.next_page_token
+    second = call('search_book_rows_page', None, 'Frank Herbert', None, False, SearchMode.SUBSTRING, 1,
+                  first.next_page_token)
+    assert len(second.rows) == 1 and not second.next_page_token
+    assert first.rows[0] != second.rows[0]
+
+
+def test_ranked_pages_stop_at_the_offset_cap():
+    rows = [book.get_tuple() for book in CATALOG]
+    assert pagination.make_ranked_page(rows, 2, 0).next_page_token == pagination.encode_offset_token(2)
+    assert not pagination.make_ranked_page(rows, 2, pagination.MAX_RANKED_OFFSET - 2).next_page_token
+
+    assert pagination.decode_offset_token(pagination.encode_offset_token(pagination.MAX_RANKED_OFFSET - 1)) == pagination.MAX_RANKED_OFFSET - 1
+    with pytest.raises(ValueError, match="invalid page_token"):
+        pagination.decode_offset_token(pagination.encode_offset_token(pagination.MAX_RANKED_OFFSET))
+
+
+def test_checkout_and_return(call):
+    loan = call('checkout_book', 'user-1', 'book-001', 14)
+    assert loan['book_title'] == 'Dune' and loan['loan_id'] and loan['due_date']
+
+    with pytest.raises(ValueError, match="not available"):
+        call('checkout_book', 'user-1', 'book-001', 14)
+    assert call('return_book', 'book-001') is True
+    with pytest.raises(ValueError, match="already available"):
+        call('return_book', 'book-001')
+
+
+@pytest.mark.parametrize('user_id, copy_uuid, loan_time_days', [('', 'book-001', 14), ('user-1', 'book-001', 0)])
+def test_checkout_validation(call, user_id, copy_uuid, loan_time_days):
+    with pytest.raises(ValueError):
+        call('checkout_book', user_id, copy_uuid, loan_time_days)
+
+
+def test_bulk_checkout_and_return(call):
+    results = call('checkout_books', 'user-1', ['book-001', 'book-002'], 7)
+    assert [result['success'] for result in results] == [True, False]
+    assert 'not available' in results[1]['error']
+
+    results = call('return_books', ['book-001', 'book-003'])
+    assert [result['success'] for result in results] == [True, False]
+
+    with pytest.raises(ValueError, match="unique"):
+        call('return_books', ['book-001', 'book-001'])
+
+
+def test_add_books_keeps_order_across_batches(call):
+    entries = [
+        ('New 1', 'Author', 'Genre', ''),
+        ('', 'Author', 'Genre', ''),
+        ('New 2', 'Author', '', 'Worn'),
+        ('New 3', 'Author', 'Genre', 'Good')
+    ]
+    results = call('add_books', entries)
+
+    assert [result.error is None for result in results] == [True, False, True, True]
+    books = call('get_books_details', [results[0].uuid, results[2].uuid])
+    assert [book.title for book in books] == ['New 1', 'New 2']
+    assert books[1].book_condition == 'Worn'
+
+
+def test_update_and_remove(call):
+    assert call('update_book', 'book-003', None, None, None, 'Worn')
+    book = call('get_book_details', 'book-003')
+    assert (book.title, book.book_condition) == ('The Hobbit', 'Worn')
+
+    assert call('remove_book', 'book-003')
+    with pytest.raises(ValueError, match="not found"):
+        call('get_book_details', 'book-003')
+    with pytest.raises(ValueError, match="not found"):
+        call('update_book', 'book-003', 'Title')
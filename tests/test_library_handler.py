@@ -0,0 +1,119 @@
+import asyncio
+from concurrent import futures
+import grpc
+import pytest
+from controller import LibraryController, AsyncLibraryController
+from handler import LibraryHandler, AsyncLibraryHandler
+from models.book import Book
+from proto import library_pb2
+from repository import ExecutorBookRepository, InMemoryBookRepository
+from conftest import FakeContext
+
+
+NULL_COLUMNS_DUMP = """
+INSERT INTO book_copies (uuid, title, author, genre, is_available, book_condition) VALUES
+('book-001', 'Dune', 'Frank Herbert', NULL, TRUE, NULL),
+('book-002', 'Dune', 'Frank Herbert', 'Science Fiction', TRUE, 'Good');
+"""
+
+
+def seeded_repository(tmp_path) -> InMemoryBookRepository:
+    dump = tmp_path / 'seed.sql'
+    dump.write_text(NULL_COLUMNS_DUMP)
+    repository = InMemoryBookRepository()
+    repository.load_sql_dump(str(dump))
+    return repository
+
+
+@pytest.fixture
+def repository(tmp_path):
+    return seeded_repository(tmp_path)
+
+
+@pytest.fixture
+def executor():
+    executor = futures.ThreadPoolExecutor(max_workers=2)
+    yield executor
+    executor.shutdown()
+
+
+REQUESTS = [
+    ('GetAllBooks', library_pb2.GetAllBooksRequest(), 'books'),
+    ('GetAllBooks', library_pb2.GetAllBooksRequest(pageSize=10), 'books'),
+    ('SearchBook', library_pb2.SearchBookRequest(bookName='Dune'), 'avaliableCopies'),
+    ('SearchBook', library_pb2.SearchBookRequest(bookName='Dune', pageSize=10), 'avaliableCopies')
+]
+
+
+def assert_null_columns_empty(response, field: str):
+    copies = {copy.uuid: copy for copy in getattr(response, field)}
+    assert copies['book-001'].genre == ''
+    assert copies['book-001'].condition == ''
+    assert copies['book-002'].genre == 'Science Fiction'
+
+
+@pytest.mark.parametrize('method, request_message, field', REQUESTS)
+def test_null_columns_are_sent_as_empty_strings(repository, context, method, request_message, field):
+    handler = LibraryHandler(LibraryController(repository))
+
+    response = getattr(handler, method)(request_message, context)
+
+    assert context.code == grpc.StatusCode.OK, context.details
+    assert_null_columns_empty(response, field)
+
+
+@pytest.mark.parametrize('method, request_message, field', REQUESTS)
+def test_async_null_columns_are_sent_as_empty_strings(repository, executor, context, method, request_message, field):
+    handler = AsyncLibraryHandler(AsyncLibraryController(ExecutorBookRepository(repository, executor)))
+
+    response = asyncio.run(getattr(handler, method)(request_message, context))
+
+    assert context.code == grpc.StatusCode.OK, context.details
+    assert_null_columns_empty(response, field)
+
+
+def test_get_book_with_null_columns(repository, context):
+    handler = LibraryHandler(LibraryController(repository))
+
+    response = handler.GetBook(library_pb2.GetBookRequest(uuid='book-001'), context)
+
+    assert context.code == grpc.StatusCode.OK, context.details
+    assert response.book.genre == ''
+    assert response.book.condition == ''
+
+
+STATUS_REQUESTS = [
+    ('SearchBook', library_pb2.SearchBookRequest(bookName='Dune', mode=7), grpc.StatusCode.INVALID_ARGUMENT),
+    ('CheckoutBook', library_pb2.CheckoutBookRequest(userId='user-1', copyUuid='book-002', loanTime=7),
+     grpc.StatusCode.OK),
+    ('CheckoutBook', library_pb2.CheckoutBookRequest(userId='user-1', copyUuid='book-009', loanTime=7),
+     grpc.StatusCode.INVALID_ARGUMENT),
+    ('ReturnBook', library_pb2.ReturnBookRequest(copyUuid='book-002'), grpc.StatusCode.INVALID_ARGUMENT),
+    ('BulkCheckout', library_pb2.BulkCheckoutRequest(userId='user-1', copyUuids=['book-001', 'book-001'], loanTime=7),
+     grpc.StatusCode.INVALID_ARGUMENT),
+    ('BulkReturn', library_pb2.BulkReturnRequest(copyUuids=['book-001']), grpc.StatusCode.OK),
+    ('CreateBook', library_pb2.CreateBookRequest(title='Dune'), grpc.StatusCode.INVALID_ARGUMENT),
+    ('GetBook', library_pb2.GetBookRequest(uuid='book-009'), grpc.StatusCode.NOT_FOUND),
+    ('BatchGetBooks', library_pb2.BatchGetBooksRequest(uuids=['book-001', '']), grpc.StatusCode.INVALID_ARGUMENT),
+    ('UpdateBook', library_pb2.UpdateBookRequest(uuid='book-009', title='Dune'), grpc.StatusCode.INVALID_ARGUMENT),
+    ('DeleteBook', library_pb2.DeleteBookRequest(uuid='book-002'), grpc.StatusCode.OK),
+    ('GetAllBooks', library_pb2.GetAllBooksRequest(pageToken='not a token'), grpc.StatusCode.INVALID_ARGUMENT),
+    ('GetInventorySummary', library_pb2.GetInventorySummaryRequest(), grpc.StatusCode.OK)
+]
+
+
+
+@pytest.mark.parametrize('method, request_message, code', STATUS_REQUESTS)
+def test_sync_and_async_handlers_agree(tmp_path, executor, method, request_message, code):
+    sync_context, async_context = FakeContext(), FakeContext()
+    sync_handler = LibraryHandler(LibraryController(seeded_repository(tmp_path)))
+    async_handler = AsyncLibraryHandler(
+        AsyncLibraryController(ExecutorBookRepository(seeded_repository(tmp_path), executor)))
+
+    sync_response = getattr(sync_handler, method)(request_message, sync_context)
+    async_response = asyncio.run(getattr(async_handler, method)(request_message, async_context))
+
+    assert sync_context.code == code, sync_context.details
+    assert (async_context.code, async_context.details) == (sync_context.code, sync_context.details)
+    if method != 'CheckoutBook':
+        assert async_response == sync_response
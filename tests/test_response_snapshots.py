@@ -0,0 +1,158 @@
+import asyncio
+import threading
+import time
+from concurrent import futures
+import grpc
+import pytest
+from controller import LibraryController
+from handler import LibraryHandler, add_library_servicer_to_server
+from handler.response_snapshots import ResponseSnapshots, library_method_handlers, serialize_response
+from models.book import Book
+from proto import library_pb2, library_pb2_grpc
+from repository import CatalogVersion, InMemoryBookRepository, LRUCache
+
+
+def response(title: str) -> library_pb2.GetAllBooksResponse:
+    return library_pb2.GetAllBooksResponse(books=[library_pb2.BookCopy(uuid='book-001', title=title)])
+
+
+@pytest.fixture
+def snapshots():
+    return ResponseSnapshots(LRUCache(16), CatalogVersion())
+
+
+def test_concurrent_misses_build_once(snapshots):
+    builds = []
+    started = threading.Event()
+
+    def build():
+        builds.append(1)
+        started.set()
+        time.sleep(0.2)
+        return response('Dune')
+
+    key = snapshots.key('GetAllBooks', 0, '')
+    results = []
+    leader = threading.Thread(target=lambda: results.append(snapshots.get_or_build(key, build)))
+    leader.start()
+    started.wait()
+    followers = [
+        threading.Thread(target=lambda: results.append(snapshots.get_or_build(key, build))) for _ in range(7)
+    ]
+    for thread in followers:
+        thread.start()
+    for thread in [leader] + followers:
+        thread.join()
+
+    assert len(builds) == 1
+    assert results == [response('Dune').SerializeToString()] * 8
+    assert snapshots.stats()['coalesced_builds'] == 7
+
+
+def test_failed_build_is_raised_and_not_cached(snapshots):
+    key = snapshots.key('GetAllBooks', 0, 'bad')
+
+    def fail():
+        raise ValueError("invalid page_token")
+
+    with pytest.raises(ValueError):
+        snapshots.get_or_build(key, fail)
+    assert snapshots.get_or_build(key, lambda: response('Dune')) == response('Dune').SerializeToString()
+
+
+def test_new_catalog_version_rebuilds():
+    catalog_version = CatalogVersion()
+    snapshots = ResponseSnapshots(LRUCache(16), catalog_version)
+    first = snapshots.get_or_build(snapshots.key('GetAllBooks'), lambda: response('Dune'))
+    catalog_version.bump()
+    second = snapshots.get_or_build(snapshots.key('GetAllBooks'), lambda: response('Emma'))
+
+    assert first != second
+
+
+def test_async_concurrent_misses_build_once(snapshots):
+    builds = []
+
+    async def build():
+        builds.append(1)
+        await asyncio.sleep(0.05)
+        return response('Dune')
+
+    async def run():
+        key = snapshots.key('GetAllBooks', 0, '')
+        return await asyncio.gather(*(snapshots.get_or_build_async(key, build) for _ in range(8)))
+
+    results = asyncio.run(run())
+
+    assert len(builds) == 1
+    assert results == [response('Dune').SerializeToString()] * 8
+
+
+def test_async_cancelled_leader_hands_build_to_follower(snapshots):
+    builds = []
+
+    async def build():
+        builds.append(1)
+        await asyncio.sleep(0.05)
+        return response('Dune')
+
+    async def run():
+        key = snapshots.key('GetAllBooks', 0, '')
+        leader = asyncio.ensure_future(snapshots.get_or_build_async(key, build))
+        await asyncio.sleep(0.01)
+        follower = asyncio.ensure_future(snapshots.get_or_build_async(key, build))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await follower
+
+    assert asyncio.run(run()) == response('Dune').SerializeToString()
+    assert len(builds) == 2
+
+
+def test_async_failed_build_reaches_followers(snapshots):
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("invalid page_token")
+
+    async def run():
+        key = snapshots.key('GetAllBooks', 0, 'bad')
+        return await asyncio.gather(
+            *(snapshots.get_or_build_async(key, fail) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(run())
+
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_every_library_method_is_registered():
+    handlers = library_method_handlers(LibraryHandler(None))
+
+    methods = library_pb2.DESCRIPTOR.services_by_name['Library'].methods
+    assert set(handlers) == {method.name for method in methods}
+    assert handlers['GetAllBooks'].response_serializer is serialize_response
+    assert handlers['StreamAllBooks'].response_streaming and not handlers['StreamAllBooks'].request_streaming
+    assert handlers['BatchCreateBooks'].request_streaming and not handlers['BatchCreateBooks'].response_streaming
+
+
+def test_server_answers_from_snapshots():
+
+    repository = InMemoryBookRepository([Book('book-001', 'Dune', 'Frank Herbert', 'Science Fiction', True, 'Good')])
+    snapshots = ResponseSnapshots(LRUCache(16), repository.catalog_version)
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=2))
+    add_library_servicer_to_server(LibraryHandler(LibraryController(repository), snapshots), server)
+    port = server.add_insecure_port('localhost:0')
+    server.start()
+    try:
+        with grpc.insecure_channel(f'localhost:{port}') as channel:
+            stub = library_pb2_grpc.LibraryStub(channel)
+            for _ in range(2):
+                response = stub.GetAllBooks(library_pb2.GetAllBooksRequest())
+                assert [book.title for book in response.books] == ['Dune']
+            batches = list(stub.StreamAllBooks(library_pb2.StreamAllBooksRequest()))
+            assert [book.uuid for batch in batches for book in batch.books] == ['book-001']
+            created = stub.BatchCreateBooks(iter([library_pb2.CreateBookRequest(title='Emma', author='Jane Austen')]))
+            assert created.createdCount == 1
+    finally:
+        server.stop(None)
+
+    assert snapshots.stats()['hits'] == 1
@@ -0,0 +1,12 @@
+from types import SimpleNamespace
+from profiling.sampler import frame_label
+
+
+def test_frame_label_uses_the_qualified_name():
+    assert frame_label(test_frame_label_uses_the_qualified_name.__code__).startswith(
+        'test_frame_label_uses_the_qualified_name (test_sampler.py:')
+
+
+def test_frame_label_falls_back_to_the_name_before_python_3_11():
+    code = SimpleNamespace(co_name='run', co_filename='/srv/library/worker.py', co_firstlineno=12)
+    assert frame_label(code) == 'run (worker.py:12)'
@@ -0,0 +1,114 @@
+from typing import List
+from models.book import Book, BookRow, SearchCriteria, SearchMode
+from repository import DelegatingBookRepository, InMemoryBookRepository, LRUCache, SearchCachingBookRepository, estimate_book_rows_size
+from repository.search_caching_book_repository import BOOK_OVERHEAD_BYTES, normalize_criteria
+
+
+BOOKS = [
+    Book('book-001', 'Dune', 'Frank Herbert', 'Science Fiction', True, 'Good'),
+    Book('book-002', 'Dune Messiah', 'Frank Herbert', 'Science Fiction', True, 'Good'),
+    Book('book-003', 'Emma', 'Jane Austen', 'Romance', True, 'Fair'),
+]
+
+
+class CountingBookRepository(DelegatingBookRepository):
+
+    def __init__(self, repository):
+        super().__init__(repository)
+        self.searches = 0
+
+    def search_book_rows(self, criteria: SearchCriteria) -> List[BookRow]:
+        self.searches += 1
+        return self._repository.search_book_rows(criteria)
+
+
+def search_cache(max_size=16, max_bytes=None):
+    store = CountingBookRepository(InMemoryBookRepository(BOOKS))
+    cache = LRUCache(max_size, ttl=600, max_bytes=max_bytes, sizeof=estimate_book_rows_size if max_bytes else None)
+    return store, SearchCachingBookRepository(store, cache)
+
+
+def test_normalize_criteria_folds_case_and_drops_empty_terms():
+    criteria = normalize_criteria(SearchCriteria(title='DUNE', author='', genre=None))
+    assert (criteria.title, criteria.author, criteria.genre) == ('dune', None, None)
+
+
+def test_normalize_criteria_collapses_whitespace_only_for_fulltext():
+    substring = normalize_criteria(SearchCriteria(title='  Dune   Messiah '))
+    fulltext = normalize_criteria(SearchCriteria(title='  Dune   Messiah ', mode=SearchMode.FULLTEXT))
+    assert substring.title == '  dune   messiah '
+    assert fulltext.title == 'dune messiah'
+
+
+def test_searches_that_normalize_alike_share_an_entry():
+    store, repository = search_cache()
+    first = repository.search_books(SearchCriteria(title='Dune', author=''))
+    second = repository.search_books(SearchCriteria(title='dUNE'))
+
+    assert [book.uuid for book in first] == [book.uuid for book in second] == ['book-001', 'book-002']
+    assert store.searches == 1
+    assert repository.search_cache_stats()['hits'] == 1
+
+
+def test_search_options_are_part_of_the_key():
+    store, repository = search_cache()
+    repository.search_books(SearchCriteria(title='dune'))
+    repository.search_books(SearchCriteria(title='dune', match_all=True))
+    repository.search_books(SearchCriteria(title='dune', limit=1))
+    repository.search_books(SearchCriteria(title='dune', after_uuid='book-001'))
+    assert store.searches == 4
+
+
+def test_estimate_book_rows_size_counts_the_strings_and_the_overhead():
+    rows = [book.get_tuple() for book in BOOKS[:1]]
+    assert estimate_book_rows_size(rows) == BOOK_OVERHEAD_BYTES + len('book-001Dune' 'Frank Herbert' 'Science Fiction' 'Good')
+    assert estimate_book_rows_size([]) == 0
+
+
+def test_cache_evicts_least_recently_used_results_past_the_byte_budget():
+    one_result = estimate_book_rows_size([BOOKS[2].get_tuple()])
+    store, repository = search_cache(max_bytes=2 * one_result)
+    repository.search_books(SearchCriteria(author='austen'))
+    repository.search_books(SearchCriteria(genre='romance'))
+    repository.search_books(SearchCriteria(author='austen'))
+    repository.search_books(SearchCriteria(title='emma'))
+
+    stats = repository.search_cache_stats()
+    assert stats['evictions'] == 1
+    assert stats['bytes'] == 2 * one_result
+    assert stats['size'] == 2
+
+    repository.search_books(SearchCriteria(author='austen'))
+    repository.search_books(SearchCriteria(genre='romance'))
+    assert store.searches == 4
+
+
+def test_results_larger_than_the_byte_budget_are_not_cached():
+    store, repository = search_cache(max_bytes=estimate_book_rows_size([BOOKS[0].get_tuple()]))
+    repository.search_books(SearchCriteria(author='herbert'))
+    repository.search_books(SearchCriteria(author='herbert'))
+
+    assert store.searches == 2
+    assert repository.search_cache_stats()['size'] == 0
+
+
+def test_writes_bump_the_catalog_version_and_miss_the_cache():
+    store, repository = search_cache()
+    assert len(repository.search_books(SearchCriteria(author='herbert'))) == 2
+
+    repository.create_book(Book('book-004', 'Children of Dune', 'Frank Herbert', 'Science Fiction', True, 'Good'))
+    assert len(repository.search_books(SearchCriteria(author='herbert'))) == 3
+
+    repository.checkout_book('book-001')
+    results = repository.search_books(SearchCriteria(author='herbert'))
+    assert not next(book for book in results if book.uuid == 'book-001').is_available
+    assert store.searches == 3
+
+
+def test_writes_that_change_nothing_keep_the_cache():
+    store, repository = search_cache()
+    repository.search_books(SearchCriteria(author='austen'))
+    repository.return_book('book-003')
+    repository.search_books(SearchCriteria(author='austen'))
+    assert store.searches == 1
+
@@ -0,0 +1,64 @@
+import pytest
+from models.book import Book, SearchCriteria, SearchMode
+from repository import SqliteBookRepository
+from repository.book_repository import build_search_query, escape_like
+
+
+BOOKS = [
+    Book('book-001', '50% Off', 'A. Writer', 'Humor', True, 'Good'),
+    Book('book-002', '500 Recipes', 'A. Writer', 'Cooking', True, 'Good'),
+    Book('book-003', 'a_b', 'B. Writer', 'Fiction', True, 'Good'),
+    Book('book-004', 'axb', 'B. Writer', 'Fiction', True, 'Good'),
+    Book('book-005', 'C:\\Games', 'C. Writer', 'Computing', True, 'Good')
+]
+
+
+@pytest.fixture
+def repository(tmp_path):
+    repository = SqliteBookRepository(str(tmp_path / 'library.db'))
+    repository.create_books(BOOKS)
+    yield repository
+    repository.close()
+
+
+def test_escape_like():
+    assert escape_like('50%') == '50\\%'
+    assert escape_like('a_b') == 'a\\_b'
+    assert escape_like('C:\\') == 'C:\\\\'
+
+
+def test_mysql_search_query_escapes_wildcards():
+    _, params = build_search_query(SearchCriteria(title='50%'))
+
+    assert params == ('%50\\%%',)
+
+
+def test_mysql_search_query_escapes_every_substring_term():
+    query, params = build_search_query(SearchCriteria(title='a_b', author='C:\\', genre='50%', match_all=True))
+
+    assert "(title LIKE %s AND author LIKE %s AND genre LIKE %s)" in query
+    assert params == ('%a\\_b%', '%C:\\\\%', '%50\\%%')
+
+
+def test_mysql_search_query_pages_escaped_terms_by_uuid():
+    query, params = build_search_query(SearchCriteria(author='_', after_uuid='book-001', limit=11))
+
+    assert query.endswith("WHERE (author LIKE %s) AND uuid > %s ORDER BY uuid LIMIT %s")
+    assert params == ('%\\_%', 'book-001', 11)
+
+
+def test_mysql_fulltext_query_passes_terms_unescaped():
+    _, params = build_search_query(SearchCriteria(title='50%', mode=SearchMode.FULLTEXT, limit=11, offset=10))
+
+    assert params == ('50%', '50%', 11, 10)
+
+
+@pytest.mark.parametrize('title, expected', [
+    ('50%', ['book-001']),
+    ('a_b', ['book-003']),
+    ('C:\\', ['book-005'])
+])
+def test_sqlite_substring_search_matches_wildcards_literally(repository, title, expected):
+    rows = repository.search_book_rows(SearchCriteria(title=title))
+
+    assert [row[0] for row in rows] == expected
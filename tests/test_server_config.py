@@ -0,0 +1,104 @@
+import json
+import pytest
+from config import PRESETS, ServerConfig, load_server_config
+
+
+def write_config(tmp_path, values) -> str:
+    path = tmp_path / 'server.json'
+    path.write_text(json.dumps(values))
+    return str(path)
+
+
+def test_defaults_without_any_settings():
+    config = load_server_config([], {})
+    assert config == ServerConfig()
+    assert config.address == '[::]:50051'
+    assert config.grpc_options() == []
+
+
+def test_preset_overrides_defaults():
+    config = load_server_config(['--preset', 'latency'], {})
+    assert config.workers == PRESETS['latency']['workers']
+    assert config.max_concurrent_rpcs == 32
+    assert ('grpc.keepalive_permit_without_calls', 1) in config.grpc_options()
+
+
+def test_file_overrides_preset(tmp_path):
+    path = write_config(tmp_path, {'preset': 'latency', 'workers': 4})
+    config = load_server_config(['--config', path], {})
+    assert config.workers == 4
+    assert config.db_pool_max_size == PRESETS['latency']['db_pool_max_size']
+
+
+def test_environment_overrides_file(tmp_path):
+    path = write_config(tmp_path, {'workers': 4, 'port': 6000})
+    config = load_server_config([], {'SERVER_CONFIG': path, 'SERVER_WORKERS': '6'})
+    assert config.workers == 6
+    assert config.port == 6000
+
+
+def test_command_line_overrides_environment(tmp_path):
+    path = write_config(tmp_path, {'workers': 4})
+    config = load_server_config(['--config', path, '--workers', '8'], {'SERVER_WORKERS': '6', 'SERVER_PORT': '7000'})
+    assert config.workers == 8
+    assert config.port == 7000
+
+
+def test_preset_precedence_follows_the_sources(tmp_path):
+    path = write_config(tmp_path, {'preset': 'latency'})
+    assert load_server_config(['--config', path], {'SERVER_PRESET': 'throughput'}).workers == 32
+    assert load_server_config(['--config', path, '--preset', 'latency'], {'SERVER_PRESET': 'throughput'}).workers == 16
+
+
+def test_empty_environment_values_are_ignored():
+    assert load_server_config([], {'SERVER_WORKERS': '', 'SERVER_MAX_CONCURRENT_RPCS': ''}) == ServerConfig()
+
+
+def test_optional_settings_parse_from_strings():
+    config = load_server_config(
+        ['--keepalive-permit-without-calls', 'yes', '--max-send-message-bytes', '-1'],
+        {'SERVER_HTTP2_BDP_PROBE': '0'})
+    assert config.keepalive_permit_without_calls is True
+    assert config.http2_bdp_probe is False
+    assert ('grpc.max_send_message_length', -1) in config.grpc_options()
+
+
+def test_several_processes_reuse_the_port():
+    assert ('grpc.so_reuseport', 1) in load_server_config(['--processes', '2'], {}).grpc_options()
+
+
+@pytest.mark.parametrize('argv, environ, message', [
+    ([], {'SERVER_PRESET': 'fastest'}, "unknown preset"),
+    ([], {'SERVER_WORKERS': 'many'}, "invalid value 'many' for workers in environment"),
+    (['--port', '5.5'], {}, "invalid value '5.5' for port in command line"),
+    (['--mode', 'threads'], {}, "mode must be sync or async"),
+    (['--port', '70000'], {}, "port must be between"),
+    (['--workers', '0'], {}, "workers must be at least 1"),
+    (['--processes', '2', '--port', '0'], {}, "cannot share port 0"),
+    (['--shutdown-grace-seconds', '-1'], {}, "must not be negative"),
+    (['--max-concurrent-rpcs', '0'], {}, "max_concurrent_rpcs must be at least 1"),
+    (['--db-pool-min-size', '12'], {}, "db pool sizes"),
+    (['--max-receive-message-bytes', '-2'], {}, "max_receive_message_bytes must be -1"),
+    (['--keepalive-time-ms', '-5'], {}, "keepalive_time_ms must not be negative"),
+])
+def test_invalid_settings_are_rejected(argv, environ, message):
+    with pytest.raises(ValueError, match=message):
+        load_server_config(argv, environ)
+
+
+def test_unknown_preset_option_is_rejected(capsys):
+    with pytest.raises(SystemExit):
+        load_server_config(['--preset', 'fastest'], {})
+    assert "invalid choice: 'fastest'" in capsys.readouterr().err
+
+
+def test_unknown_file_settings_are_rejected(tmp_path):
+    path = write_config(tmp_path, {'wrokers': 4})
+    with pytest.raises(ValueError, match="unknown server setting 'wrokers'"):
+        load_server_config(['--config', path], {})
+
+
+def test_config_file_must_hold_an_object(tmp_path):
+    path = write_config(tmp_path, [1, 2])
+    with pytest.raises(ValueError, match="must contain a JSON object"):
+        load_server_config([], {'SERVER_CONFIG': path})
@@ -0,0 +1,135 @@
+import mysql.connector
+import pytest
+from repository import StatementCache
+
+
+class FakePreparedCursor:
+
+    def __init__(self, connection):
+        self._connection = connection
+        self.handle = connection.next_handle
+        connection.next_handle += 1
+        connection.valid_handles.add(self.handle)
+        self.executed = []
+        self.closed = False
+        self.with_rows = False
+        self.rowcount = -1
+        self.lastrowid = None
+        self._rows = []
+
+    def execute(self, sql, params=()):
+        if self.handle not in self._connection.valid_handles:
+            raise mysql.connector.DatabaseError(msg="Unknown prepared statement handler", errno=1243)
+        if self._connection.fail_with is not None:
+            raise self._connection.fail_with
+        self.executed.append((sql, params))
+        self.with_rows = sql.startswith('SELECT')
+        self._rows = [(params[0], 'Dune')] if self.with_rows else []
+        self.rowcount = len(self._rows) if self.with_rows else 1
+
+    def fetchall(self):
+        return self._rows
+
+    def close(self):
+        self.closed = True
+        self._connection.valid_handles.discard(self.handle)
+
+
+class FakeConnection:
+
+    def __init__(self, connection_id: int = 1):
+        self.connection_id = connection_id
+        self.next_handle = 1
+        self.valid_handles = set()
+        self.cursors = []
+        self.fail_with = None
+
+    def cursor(self, prepared=False):
+        assert prepared
+        self.cursors.append(FakePreparedCursor(self))
+        return self.cursors[-1]
+
+
+SELECT = "SELECT uuid, title FROM book_copies WHERE uuid = %s"
+UPDATE = "UPDATE book_copies SET is_available = 0 WHERE uuid = %s"
+
+
+def test_statement_is_prepared_once_per_connection():
+    cache = StatementCache()
+    connection = FakeConnection()
+
+    for _ in range(3):
+        cursor = cache.cursor(connection)
+        cursor.execute(SELECT, ('book-001',))
+        assert cursor.fetchone() == ('book-001', 'Dune')
+        assert cursor.fetchone() is None
+
+    assert len(connection.cursors) == 1
+    stats = cache.stats()
+    assert (stats['prepares'], stats['hits']) == (1, 2)
+
+
+def test_connections_keep_separate_statements():
+    cache = StatementCache()
+    first, second = FakeConnection(1), FakeConnection(2)
+
+    cache.cursor(first).execute(SELECT, ('book-001',))
+    cache.cursor(second).execute(SELECT, ('book-001',))
+    cache.cursor(first).execute(SELECT, ('book-002',))
+
+    assert len(first.cursors) == 1 and len(second.cursors) == 1
+    assert first.cursors[0].executed == [(SELECT, ('book-001',)), (SELECT, ('book-002',))]
+    assert cache.stats()['connections'] == 2
+
+
+def test_reconnected_connection_prepares_again():
+    cache = StatementCache()
+    connection = FakeConnection(1)
+    cache.cursor(connection).execute(SELECT, ('book-001',))
+
+    connection.connection_id = 2
+    connection.valid_handles.clear()
+    cache.cursor(connection).execute(SELECT, ('book-001',))
+
+    assert len(connection.cursors) == 2
+    assert cache.stats()['reprepares'] == 0
+
+
+def test_unknown_statement_handler_is_prepared_again():
+    cache = StatementCache()
+    connection = FakeConnection()
+    cache.cursor(connection).execute(UPDATE, ('book-001',))
+
+    connection.valid_handles.clear()
+    cursor = cache.cursor(connection)
+    cursor.execute(UPDATE, ('book-001',))
+
+    assert cursor.rowcount == 1
+    assert len(connection.cursors) == 2
+    assert connection.cursors[1].executed == [(UPDATE, ('book-001',))]
+    assert cache.stats()['reprepares'] == 1
+
+
+def test_other_errors_are_raised_without_preparing_again():
+    cache = StatementCache()
+    connection = FakeConnection()
+    connection.fail_with = mysql.connector.DatabaseError(msg="Lock wait timeout exceeded", errno=1205)
+
+    with pytest.raises(mysql.connector.DatabaseError) as raised:
+        cache.cursor(connection).execute(UPDATE, ('book-001',))
+
+    assert raised.value.errno == 1205
+    assert len(connection.cursors) == 1
+    assert cache.stats()['reprepares'] == 0
+
+
+def test_least_recently_used_statement_is_closed_on_eviction():
+    cache = StatementCache(max_size=2)
+    connection = FakeConnection()
+    cursor = cache.cursor(connection)
+
+    for sql in (SELECT, UPDATE, SELECT, SELECT + " LIMIT 1"):
+        cursor.execute(sql, ('book-001',))
+
+    assert [prepared.closed for prepared in connection.cursors] == [False, True, False]
+    assert cache.stats()['evictions'] == 1
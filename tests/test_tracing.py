@@ -0,0 +1,39 @@
+import pytest
+from handler import incoming_trace
+from tracing import Tracer, create_tracer
+
+
+TRACE_ID = '4bf92f3577b34da6a3ce929d0e0e4736'
+PARENT_ID = '00f067aa0ba902b7'
+
+
+@pytest.mark.parametrize('metadata, expected', [
+    ((), (None, None, None)),
+    ((('x-trace-id', 'abc'),), ('abc', None, None)),
+    ((('traceparent', f'00-{TRACE_ID}-{PARENT_ID}-01'),), (TRACE_ID, True, PARENT_ID)),
+    ((('traceparent', f'00-{TRACE_ID}-{PARENT_ID}-00'),), (TRACE_ID, False, PARENT_ID)),
+    ((('traceparent', 'garbage'),), (None, None, None))
+])
+def test_incoming_trace(metadata, expected):
+    assert incoming_trace(metadata) == expected
+
+
+def test_propagated_id_does_not_bypass_sample_rate():
+    assert Tracer(sample_rate=0.0).start('GetBook', 'abc', None) is None
+
+
+def test_propagated_id_is_kept_when_sampled():
+    root = Tracer(sample_rate=1.0).start('GetBook', 'abc', None)
+    assert root.trace_id == 'abc'
+
+
+def test_traceparent_flag_decides():
+    assert Tracer(sample_rate=0.0).start('GetBook', TRACE_ID, True).trace_id == TRACE_ID
+    assert Tracer(sample_rate=1.0).start('GetBook', TRACE_ID, False) is None
+
+
+def test_tracing_is_off_by_default(monkeypatch):
+    monkeypatch.delenv('TRACING', raising=False)
+    assert create_tracer() is None
+    monkeypatch.setenv('TRACING', '1')
+    assert create_tracer() is not None
@@ -0,0 +1,25 @@
+from .tracer import (
+    Span,
+    Trace,
+    ActiveSpan,
+    TraceBuffer,
+    FileTraceExporter,
+    Tracer,
+    current_span,
+    create_tracer
+)
+from .traced import Traced, TracedCursor, traced_function
+
+__all__ = [
+    'Span',
+    'Trace',
+    'ActiveSpan',
+    'TraceBuffer',
+    'FileTraceExporter',
+    'Tracer',
+    'current_span',
+    'create_tracer',
+    'Traced',
+    'TracedCursor',
+    'traced_function'
+]
@@ -0,0 +1,86 @@
+import inspect
+from typing import Callable
+from .tracer import current_span
+
+
+def traced_function(function, name: str, layer: str):
+    if inspect.iscoroutinefunction(function):
+        async def traced_coroutine(*args, **kwargs):
+            parent = current_span.get()
+            if parent is None:
+                return await function(*args, **kwargs)
+
+            span = parent.child(name, layer)
+            token = current_span.set(span)
+            try:
+                return await function(*args, **kwargs)
+            except BaseException as e:
+                span.error = type(e).__name__
+                raise
+            finally:
+                current_span.reset(token)
+                span.finish()
+        return traced_coroutine
+
+    def traced(*args, **kwargs):
+        parent = current_span.get()
+        if parent is None:
+            return function(*args, **kwargs)
+
+        span = parent.child(name, layer)
+        token = current_span.set(span)
+        try:
+            return function(*args, **kwargs)
+        except BaseException as e:
+            span.error = type(e).__name__
+            raise
+        finally:
+            current_span.reset(token)
+            span.finish()
+    return traced
+
+
+class Traced:
+
+    def __init__(self, target, layer: str):
+        self._target = target
+        self._layer = layer
+
+    def __getattr__(self, name: str):
+        value = getattr(self._target, name)
+        if name.startswith('_') or not inspect.ismethod(value):
+            return value
+
+        traced = traced_function(value, f"{self._layer}.{name}", self._layer)
+        self.__dict__[name] = traced
+        return traced
+
+
+class TracedCursor:
+
+    def __init__(self, cursor, query_name: Callable[[str], str]):
+        self._cursor = cursor
+        self._query_name = query_name
+
+    def execute(self, sql: str, *args, **kwargs):
+        return self._run(self._cursor.execute, sql, args, kwargs)
+
+    def executemany(self, sql: str, *args, **kwargs):
+        return self._run(self._cursor.executemany, sql, args, kwargs)
+
+    def _run(self, execute, sql: str, args: tuple, kwargs: dict):
+        parent = current_span.get()
+        if parent is None:
+            return execute(sql, *args, **kwargs)
+
+        span = parent.child(f"query.{self._query_name(sql)}", 'query')
+        try:
+            return execute(sql, *args, **kwargs)
+        except BaseException as e:
+            span.error = type(e).__name__
+            raise
+        finally:
+            span.finish()
+
+    def __getattr__(self, name: str):
+        return getattr(self._cursor, name)
@@ -0,0 +1,188 @@
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+
+MAX_TRACE_ID_LENGTH = 64
+
+
+@dataclass
+class Span:
+    span_id: str
+    parent_id: Optional[str]
+    name: str
+    layer: str
+    offset_seconds: float
+    duration_seconds: float
+    error: Optional[str] = None
+    attributes: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class Trace:
+    trace_id: str
+    name: str
+    started_at: float
+    duration_seconds: float
+    spans: List[Span]
+
+    def layer_seconds(self) -> Dict[str, float]:
+        children: Dict[Optional[str], float] = {}
+        for span in self.spans:
+            children[span.parent_id] = children.get(span.parent_id, 0.0) + span.duration_seconds
+
+        layers: Dict[str, float] = {}
+        for span in self.spans:
+            own = max(0.0, span.duration_seconds - children.get(span.span_id, 0.0))
+            layers[span.layer] = layers.get(span.layer, 0.0) + own
+        return layers
+
+    def to_dict(self) -> dict:
+        trace = asdict(self)
+        trace['layer_seconds'] = self.layer_seconds()
+        return trace
+
+
+def new_id(bits: int) -> str:
+    return f"{random.getrandbits(bits):0{bits // 4}x}"
+
+
+class _Recording:
+
+    def __init__(self, tracer: 'Tracer', trace_id: str):
+        self.tracer = tracer
+        self.trace_id = trace_id
+        self.started_at = time.time()
+        self.started = time.perf_counter()
+        self.spans: List[Span] = []
+
+
+class ActiveSpan:
+
+    __slots__ = ('_recording', 'span_id', 'parent_id', 'name', 'layer', 'started', 'error', 'attributes')
+
+    def __init__(self, recording: _Recording, name: str, layer: str, parent_id: Optional[str] = None):
+        self._recording = recording
+        self.span_id = new_id(64)
+        self.parent_id = parent_id
+        self.name = name
+        self.layer = layer
+        self.started = time.perf_counter()
+        self.error: Optional[str] = None
+        self.attributes: Dict[str, str] = {}
+
+    @property
+    def trace_id(self) -> str:
+        return self._recording.trace_id
+
+    def child(self, name: str, layer: str) -> 'ActiveSpan':
+        return ActiveSpan(self._recording, name, layer, self.span_id)
+
+    def finish(self):
+        recording = self._recording
+        finished = time.perf_counter()
+        recording.spans.append(Span(
+            span_id=self.span_id,
+            parent_id=self.parent_id,
+            name=self.name,
+            layer=self.layer,
+            offset_seconds=self.started - recording.started,
+            duration_seconds=finished - self.started,
+            error=self.error,
+            attributes=self.attributes
+        ))
+        if self.parent_id is None:
+            recording.tracer.export(Trace(
+                trace_id=recording.trace_id,
+                name=self.name,
+                started_at=recording.started_at,
+                duration_seconds=finished - recording.started,
+                spans=sorted(recording.spans, key=lambda span: span.offset_seconds)
+            ))
+
+
+current_span: ContextVar[Optional[ActiveSpan]] = ContextVar('current_span', default=None)
+
+
+class TraceBuffer:
+
+    def __init__(self, capacity: int):
+        self._traces = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+
+    def export(self, trace: Trace):
+        with self._lock:
+            self._traces.append(trace)
+
+    def traces(self, limit: int = 0, trace_id: str = None, min_duration_seconds: float = 0.0) -> List[Trace]:
+        with self._lock:
+            traces = list(self._traces)
+
+        matches = [
+            trace for trace in reversed(traces)
+            if (not trace_id or trace.trace_id == trace_id) and trace.duration_seconds >= min_duration_seconds
+        ]
+        return matches[:limit] if limit > 0 else matches
+
+
+class FileTraceExporter:
+
+    def __init__(self, path: str):
+        self._file = open(path, 'a')
+        self._lock = threading.Lock()
+
+    def export(self, trace: Trace):
+        line = json.dumps(trace.to_dict())
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class Tracer:
+
+    def __init__(self, sample_rate: float = 0.0, buffer: TraceBuffer = None, exporters: Sequence = ()):
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be between 0 and 1")
+        self.sample_rate = sample_rate
+        self.buffer = buffer
+        self._exporters = ([buffer] if buffer else []) + list(exporters)
+
+    def start(self, name: str, trace_id: str = None, sampled: bool = None) -> Optional[ActiveSpan]:
+        if sampled is None:
+            sampled = random.random() < self.sample_rate
+        if not sampled:
+            return None
+        return ActiveSpan(_Recording(self, (trace_id or new_id(128))[:MAX_TRACE_ID_LENGTH]), name, 'handler')
+
+    def export(self, trace: Trace):
+        for exporter in self._exporters:
+            exporter.export(trace)
+
+    def close(self):
+        for exporter in self._exporters:
+            close = getattr(exporter, 'close', None)
+            if close:
+                close()
+
+
+def create_tracer() -> Optional[Tracer]:
+    if os.getenv('TRACING', '0').lower() not in ('1', 'true', 'yes'):
+        return None
+
+    capacity = int(os.getenv('TRACE_BUFFER_SIZE', '1000'))
+    trace_file = os.getenv('TRACE_FILE')
+    return Tracer(
+        sample_rate=float(os.getenv('TRACE_SAMPLE_RATE', '0')),
+        buffer=TraceBuffer(capacity) if capacity > 0 else None,
+        exporters=[FileTraceExporter(trace_file)] if trace_file else []
+    )